@@ -10,7 +10,6 @@ finding the pickles speeds up display.
 """
 
 
-from multiprocessing import Pool
 import numpy as np
 import pybindingcurve as pbc
 import pickle
@@ -30,7 +29,6 @@ def get_2D_grid_values(
     y_parameter,
     filename,
     plot_steps,
-    starting_y_guess=0,
 ):
     file = Path(filename)
     if file.exists():
@@ -38,13 +36,14 @@ def get_2D_grid_values(
         return mat
     x_logconc = np.linspace(xmin, xmax, plot_steps)
     y_logconc = np.linspace(ymin, ymax, plot_steps)
-    mat = np.ndarray((plot_steps, plot_steps))
-    for ix, x in enumerate(x_logconc):
-        print("Working on :", x)
-        for iy, y in enumerate(y_logconc):
-            parameters[x_parameter] = 10 ** x
-            parameters[y_parameter] = 10 ** y
-            mat[ix, iy] = system.query(parameters)
+    # Sweep the grid using every available core, x varying along rows and y
+    # along columns
+    mat = pbc.sweep(
+        system,
+        parameters,
+        {x_parameter: 10**x_logconc, y_parameter: 10**y_logconc},
+        progress=True,
+    )
 
     pickle.dump(mat, open(filename, "wb"))
     return mat
@@ -53,47 +52,37 @@ def get_2D_grid_values(
 def generate_heatmaps(
     homodimer_map_file: Path, heterodimer_map_file: Path, plot_steps: int = 800
 ):
-    pool = Pool(2)
     inhibitor_conc = 5.0
     pbc_homodimer_breaking = pbc.BindingCurve("homodimer breaking")
     pbc_heterodimer_breaking = pbc.BindingCurve("competition")
 
     print("Building homdimer heatmap file")
-    j1 = pool.apply_async(
-        get_2D_grid_values,
-        [
-            -3,
-            3,
-            -3,
-            3,
-            pbc_homodimer_breaking,
-            {"p": 2, "i": inhibitor_conc},
-            "kdpp",
-            "kdpi",
-            f"heatmaphomo-{str(inhibitor_conc)}.pkl",
-            plot_steps,
-        ],
+    get_2D_grid_values(
+        -3,
+        3,
+        -3,
+        3,
+        pbc_homodimer_breaking,
+        {"p": 2, "i": inhibitor_conc},
+        "kdpp",
+        "kdpi",
+        f"heatmaphomo-{str(inhibitor_conc)}.pkl",
+        plot_steps,
     )
 
     print("Building heterodimer heatmap file")
-
-    j2 = pool.apply_async(
-        get_2D_grid_values,
-        [
-            -3,
-            3,
-            -3,
-            3,
-            pbc_heterodimer_breaking,
-            {"p": 1, "l": 1, "i": inhibitor_conc},
-            "kdpl",
-            "kdpi",
-            f"heatmaphetero-{str(inhibitor_conc)}.pkl",
-            plot_steps,
-        ],
+    get_2D_grid_values(
+        -3,
+        3,
+        -3,
+        3,
+        pbc_heterodimer_breaking,
+        {"p": 1, "l": 1, "i": inhibitor_conc},
+        "kdpl",
+        "kdpi",
+        f"heatmaphetero-{str(inhibitor_conc)}.pkl",
+        plot_steps,
     )
-    res = j1.get()
-    res = j2.get()
 
 
 def load_heatmap(filepath: Path):
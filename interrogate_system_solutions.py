@@ -1,27 +1,26 @@
 import pybindingcurve as pbc
-import random
+import numpy as np
 
-output_file = open("system_results.csv", "w", buffering=1)
-output_file.write("p,l,kdpp,kdpl,solution")
-analytical_system = pbc.BindingCurve(pbc.systems.System_analytical_homodimerbreaking_pp)
-kinetic_system = pbc.BindingCurve(pbc.systems.System_kinetic_homodimerbreaking_pp)
+# Record which solution of the closed form homodimer breaking equations is
+# the physical one, as selected from all roots of the free protein cubic,
+# over random parameters spanning many orders of magnitude.
+num_points = 10000
+rng = np.random.default_rng()
+query_system = dict(
+    (parameter, rng.uniform(0.0, 1000.0, num_points) * 10.0 ** rng.choice([0, -3, -6, -9, -12], num_points))
+    for parameter in ["p", "i", "kdpp", "kdpi"]
+)
 
-while True:
-    query_system = {
-        "p": random.uniform(0.0, 1000.0) * 10 ** random.choice([0, -3, -6, -9, -12]),
-        "l": random.uniform(0.0, 1000.0) * 10 ** random.choice([0, -3, -6, -9, -12]),
-        "kdpl": random.uniform(0.0, 1000.0) * 10 ** random.choice([0, -3, -6, -9, -12]),
-        "kdpp": random.uniform(0.0, 1000.0) * 10 ** random.choice([0, -3, -6, -9, -12]),
-    }
-    kinetic_result = kinetic_system.query(query_system)
-    analytical_result = analytical_system.query(query_system)
+analytical_system = pbc.BindingCurve(pbc.systems.System_analytical_homodimerbreaking_pp())
+physical_system = pbc.BindingCurve(pbc.systems.System_analytical_homodimerbreaking_pp(all_solutions=False))
+analytical_result = analytical_system.query(query_system)
+physical_result = physical_system.query(query_system)
 
-    closest = min(
-        range(len(analytical_result)),
-        key=lambda i: abs(analytical_result[i] - kinetic_result),
-    )
-    output_file.write(
-        f"{query_system['p']},{query_system['l']},{query_system['kdpp']},{query_system['kdpl']},{closest}\n"
-    )
+# Index of the matching solution, or -1 where neither is physical
+matches = np.isclose(analytical_result, physical_result, rtol=1e-6, atol=0)
+solution = np.where(np.any(matches, axis=0), np.argmax(matches, axis=0), -1)
 
-output_file.close()
+with open("system_results.csv", "w") as output_file:
+    output_file.write("p,i,kdpp,kdpi,solution\n")
+    for values in zip(*query_system.values(), solution):
+        output_file.write(",".join(str(v) for v in values) + "\n")
@@ -1 +1,10 @@
 from .pybindingcurve import *
+from .sweep import sweep
+
+
+def __getattr__(name: str):
+    # Systems are exported to the pybindingcurve namespace, importing their
+    # backends on first use (see pybindingcurve.systems)
+    if name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(systems, name)
@@ -0,0 +1,210 @@
+"""Rendering of binding curves with matplotlib
+
+Curves are computed by BindingCurve without reference to plotting, and only
+drawn when a CurvePlot is created, so that matplotlib is neither imported nor
+used by processes which only require curve data.
+"""
+
+import numpy as np
+
+pbc_plot_style = {
+    "axis_label_size": 12,
+    "axis_label_font": "DejaVu Sans",
+    "title_size": 12,
+    "title_font": "DejaVu Sans",
+    # 'figure_width': 9,
+    # 'figure_height': 9,
+    "x_tick_label_font_size": 10,
+    "y_tick_label_font_size": 10,
+    "legend_font_size": 9,
+    "dpi": 300,
+    "x_axis_labelpad": None,
+    "y_axis_labelpad": None,
+    "title_labelpad": None,
+    "fig_size": (5 * 1.2, 4 * 1.2),
+}
+
+
+class CurvePlot:
+    """
+    CurvePlot class, renders binding curves and data points with matplotlib
+
+    A figure is created on construction, curves (as returned by
+    BindingCurve.compute_curves) and scatter points are drawn as they are
+    added, and the plot is labelled and displayed by show.
+
+    Parameters
+    ----------
+    plot_style : dict
+        Plot style, as pbc_plot_style (default = pbc_plot_style)
+    """
+
+    plot_solution_colours = list("krgbycmrgbycmrgby") + list(
+        np.linspace(0.1, 0.9, num=20)
+    )
+
+    def __init__(self, plot_style: dict = pbc_plot_style):
+        """
+        Construct CurvePlot objects, creating their figure
+
+        Parameters
+        ----------
+        plot_style : dict
+            Plot style, as pbc_plot_style (default = pbc_plot_style)
+        """
+        import matplotlib.pyplot as plt
+
+        self.plot_style = plot_style
+        self.fig, self.axes = plt.subplots(
+            nrows=1, ncols=1, figsize=plot_style["fig_size"]
+        )
+        self.axes.grid(True, which="both")
+        self.axes.set_ylim(0, 1)
+        plt.tight_layout(rect=(0.05, 0.05, 0.95, 0.92))
+        self._min_x_axis = 0.0
+        self._max_x_axis = 0.0
+        self._min_y_axis = 0.0
+        self._max_y_axis = 0.0
+        self._num_added_traces = 0
+        self._num_added_sets_of_points = 0
+        self._xlabel = "[X]"
+        self._ylabel = None
+
+    def add_curves(self, curves: list):
+        """
+        Draw curves
+
+        Curves without names are named by their number, in order of drawing.
+        Axis labels default to those of the last curve drawn.
+
+        Parameters
+        ----------
+        curves : list
+            Curve objects, as returned by BindingCurve.compute_curves
+        """
+        for curve in curves:
+            self._num_added_traces += 1
+            name = curve.name
+            if name is None:
+                name = f"Curve {self._num_added_traces}"
+            self.axes.plot(
+                curve.xcoords,
+                curve.ycoords,
+                self.plot_solution_colours[self._num_added_traces] + "-",
+                label=name,
+                linewidth=2,
+            )
+            self._max_x_axis = np.nanmax([self._max_x_axis, curve.xcoords[-1]])
+            self._min_x_axis = np.nanmin([self._min_x_axis, curve.xcoords[0]])
+            self._min_y_axis = np.nanmin([self._min_y_axis, np.nanmin(curve.ycoords)])
+            self._max_y_axis = np.nanmax([self._max_y_axis, np.nanmax(curve.ycoords)])
+            if curve.parameter is not None:
+                self._xlabel = "[" + curve.parameter.upper() + "]"
+            self._ylabel = curve.ylabel
+
+    def add_scatter(self, xcoords, ycoords, name: str = None):
+        """
+        Draw scatter points, useful to represent real measurement data
+
+        Parameters
+        ----------
+        xcoords : list or array-like
+            x-coordinates
+        ycoords : list or array-like
+            y-coordinates
+        name : str or None, optional
+            Name of series to appear in plot legends
+        """
+        self._num_added_sets_of_points += 1
+        if name is None:
+            name = f"Data " + str(self._num_added_sets_of_points)
+        self.axes.scatter(xcoords, ycoords, label=name)
+        self._min_x_axis = min(self._min_x_axis, np.min(np.real(xcoords)))
+        self._max_x_axis = max(self._max_x_axis, np.max(np.real(xcoords)))
+        self._min_y_axis = min(self._min_y_axis, np.min(np.real(ycoords)))
+        self._max_y_axis = max(self._max_y_axis, np.max(np.real(ycoords)))
+
+    def show(
+        self,
+        title: str = "System simulation",
+        xlabel: str = None,
+        ylabel: str = None,
+        min_x: float = None,
+        max_x: float = None,
+        min_y: float = None,
+        max_y: float = None,
+        log_x_axis: bool = False,
+        log_y_axis: bool = False,
+        png_filename: str = None,
+        svg_filename: str = None,
+        show_legend: bool = True,
+        display: bool = True,
+    ):
+        """
+        Label, save and display the plot, then close its figure
+
+        Parameters are as for BindingCurve.show_plot, with display (default =
+        True) controlling whether the plot is displayed, or only saved.
+        """
+        import matplotlib.pyplot as plt
+
+        plot_style = self.plot_style
+        if min_x is not None:
+            self._min_x_axis = min_x
+        if max_x is not None:
+            self._max_x_axis = max_x
+        if min_y is not None:
+            self._min_y_axis = min_y
+        if max_y is not None:
+            self._max_y_axis = max_y
+
+        if max_y is None:
+            self.axes.set_ylim(self._min_y_axis, self._max_y_axis * 1.1)
+        else:
+            self.axes.set_ylim(self._min_y_axis, self._max_y_axis)
+        self.axes.set_xlim(self._min_x_axis, self._max_x_axis)
+        if log_x_axis:
+            self.axes.set_xscale("log", nonpositive="clip")
+        if log_y_axis:
+            self.axes.set_yscale("log", nonpositive="clip")
+
+        self.axes.set_xlabel(
+            self._xlabel if xlabel is None else xlabel,
+            fontsize=plot_style["axis_label_size"],
+            fontname=plot_style["axis_label_font"],
+            labelpad=plot_style["x_axis_labelpad"],
+        )
+        if ylabel is None:
+            ylabel = self._ylabel
+        if ylabel is not None:
+            self.axes.set_ylabel(
+                ylabel,
+                fontsize=plot_style["axis_label_size"],
+                fontname=plot_style["axis_label_font"],
+                labelpad=plot_style["y_axis_labelpad"],
+            )
+
+        self.axes.set_title(
+            title,
+            fontsize=plot_style["title_size"],
+            fontname=plot_style["title_font"],
+            pad=plot_style["title_labelpad"],
+        )
+
+        if show_legend:
+            self.axes.legend(prop={"size": plot_style["legend_font_size"]})
+
+        self.axes.tick_params(axis='x', which='major', labelsize=plot_style["x_tick_label_font_size"])
+        self.axes.tick_params(axis='y', which='major', labelsize=plot_style["y_tick_label_font_size"])
+
+        if png_filename is not None:
+            self.fig.savefig(
+                png_filename,
+                dpi=plot_style["dpi"],
+                metadata={"Title": "pyBindingCurve plot"},
+            )
+        if svg_filename is not None:
+            self.fig.savefig(svg_filename, metadata={"Title": "pyBindingCurve plot"})
+        if display:
+            plt.show()
+        plt.close(self.fig)
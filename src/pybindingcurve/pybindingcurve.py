@@ -3,28 +3,19 @@
 """
 
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
-import matplotlib.pyplot as plt
-import lmfit
-from pybindingcurve.systems import *
+from pybindingcurve import systems
+from pybindingcurve.systems import BindingSystem
+from pybindingcurve.plotting import CurvePlot, pbc_plot_style
+from pybindingcurve.sampling import adaptive_sample
 from typing import Union
 
-pbc_plot_style = {
-    "axis_label_size": 12,
-    "axis_label_font": "DejaVu Sans",
-    "title_size": 12,
-    "title_font": "DejaVu Sans",
-    # 'figure_width': 9,
-    # 'figure_height': 9,
-    "x_tick_label_font_size": 10,
-    "y_tick_label_font_size": 10,
-    "legend_font_size": 9,
-    "dpi": 300,
-    "x_axis_labelpad": None,
-    "y_axis_labelpad": None,
-    "title_labelpad": None,
-    "fig_size": (5 * 1.2, 4 * 1.2),
-}
+# matplotlib, lmfit and scipy.stats are imported by the methods using them,
+# and backends by pybindingcurve.systems on first use, keeping the import of
+# pybindingcurve fast for processes which only query systems.
+
 
 
 class Readout:
@@ -119,15 +110,183 @@ class Readout:
         return None, y
 
 
-class _Curve:
+def _fit_from_start(
+    system: BindingSystem,
+    disable_signal_warnings: bool,
+    system_parameters: dict,
+    to_fit: dict,
+    ycoords: np.array,
+    bounds: dict,
+):
+    """
+    Fit a system from one starting point, used by fit_multistart
+
+    Parameters
+    ----------
+    system : BindingSystem
+        System to fit.
+    disable_signal_warnings : bool
+        Passed to BindingCurve.
+    system_parameters : dict
+        Dictionary containing system parameters.
+    to_fit : dict
+        Dictionary containing system parameters to fit, with their starting
+        values.
+    ycoords : np.array
+        Y coordinates of data the system parameters should be fit to.
+    bounds : dict
+        Dictionary of tuples of lower and upper bounds of parameters.
+
+    Returns
+    -------
+    dict or None
+        Dictionary containing the starting point, fitted system parameters,
+        accuracy of fitted parameters and the sum of squared residuals, or
+        None if the fit failed.
+    """
+    curve = BindingCurve(system, disable_signal_warnings=disable_signal_warnings)
+    try:
+        fitted_system, fit_accuracy = curve.fit(system_parameters, to_fit, ycoords, bounds)
+        residual = curve.system.query(dict(fitted_system)) - ycoords
+    except (AssertionError, ValueError, ZeroDivisionError, np.linalg.LinAlgError):
+        return None
+    chisqr = float(np.sum(np.square(residual)))
+    if not np.isfinite(chisqr):
+        return None
+    return {
+        "start": to_fit,
+        "system_parameters": fitted_system,
+        "accuracy": fit_accuracy,
+        "chisqr": chisqr,
+    }
+
+
+def _refit_resamples(
+    system: BindingSystem,
+    disable_signal_warnings: bool,
+    system_parameters: dict,
+    to_fit: dict,
+    bounds: dict,
+    resamples: list,
+):
+    """
+    Fit a system to resampled data, used by fit_resampling
+
+    Parameters
+    ----------
+    system : BindingSystem
+        System to fit.
+    disable_signal_warnings : bool
+        Passed to BindingCurve.
+    system_parameters : dict
+        Dictionary containing system parameters of the original data.
+    to_fit : dict
+        Dictionary containing system parameters to fit, with their starting
+        values.
+    bounds : dict
+        Dictionary of tuples of lower and upper bounds of parameters.
+    resamples : list
+        Tuples of (indices, ycoords) for each resample, where indices select
+        points of the original data from array-like system parameters.
+
+    Returns
+    -------
+    np.ndarray
+        Fitted values with a row per resample and a column per parameter in
+        to_fit, NaN where a fit failed.
+    """
+    curve = BindingCurve(system, disable_signal_warnings=disable_signal_warnings)
+    changing = curve._find_changing_parameters(system_parameters) or []
+    fitted = np.full((len(resamples), len(to_fit)), np.nan)
+    for row, (indices, ycoords) in enumerate(resamples):
+        resampled_parameters = dict(system_parameters)
+        for name in changing:
+            resampled_parameters[name] = np.asarray(system_parameters[name])[indices]
+        try:
+            fitted_system, _ = curve.fit(resampled_parameters, to_fit, ycoords, bounds)
+        except (AssertionError, ValueError, ZeroDivisionError, np.linalg.LinAlgError):
+            continue
+        fitted[row] = [fitted_system[name] for name in to_fit]
+    return fitted
+
+
+def _profile_walk(
+    system: BindingSystem,
+    disable_signal_warnings: bool,
+    system_parameters: dict,
+    to_fit: dict,
+    ycoords: np.array,
+    bounds: dict,
+    name: str,
+    values: np.array,
+):
+    """
+    Refit a system along one direction of a profile, used by fit_profile
+
+    Parameters
+    ----------
+    system : BindingSystem
+        System to fit.
+    disable_signal_warnings : bool
+        Passed to BindingCurve.
+    system_parameters : dict
+        Dictionary containing fixed system parameters.
+    to_fit : dict
+        Dictionary containing other system parameters to fit, with their
+        values at the best fit, from which the first refit starts.
+    ycoords : np.array
+        Y coordinates of data the system parameters should be fit to.
+    bounds : dict
+        Dictionary of tuples of lower and upper bounds of parameters.
+    name : str
+        Name of the profiled parameter.
+    values : np.array
+        Values of the profiled parameter, in the order visited, each refit
+        starting from the solution at the previous value.
+
+    Returns
+    -------
+    tuple (np.ndarray, np.ndarray)
+        Sum of squared residuals at each value, and fitted values of the
+        other parameters with a row per value and a column per parameter in
+        to_fit, NaN where a fit failed.
+    """
+    curve = BindingCurve(system, disable_signal_warnings=disable_signal_warnings)
+    chisqr = np.full(len(values), np.nan)
+    fitted = np.full((len(values), len(to_fit)), np.nan)
+    start = dict(to_fit)
+    for row, value in enumerate(values):
+        fixed_parameters = {**system_parameters, name: value}
+        try:
+            if len(start) > 0:
+                fixed_parameters, _ = curve.fit(fixed_parameters, start, ycoords, bounds)
+            residual = curve.system.query(dict(fixed_parameters)) - ycoords
+        except (AssertionError, ValueError, ZeroDivisionError, np.linalg.LinAlgError):
+            continue
+        chisqr[row] = np.sum(np.square(residual))
+        start = dict((other, fixed_parameters[other]) for other in to_fit)
+        fitted[row] = list(start.values())
+    return chisqr, fitted
+
+
+class Curve:
     """
     Curve class, represents a binding curve
 
-    Consists of X and Y coordinates, along with a name and boolean
-    flag denoting that the curve is a traced, real physical solution.
+    Consists of X and Y coordinates, along with a name, the name of the
+    changing parameter giving X coordinates, and a label for Y coordinates.
+    Curves are plain data, computed by BindingCurve.compute_curves, and drawn
+    by CurvePlot.
     """
 
-    def __init__(self, xcoords: np.array, ycoords: np.array, series_name: str = ""):
+    def __init__(
+        self,
+        xcoords: np.array,
+        ycoords: np.array,
+        series_name: str = "",
+        parameter: str = None,
+        ylabel: str = None,
+    ):
         """
         Curve constructor
 
@@ -141,10 +300,20 @@ class _Curve:
             Y coordinates of the binding system to be used to present a binding curve
         series_name : str, Optional
             Name of curve to appear in plot legends
+        parameter : str, Optional
+            Name of the changing parameter giving X coordinates
+        ylabel : str, Optional
+            Label of Y coordinates, such as "[PL]"
         """
         self.xcoords = xcoords
         self.ycoords = ycoords
         self.name = series_name
+        self.parameter = parameter
+        self.ylabel = ylabel
+
+
+# Previous name of Curve
+_Curve = Curve
 
 
 class BindingCurve:
@@ -166,20 +335,16 @@ class BindingCurve:
     """
     arguments=None
     system = None
-    _last_custom_readout = None
-    curves = []
-    fig = None
-    axes = None
-    plot_solution_colours = list("krgbycmrgbycmrgby") + list(
-        np.linspace(0.1, 0.9, num=20)
-    )
-    _min_x_axis = 0.0
-    _max_x_axis = 0.0
-    _min_y_axis = 0.0
-    _max_y_axis = 0.0
-    _num_added_traces = 0
-    _num_added_sets_of_points = 0
-    _last_known_changing_parameter = "X"
+    # Renderer of curves and scatter points, attached by attach_plot
+    plot = None
+
+    @property
+    def fig(self):
+        return None if self.plot is None else self.plot.fig
+
+    @property
+    def axes(self):
+        return None if self.plot is None else self.plot.axes
 
 
     def query(self, parameters, readout: Readout = None):
@@ -213,6 +378,108 @@ class BindingCurve:
             else readout(parameters, self.system.query(parameters))[1]
         )
 
+    def adaptive_titration(
+        self,
+        parameters: dict,
+        tolerance: float = 1e-3,
+        initial_points: int = 9,
+        max_points: int = 1000,
+        log_scale: bool = None,
+    ):
+        """
+        Query the system at points concentrated where the curve bends
+
+        The changing parameter is sampled between its lowest and highest
+        values, starting from a coarse grid, and intervals are bisected where
+        linear interpolation is not within tolerance of the curve (see
+        sampling.adaptive_sample), so that the curve is reproduced with far
+        fewer queries than evenly spaced points require.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the system, with one changing parameter
+            whose lowest and highest values give the range to sample
+        tolerance : float
+            Estimated largest error of linear interpolation between returned points,
+            relative to the range of the readout (default = 1e-3)
+        initial_points : int
+            Number of points in the initial grid (default = 9)
+        max_points : int
+            Largest number of points queried (default = 1000)
+        log_scale : bool or None
+            Sample evenly in log of the changing parameter, for plots with
+            logarithmic x axes. If None, log_scale is used if the changing
+            parameter is positive and evenly spaced in log, as made by
+            np.logspace or np.geomspace (default = None)
+
+        Returns
+        -------
+        tuple (np.ndarray, np.ndarray)
+            Increasing values of the changing parameter, and the readout at
+            them (preceded by a solutions axis for systems with more than
+            one solution).
+        """
+        changing_parameters = self._find_changing_parameters(parameters)
+        assert (
+            changing_parameters is not None and len(changing_parameters) == 1
+        ), "Adaptive titrations require exactly 1 changing parameter"
+        changing = changing_parameters[0]
+        values = np.asarray(parameters[changing], dtype=float)
+        if log_scale is None:
+            log_scale = (
+                len(values) > 2
+                and np.all(values > 0)
+                and np.allclose(np.diff(np.log(values)), np.log(values[1] / values[0]))
+            )
+
+        def query(x):
+            return self.system.query({**parameters, changing: x})
+
+        return adaptive_sample(
+            query,
+            np.min(values),
+            np.max(values),
+            tolerance,
+            initial_points,
+            max_points,
+            log_scale,
+        )
+
+    def query_batch(self, parameters: dict, readout: Readout = None):
+        """
+        Query a binding system over many parameter values at once
+
+        Any number of parameters may be array-like. They are broadcast
+        against each other following NumPy rules, so that for example
+        {"p": p_values[:, np.newaxis], "kdpl": kdpl_values[np.newaxis, :]}
+        queries every combination of p and kdpl.  Systems with a vectorized
+        backend evaluate the whole batch in a single call.
+
+        Parameters
+        ----------
+        parameters : dict
+            System parameters defining the system being queried, array-like
+            values may be of any broadcast compatible shape.
+        readout : func or None
+            Change the readout of the system, can be None for unmodified
+            (usually complex concentration), a static member function from
+            the pbc.Readout class, or a custom written function following the
+            the same defininition as those in pbc.Readout.
+
+        Returns
+        -------
+        np.ndarray
+            Response/signal of the system with the broadcast shape of the
+            parameters (preceded by a solutions axis for systems with more
+            than one solution).
+        """
+        batch_parameters = dict(
+            (k, np.asarray(v, dtype=float) if isinstance(v, (list, tuple, np.ndarray)) else v)
+            for k, v in parameters.items()
+        )
+        return np.asarray(self.query(batch_parameters, readout))
+
     def _find_changing_parameters(self, params: dict):
         """
         Find the changing parameter
@@ -261,25 +528,33 @@ class BindingCurve:
             concentration is being used.
         """
         self.disable_signal_warning=disable_signal_warnings
+        # Curves and scatter points (as (xcoords, ycoords, name)) of the
+        # current plot, held per instance whether or not a plot is attached
+        self.curves = []
+        self.scatters = []
+        self._plot_shown = False
         if isinstance(binding_system, str):
             # Check if its a custom defined system - containing <->
             if binding_system.find("<->") != -1:
-                # Custom binding system, check if it starts with Lagrange
+                # Custom binding system, check if it starts with Lagrange or
+                # Kinetic
                 if binding_system.lower().startswith("lagrange"):
-                    self.system = System_lagrange_custom(binding_system[8:])
+                    self.system = systems.System_lagrange_custom(binding_system[8:])
+                elif binding_system.lower().startswith("kinetic"):
+                    self.system = systems.System_kinetic_custom(binding_system[7:])
                 else:
-                    self.system = System_minimizer_custom(binding_system)
+                    self.system = systems.System_minimizer_custom(binding_system)
 
             binding_system = binding_system.lower().replace(" ", "")
             # 1:1
             if binding_system in ["simple", "1:1", "1:1analytical"]:
-                self.system = System_analytical_one_to_one__pl()
+                self.system = systems.System_analytical_one_to_one__pl()
             # 1:1 lagrange
             if binding_system in ["simplelagrange", "1:1lagrange"]:
-                self.system = System_lagrange_one_to_one__pl()
+                self.system = systems.System_lagrange_one_to_one__pl()
             # 1:1 kinetic
             if binding_system in ["simplekinetic", "1:1kinetic"]:
-                self.system = System_kinetic_one_to_one__pl()
+                self.system = systems.System_kinetic_one_to_one__pl()
             # 1:1 minimised
             if binding_system in [
                 "simplemin",
@@ -289,17 +564,17 @@ class BindingCurve:
                 "1:1minimized",
                 "1:1minimised",
             ]:
-                self.system = System_minimizer_one_to_one__pl()
+                self.system = systems.System_minimizer_one_to_one__pl()
 
             # Homodimer formation
             if binding_system in ["homodimerformation", "homodimer"]:
-                self.system = System_analytical_homodimerformation__pp()
+                self.system = systems.System_analytical_homodimerformation__pp()
             # Homodimer formation lagrange
             if binding_system in ["homodimerformationlagrange", "homodimerlagrange"]:
-                self.system = System_lagrange_homodimerformation__pp()
+                self.system = systems.System_lagrange_homodimerformation__pp()
             # Homodimer formation kinetic
             if binding_system in ["homodimerformationkinetic", "homodimerkinetic"]:
-                self.system = System_kinetic_homodimerformation__pp()
+                self.system = systems.System_kinetic_homodimerformation__pp()
             # Homodimer formation minimizer
             if binding_system in [
                 "homodimerformationmin",
@@ -309,15 +584,15 @@ class BindingCurve:
                 "homodimerminimiser",
                 "homodimerminimizer",
             ]:
-                self.system = System_minimizer_homodimerformation__pp()
+                self.system = systems.System_minimizer_homodimerformation__pp()
 
             # Competition
             if binding_system in ["competition", "1:1:1", "competitionanalytical", "1:1:1analytical"]:
-                self.system = System_analytical_competition__pl()
+                self.system = systems.System_analytical_competition__pl()
             if binding_system in ["competitionlagrange", "1:1:1lagrange"]:
-                self.system = System_lagrange_competition_pl()
+                self.system = systems.System_lagrange_competition_pl()
             if binding_system in ["competitionkinetic", "1:1:1kinetic"]:
-                self.system = System_kinetic_competition_pl()
+                self.system = systems.System_kinetic_competition_pl()
             if binding_system in [
                 "competitionmin",
                 "competitionminimiser",
@@ -326,144 +601,188 @@ class BindingCurve:
                 "1:1:1minimiser",
                 "1:1:1minimizer",
             ]:
-                self.system = System_minimizer_competition__pl()
+                self.system = systems.System_minimizer_competition__pl()
 
             # Homodimer breaking minimizer
             if binding_system in ["homodimerbreaking", "homodimerbreakingmin"]:
-                self.system = System_minimizer_homodimerbreaking__pp()
+                self.system = systems.System_minimizer_homodimerbreaking__pp()
             # Homodimer breaking lagrange
             if binding_system in ["homodimerbreakinglagrange"]:
-                self.system = System_lagrange_homodimerbreaking__pp()
+                self.system = systems.System_lagrange_homodimerbreaking__pp()
             # Homodimer breaking analytical
             if binding_system in ["homodimerbreakinganalytical"]:
-                self.system = System_analytical_homodimerbreaking_pp()
+                self.system = systems.System_analytical_homodimerbreaking_pp()
+            # Homodimer breaking analytical, physical solution only
+            if binding_system in ["homodimerbreakinganalyticalphysical"]:
+                self.system = systems.System_analytical_homodimerbreaking_pp(all_solutions=False)
             # Homodimer breaking kinetic
             if binding_system in ["homodimerbreakingkinetic"]:
-                self.system = System_kinetic_homodimerbreaking__pp()
+                self.system = systems.System_kinetic_homodimerbreaking__pp()
 
             # 1:2 minimizer
             if binding_system in ["1:2", "1:2min", "1:2minimiser", "1:2minimizer"]:
-                self.system = System_minimizer_1_to_2__pl12()
+                self.system = systems.System_minimizer_1_to_2__pl12()
             # 1:2 lagrange
             if binding_system in ["1:2lagrange"]:
-                self.system = System_lagrange_1_to_2__pl12()
+                self.system = systems.System_lagrange_1_to_2__pl12()
 
             # 1:3 minimizer
             if binding_system in ["1:3", "1:3min", "1:3minimiser", "1:3minimizer"]:
-                self.system = System_minimizer_1_to_3__pl123()
+                self.system = systems.System_minimizer_1_to_3__pl123()
             # 1:3 lagrange
             if binding_system in ["1:3lagrange"]:
-                self.system = System_lagrange_1_to_3__pl123()
+                self.system = systems.System_lagrange_1_to_3__pl123()
+        elif isinstance(binding_system, BindingSystem):
+            self.system = binding_system
         else:
             if issubclass(binding_system, BindingSystem):
                 self.system = binding_system()
         assert self.system is not None, "Invalid system specified, try one of: ['simple', 'homodimer formation', 'competition', 'homdimer breaking'], pass a system object, or define a custom binding system"
 
-    def _initialize_plot(self):
-        """
-        Initialise setup to being ready for curve plotting
-
-        Control setups needed for plotting a binding plot including layouts
-        of subplots, grid lines, and y-axis view limits, etc.
-        """
-
-        if self.fig is None:
-
-            # Here we reset a lot as the user may be making multiple
-            # plots one after the other
-            self._last_custom_readout = None
-            self.curves = []
-            self.axes = None
-
-            self._min_x_axis = 0.0
-            self._max_x_axis = 0.0
-            self._min_y_axis = 0.0
-            self._max_y_axis = 0.0
-            self._num_added_traces = 0
-            self._num_added_sets_of_points = 0
-            self._last_known_changing_parameter = "X"
-
-            self.fig, self.axes = plt.subplots(
-                nrows=1, ncols=1, figsize=pbc_plot_style["fig_size"]
-            )
-            self.axes.grid(True, which="both")
-            self.axes.set_ylim(0, 1)
-            plt.tight_layout(rect=(0.05, 0.05, 0.95, 0.92))
-
-    def add_curve(self, parameters: dict, name: str = None, readout: Readout = None):
+    def compute_curves(
+        self,
+        parameters: dict,
+        name: str = None,
+        readout: Readout = None,
+        adaptive_tolerance: float = None,
+    ):
         """
-        Add a curve to the plot
+        Compute curves without plotting
 
-        Add a curve as specified by the system parameters to the
-        pbc.BindingSystem's internal plot using the underlying binding system
-        specified on intitialisation.
+        Curves are simulated as for add_curve, but returned rather than
+        added to the plot, so may be used without matplotlib.
 
         Parameters
         ----------
         parameters : dict
-            Parameters defining the system to be simulated
+            Parameters defining the system to be simulated, with one changing
+            parameter
         name : str or None, optional
-            Name of curve to appear in plot legends
+            Name of curve to appear in plot legends, numbered for systems
+            with multiple solutions. If None, curves are named by their
+            number when drawn
         readout : Readout.function, optional
             Change the system readout to one described by a custom readout
             function.  Predefined standard readouts can be found in the static
             pbc.Readout class.
+        adaptive_tolerance : float or None, optional
+            If given, rather than querying every value of the changing
+            parameter, sample between its lowest and highest values using
+            adaptive_titration with this tolerance (default = None)
+
+        Returns
+        -------
+        list
+            Curve objects, one for each solution of the system, or an empty
+            list if the parameters do not describe a curve.
         """
         if self.system is None:
             print("No system defined, could not proceed")
-            return None
-        self._initialize_plot()
+            return []
         changing_parameters = self._find_changing_parameters(parameters)
         if changing_parameters is None:
             print("No changing parameters detected. Plotting curves requires something to be changing")
-            return
+            return []
         if not len(changing_parameters) == 1:
             print("Must have 1 changing parameter, no curves added.")
-            return
-
-        y_values = self.system.query(parameters)
+            return []
 
+        if adaptive_tolerance is None:
+            y_values = self.system.query(parameters)
+        else:
+            x_values, y_values = self.adaptive_titration(parameters, adaptive_tolerance)
+            parameters = {**parameters, changing_parameters[0]: x_values}
+        ylabel = "[" + self.system.default_readout.upper() + "]"
         if readout is not None:
-            self._last_custom_readout, y_values = readout(parameters, y_values)
+            ylabel, y_values = readout(parameters, y_values)
 
         # It may be that we have multiple solutions from a direct analytical
-        # solution.  If so, then we need to add all curves.
-        if y_values.ndim > 1:  # Multiple solutions
-            for i in range(y_values.ndim):
-                self.curves.append(
-                    _Curve(parameters[changing_parameters[0]], y_values[i])
-                )
+        # solution.  If so, then we need to return all curves.
+        if y_values.ndim == 1:  # Only one solution
+            y_values = y_values[np.newaxis]
+            names = [name]
         else:
-            self.curves.append(  # Only one solution
-                _Curve(parameters[changing_parameters[0]], y_values)
-            )
-        self._last_known_changing_parameter = changing_parameters[0]
+            names = [
+                None if name is None else f"{name} {i + 1}" for i in range(len(y_values))
+            ]
+        return [
+            Curve(parameters[changing_parameters[0]], y, n, changing_parameters[0], ylabel)
+            for y, n in zip(y_values, names)
+        ]
 
-        for curve_it, curve in enumerate(self.curves[self._num_added_traces :]):
-            self._num_added_traces += 1
-            curve_name_with_number = None
-            if name is None:
-                curve_name_with_number = f"Curve {self._num_added_traces}"
-            else:
-                if y_values.ndim == 1:
-                    curve_name_with_number = name
-                else:
-                    curve_name_with_number = name + " " + str(curve_it + 1)
-            self.axes.plot(
-                curve.xcoords,
-                curve.ycoords,
-                self.plot_solution_colours[self._num_added_traces] + "-",
-                label=curve_name_with_number,
-                linewidth=2,
-            )
-            self._max_x_axis = np.nanmax(
-                [self._max_x_axis, parameters[changing_parameters[0]][-1]]
-            )
-            self._min_x_axis = np.nanmin(
-                [self._min_x_axis, parameters[changing_parameters[0]][0]]
-            )
-            self._min_y_axis = np.nanmin([self._min_y_axis, np.nanmin(curve.ycoords)])
-            self._max_y_axis = np.nanmax([self._max_y_axis, np.nanmax(curve.ycoords)])
+    def _start_plot(self):
+        """
+        Start a new plot if the last has been shown
+
+        Showing a plot consumes it, so curves and scatter points added
+        afterwards begin a new plot.
+        """
+        if self._plot_shown:
+            self.curves = []
+            self.scatters = []
+            self._plot_shown = False
+
+    def attach_plot(self, plot_style: dict = pbc_plot_style):
+        """
+        Attach a renderer, drawing curves and scatter points added so far
+
+        Plots are attached by show_plot if not already, so attaching is only
+        required to work with the figure (through the fig and axes
+        attributes) before it is shown. Curves and scatter points added while
+        a plot is attached are drawn as they are added.
+
+        Parameters
+        ----------
+        plot_style : dict
+            Plot style, as pbc_plot_style (default = pbc_plot_style)
+
+        Returns
+        -------
+        CurvePlot
+            The attached renderer.
+        """
+        self._start_plot()
+        if self.plot is None:
+            self.plot = CurvePlot(plot_style)
+            self.plot.add_curves(self.curves)
+            for xcoords, ycoords, name in self.scatters:
+                self.plot.add_scatter(xcoords, ycoords, name)
+        return self.plot
+
+    def add_curve(
+        self,
+        parameters: dict,
+        name: str = None,
+        readout: Readout = None,
+        adaptive_tolerance: float = None,
+    ):
+        """
+        Add a curve to the plot
+
+        Add a curve as specified by the system parameters to the
+        pbc.BindingSystem's internal plot using the underlying binding system
+        specified on intitialisation. Curves are computed by compute_curves,
+        and only drawn once a plot is attached (see attach_plot).
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the system to be simulated
+        name : str or None, optional
+            Name of curve to appear in plot legends
+        readout : Readout.function, optional
+            Change the system readout to one described by a custom readout
+            function.  Predefined standard readouts can be found in the static
+            pbc.Readout class.
+        adaptive_tolerance : float or None, optional
+            If given, sample the curve adaptively, as for compute_curves
+            (default = None)
+        """
+        self._start_plot()
+        curves = self.compute_curves(parameters, name, readout, adaptive_tolerance)
+        self.curves.extend(curves)
+        if self.plot is not None:
+            self.plot.add_curves(curves)
 
     def add_scatter(self, xcoords, ycoords, name: str = None):
         """
@@ -482,15 +801,12 @@ class BindingCurve:
         name : str or None, optional
             Name of series to appear in plot legends
         """
-        self._initialize_plot()
-        self._num_added_sets_of_points += 1
+        self._start_plot()
         if name is None:
-            name = f"Data " + str(self._num_added_sets_of_points)
-        self.axes.scatter(xcoords, ycoords, label=name)
-        self._min_x_axis = min(self._min_x_axis, np.min(np.real(xcoords)))
-        self._max_x_axis = max(self._max_x_axis, np.max(np.real(xcoords)))
-        self._min_y_axis = min(self._min_y_axis, np.min(np.real(ycoords)))
-        self._max_y_axis = max(self._max_y_axis, np.max(np.real(ycoords)))
+            name = f"Data " + str(len(self.scatters) + 1)
+        self.scatters.append((xcoords, ycoords, name))
+        if self.plot is not None:
+            self.plot.add_scatter(xcoords, ycoords, name)
 
     def show_plot(
         self,
@@ -512,7 +828,7 @@ class BindingCurve:
         Show the PyBindingCurve plot
 
         Function to display the internal state of the pbc BindingCurve objects
-        plot.
+        plot, attaching a plot (see attach_plot) if one is not already.
 
         Parameters
         ----------
@@ -534,100 +850,36 @@ class BindingCurve:
             Log scale on X-axis (default = False)
         log_y_axis : bool
             Log scale on Y-axis (default = False)
-        ma_style : bool
-            Apply MA styling, making plots appear like GraFit plots
+        pbc_plot_style : dict
+            Plot style, used if no plot is attached (default =
+            pbc_plot_style)
         png_filename :  str
             File name/location where png will be written
         svg_filename : str
             File name/location where svg will be written
         """
-        assert self.fig is not None, "Nothing to plot"
-
-        if min_x is not None:
-            self._min_x_axis = min_x
-        if max_x is not None:
-            self._max_x_axis = max_x
-        if min_y is not None:
-            self._min_y_axis = min_y
-        if max_y is not None:
-            self._max_y_axis = max_y
-
-        if max_y is None:
-            self.axes.set_ylim(self._min_y_axis, self._max_y_axis * 1.1)
-        else:
-            self.axes.set_ylim(self._min_y_axis, self._max_y_axis)
-        self.axes.set_xlim(self._min_x_axis, self._max_x_axis)
-        if log_x_axis:
-            self.axes.set_xscale("log", nonposx="clip")
-        if log_y_axis:
-            self.axes.set_yscale("log", nonposx="clip")
-
-        if xlabel is None:
-            self.axes.set_xlabel(
-                "[" + self._last_known_changing_parameter.upper() + "]",
-                fontsize=pbc_plot_style["axis_label_size"],
-                fontname=pbc_plot_style["axis_label_font"],
-                labelpad=pbc_plot_style["x_axis_labelpad"],
-            )
-        else:
-            self.axes.set_xlabel(
-                xlabel,
-                fontsize=pbc_plot_style["axis_label_size"],
-                fontname=pbc_plot_style["axis_label_font"],
-                labelpad=pbc_plot_style["x_axis_labelpad"],
-            )
-
-        if ylabel is None:
-            if self._last_custom_readout is None:
-                self.axes.set_ylabel(
-                    "[" + self.system.default_readout.upper() + "]",
-                    fontsize=pbc_plot_style["axis_label_size"],
-                    fontname=pbc_plot_style["axis_label_font"],
-                    labelpad=pbc_plot_style["y_axis_labelpad"],
-                )
-            else:
-                self.axes.set_ylabel(
-                    self._last_custom_readout,
-                    fontsize=pbc_plot_style["axis_label_size"],
-                    fontname=pbc_plot_style["axis_label_font"],
-                    labelpad=pbc_plot_style["y_axis_labelpad"],
-                )
-        else:
-            self.axes.set_ylabel(
-                ylabel,
-                fontsize=pbc_plot_style["axis_label_size"],
-                fontname=pbc_plot_style["axis_label_font"],
-                labelpad=pbc_plot_style["y_axis_labelpad"],
-            )
-
-        self.axes.set_title(
-            title,
-            fontsize=pbc_plot_style["title_size"],
-            fontname=pbc_plot_style["title_font"],
-            pad=pbc_plot_style["title_labelpad"],
+        assert len(self.curves) + len(self.scatters) > 0 and not self._plot_shown, "Nothing to plot"
+        if ylabel is None and len(self.curves) == 0:
+            ylabel = "[" + self.system.default_readout.upper() + "]"
+        plot = self.attach_plot(pbc_plot_style)
+        plot.show(
+            title=title,
+            xlabel=xlabel,
+            ylabel=ylabel,
+            min_x=min_x,
+            max_x=max_x,
+            min_y=min_y,
+            max_y=max_y,
+            log_x_axis=log_x_axis,
+            log_y_axis=log_y_axis,
+            png_filename=png_filename,
+            svg_filename=svg_filename,
+            show_legend=show_legend,
         )
-
-        if show_legend:
-            self.axes.legend(prop={"size": pbc_plot_style["legend_font_size"]})
-
-        self.axes.tick_params(axis='x', which='major', labelsize=pbc_plot_style["x_tick_label_font_size"])
-        self.axes.tick_params(axis='y', which='major', labelsize=pbc_plot_style["y_tick_label_font_size"])
-
-        if png_filename is not None:
-            plt.savefig(
-                png_filename,
-                dpi=pbc_plot_style["dpi"],
-                metadata={"Title": "pyBindingCurve plot"},
-            )
-        if svg_filename is not None:
-            plt.savefig(svg_filename, metadata={"Title": "pyBindingCurve plot"})
-        plt.show()
-        # Calling show displays, and then consumes the figure, so we should
-        # set it to Null so that the next initialisation sets up a new figure.
-        self.fig = None
-        plt.clf()
-        plt.cla()
-        plt.close()
+        # Showing displays, and then consumes the figure, so the next curve
+        # or scatter points added start a new plot.
+        self.plot = None
+        self._plot_shown = True
 
     def fit(
         self,
@@ -710,6 +962,8 @@ class BindingCurve:
         # Add parameters for lmfit, accounting for bounds
         if bounds is None:
             bounds = {}
+        import lmfit
+
         params = lmfit.Parameters()
         for varname in to_fit.keys():
             # Do not be tempted to set bnd_min to 0 to help the minimizer as
@@ -728,7 +982,12 @@ class BindingCurve:
         lmmini = lmfit.Minimizer(
             self._residual, params, fcn_args=(system_parameters_copy, to_fit, ycoords)
         )
-        result = lmmini.minimize()
+        # Use derivatives of the readout where the system provides them,
+        # otherwise lmfit estimates them by finite differences
+        if self.system.species_function is not None and getattr(self.system, "num_solutions", 1) == 1:
+            result = lmmini.minimize(Dfun=self._jacobian)
+        else:
+            result = lmmini.minimize()
 
         # Check that any fitted KDs are not negative
         for k in system_parameters_copy.keys():
@@ -744,6 +1003,420 @@ class BindingCurve:
             dict((p, result.params[p].stderr) for p in result.params),
         )
 
+    def fit_multistart(
+        self,
+        system_parameters: dict,
+        to_fit: dict,
+        ycoords: np.array,
+        bounds: dict,
+        num_starts: int = 16,
+        processes: int = None,
+        agreement: int = 3,
+        rtol: float = 1e-4,
+        seed: int = None,
+    ):
+        """
+        Fit the parameters of a system from many starting points
+
+        Fits are started from the values in to_fit, and from further
+        starting points drawn at random within bounds, log-uniformly for
+        parameters with positive bounds (such as KDs) and uniformly
+        otherwise. Parameters without finite bounds always start from their
+        value in to_fit. Fits are run concurrently on a pool of worker
+        processes, stopping early once agreement fits have reached the best
+        solution found so far, within rtol.
+
+        Parameters
+        ----------
+        system_parameters : dict
+            Dictionary containing system parameters, will be used as arguments
+            to the systems equations.
+        to_fit : dict
+            Dictionary containing system parameters to fit, with the values
+            used for the first start.
+        ycoords : np.array
+            Y coordinates of data the system parameters should be fit to
+        bounds : dict
+            Dictionary of tuples, indexed by system parameters denoting the
+            lower and upper bounds of a system parameter being fit, within
+            which starting points are drawn.
+        num_starts : int
+            Maximum number of starting points, including to_fit
+            (default = 16).
+        processes : int or None
+            Number of worker processes, None uses all available cores, and 1
+            fits in the current process (default = None).
+        agreement : int
+            Number of fits which must agree with the best before stopping
+            early, None runs every start (default = 3).
+        rtol : float
+            Relative tolerance within which fitted parameters and the sum of
+            squared residuals must match the best for fits to agree
+            (default = 1e-4).
+        seed : int or None
+            Seed for drawing starting points (default = None).
+
+        Returns
+        -------
+        tuple (dict, dict, list)
+            Tuple containing a dictionary of best fit systems parameters, a
+            dictionary containing the accuracy for fitted variables, and a
+            list of the local optima reached by every completed fit, as
+            dictionaries with keys "start", "system_parameters", "accuracy"
+            and "chisqr" (the sum of squared residuals), best first.
+        """
+        rng = np.random.default_rng(seed)
+        starts = [dict(to_fit)]
+        for _ in range(num_starts - 1):
+            start = dict(to_fit)
+            for name in to_fit:
+                low, high = bounds.get(name, (-np.inf, np.inf))
+                if not (np.isfinite(low) and np.isfinite(high)):
+                    continue
+                if low > 0:
+                    start[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                else:
+                    start[name] = float(rng.uniform(low, high))
+            starts.append(start)
+
+        optima = []
+        # Sums of squared residuals at the level of rounding error are equal
+        chisqr_atol = np.finfo(float).eps * float(np.sum(np.square(ycoords)))
+
+        def agreeing():
+            # Number of fits matching the best fit found so far
+            if agreement is None or len(optima) == 0:
+                return 0
+            best = min(optima, key=lambda optimum: optimum["chisqr"])
+            return sum(
+                optimum["chisqr"] <= best["chisqr"] * (1 + rtol) + chisqr_atol
+                and all(
+                    np.isclose(
+                        optimum["system_parameters"][name],
+                        best["system_parameters"][name],
+                        rtol=rtol,
+                        atol=0,
+                    )
+                    for name in to_fit
+                )
+                for optimum in optima
+            )
+
+        arguments = (self.system, self.disable_signal_warning, system_parameters)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes == 1:
+            for start in starts:
+                optimum = _fit_from_start(*arguments, start, ycoords, bounds)
+                if optimum is not None:
+                    optima.append(optimum)
+                if agreement is not None and agreeing() >= agreement:
+                    break
+        else:
+            executor = ProcessPoolExecutor(max_workers=processes)
+            try:
+                futures = [
+                    executor.submit(_fit_from_start, *arguments, start, ycoords, bounds)
+                    for start in starts
+                ]
+                for future in as_completed(futures):
+                    optimum = future.result()
+                    if optimum is not None:
+                        optima.append(optimum)
+                    if agreement is not None and agreeing() >= agreement:
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        assert len(optima) > 0, "No fits were successful, unable to fit"
+        optima.sort(key=lambda optimum: optimum["chisqr"])
+        return optima[0]["system_parameters"], optima[0]["accuracy"], optima
+
+    def fit_resampling(
+        self,
+        system_parameters: dict,
+        to_fit: dict,
+        ycoords: np.array,
+        bounds: dict = None,
+        method: str = "residual",
+        num_resamples: int = 1000,
+        confidence: float = 0.95,
+        processes: int = None,
+        seed: int = None,
+    ):
+        """
+        Confidence intervals of fitted parameters by resampling
+
+        The system is first fit to the data, and then refit to resampled
+        data, with every refit starting from the first (point) estimate.
+        Resampling methods are:
+
+        "residual": residual bootstrap, adding residuals of the point
+        estimate, drawn with replacement, to its fitted values.
+        "case": case bootstrap, drawing data points with replacement.
+        "jackknife": leaving out each data point in turn.
+
+        Refits are spread over a pool of worker processes. Bootstrap
+        intervals are percentile intervals of the bootstrap distribution,
+        and jackknife intervals are normal intervals using the jackknife
+        standard error.
+
+        Parameters
+        ----------
+        system_parameters : dict
+            Dictionary containing system parameters, will be used as arguments
+            to the systems equations. Array-like parameters must have one
+            value per data point.
+        to_fit : dict
+            Dictionary containing system parameters to fit.
+        ycoords : np.array
+            Y coordinates of data the system parameters should be fit to
+        bounds : dict
+            Dictionary of tuples, indexed by system parameters denoting the
+            lower and upper bounds of a system parameter being fit, optional,
+            default = None
+        method : str
+            One of "residual", "case" or "jackknife" (default = "residual").
+        num_resamples : int
+            Number of bootstrap resamples, jackknife resamples are one per
+            data point (default = 1000).
+        confidence : float
+            Confidence level of intervals (default = 0.95).
+        processes : int or None
+            Number of worker processes, None uses all available cores, and 1
+            fits in the current process (default = None).
+        seed : int or None
+            Seed for drawing bootstrap resamples (default = None).
+
+        Returns
+        -------
+        tuple (dict, dict, np.ndarray)
+            Tuple containing a dictionary of best fit system parameters, a
+            dictionary of (lower, upper) confidence intervals for fitted
+            parameters, and the fitted parameters for every resample with a
+            row per resample and a column per parameter in to_fit (NaN where
+            a fit failed).
+        """
+        assert method in ["residual", "case", "jackknife"], f"Unknown resampling method: {method}"
+        ycoords = np.asarray(ycoords, dtype=float)
+        fitted_system, _ = self.fit(system_parameters, to_fit, ycoords, bounds)
+        fitted_values = self.system.query(dict(fitted_system))
+        num_points = len(ycoords)
+        rng = np.random.default_rng(seed)
+        if method == "residual":
+            residuals = ycoords - fitted_values
+            resamples = [
+                (np.arange(num_points), fitted_values + rng.choice(residuals, num_points))
+                for _ in range(num_resamples)
+            ]
+        elif method == "case":
+            resamples = []
+            for _ in range(num_resamples):
+                indices = np.sort(rng.integers(0, num_points, num_points))
+                resamples.append((indices, ycoords[indices]))
+        else:
+            resamples = [
+                (np.delete(np.arange(num_points), i), np.delete(ycoords, i))
+                for i in range(num_points)
+            ]
+
+        start = dict((name, fitted_system[name]) for name in to_fit)
+        arguments = (self.system, self.disable_signal_warning, system_parameters, start, bounds)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes == 1:
+            distribution = _refit_resamples(*arguments, resamples)
+        else:
+            # A few batches per process balances load without sending every
+            # resample separately
+            batches = np.array_split(np.arange(len(resamples)), 4 * processes)
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = executor.map(
+                    _refit_resamples,
+                    *zip(
+                        *[
+                            arguments + ([resamples[i] for i in batch],)
+                            for batch in batches
+                            if len(batch) > 0
+                        ]
+                    ),
+                )
+                distribution = np.concatenate(list(results))
+
+        intervals = {}
+        for column, name in enumerate(to_fit):
+            values = distribution[:, column]
+            values = values[np.isfinite(values)]
+            if method == "jackknife":
+                standard_error = np.sqrt(
+                    (len(values) - 1) / len(values) * np.sum((values - np.mean(values)) ** 2)
+                )
+                import scipy.stats
+
+                z = scipy.stats.norm.ppf(0.5 + confidence / 2)
+                intervals[name] = (
+                    float(fitted_system[name] - z * standard_error),
+                    float(fitted_system[name] + z * standard_error),
+                )
+            else:
+                intervals[name] = tuple(
+                    float(v)
+                    for v in np.percentile(values, [50 * (1 - confidence), 50 * (1 + confidence)])
+                )
+        return fitted_system, intervals, distribution
+
+    def fit_profile(
+        self,
+        system_parameters: dict,
+        to_fit: dict,
+        ycoords: np.array,
+        bounds: dict = None,
+        profile: list = None,
+        grids: dict = None,
+        num_values: int = 21,
+        span: float = 100.0,
+        confidence: float = 0.95,
+        processes: int = None,
+    ):
+        """
+        Profile likelihood of fitted parameters
+
+        The system is first fit to the data. Each profiled parameter is then
+        fixed at a grid of values, and the other parameters refit at every
+        value, walking outwards from the best fit in both directions with
+        each refit starting from the solution at the neighbouring value.
+        Profiles (and the two directions of each) are run in parallel on a
+        pool of worker processes.
+
+        Assuming normally distributed errors of unknown variance, the
+        likelihood ratio statistic at each value is n*log(chisqr/chisqr_min)
+        for n data points, and likelihood ratio intervals contain values
+        where it is below the chi-squared (one degree of freedom) quantile
+        for the given confidence.
+
+        Parameters
+        ----------
+        system_parameters : dict
+            Dictionary containing system parameters, will be used as arguments
+            to the systems equations.
+        to_fit : dict
+            Dictionary containing system parameters to fit.
+        ycoords : np.array
+            Y coordinates of data the system parameters should be fit to
+        bounds : dict
+            Dictionary of tuples, indexed by system parameters denoting the
+            lower and upper bounds of a system parameter being fit, optional,
+            default = None
+        profile : list or None
+            Names of parameters to profile, None profiles all parameters in
+            to_fit (default = None).
+        grids : dict or None
+            Values at which to fix profiled parameters, indexed by parameter
+            name. Parameters without a grid use num_values values spaced
+            logarithmically from their best fit divided by span to their
+            best fit multiplied by span, requiring a positive best fit
+            (default = None).
+        num_values : int
+            Number of values in default grids (default = 21).
+        span : float
+            Factor above and below the best fit covered by default grids
+            (default = 100.0).
+        confidence : float
+            Confidence level of intervals (default = 0.95).
+        processes : int or None
+            Number of worker processes, None uses all available cores, and 1
+            fits in the current process (default = None).
+
+        Returns
+        -------
+        tuple (dict, dict, dict)
+            Tuple containing a dictionary of best fit system parameters, a
+            dictionary of profiles and a dictionary of (lower, upper)
+            likelihood ratio intervals, indexed by profiled parameter.
+            Profiles are dictionaries of "values" (the sorted grid),
+            "chisqr" (sum of squared residuals), "statistic" (likelihood
+            ratio statistic) and "fitted" (values of the other fitted
+            parameters, with a column per parameter), NaN where a fit failed.
+            Interval bounds are None where the profile does not cross the
+            threshold within the grid.
+        """
+        ycoords = np.asarray(ycoords, dtype=float)
+        if bounds is None:
+            bounds = {}
+        if grids is None:
+            grids = {}
+        if profile is None:
+            profile = list(to_fit)
+        fitted_system, _ = self.fit(system_parameters, to_fit, ycoords, bounds)
+        best_chisqr = float(np.sum(np.square(self.system.query(dict(fitted_system)) - ycoords)))
+
+        tasks = []
+        for name in profile:
+            best = fitted_system[name]
+            if name in grids:
+                grid = np.asarray(grids[name], dtype=float)
+            else:
+                assert best > 0, f"Best fit {name} is not positive, a grid must be given"
+                grid = np.geomspace(best / span, best * span, num_values)
+            grid = np.unique(np.append(grid[~np.isclose(grid, best, rtol=1e-9, atol=0)], best))
+            others = dict((other, fitted_system[other]) for other in to_fit if other != name)
+            fixed = dict((k, v) for k, v in system_parameters.items() if k not in to_fit)
+            for values in [grid[grid >= best], grid[grid < best][::-1]]:
+                tasks.append(
+                    (self.system, self.disable_signal_warning, fixed, others, ycoords, bounds, name, values)
+                )
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes == 1:
+            walks = [_profile_walk(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                walks = list(executor.map(_profile_walk, *zip(*tasks)))
+
+        import scipy.stats
+
+        threshold = scipy.stats.chi2.ppf(confidence, 1)
+        profiles = {}
+        intervals = {}
+        for index, name in enumerate(profile):
+            above, below = tasks[2 * index][-1], tasks[2 * index + 1][-1]
+            (chisqr_above, fitted_above), (chisqr_below, fitted_below) = walks[2 * index : 2 * index + 2]
+            values = np.concatenate([below[::-1], above])
+            chisqr = np.concatenate([chisqr_below[::-1], chisqr_above])
+            with np.errstate(divide="ignore"):
+                statistic = len(ycoords) * np.log(chisqr / best_chisqr)
+            profiles[name] = {
+                "values": values,
+                "chisqr": chisqr,
+                "statistic": statistic,
+                "fitted": np.concatenate([fitted_below[::-1], fitted_above]),
+            }
+
+            # Interpolate crossings of the threshold either side of the best
+            # fit, logarithmically for positive grids. The square root of
+            # the statistic is close to linear in the parameter.
+            log_scale = np.all(values > 0)
+            scaled = np.log(values) if log_scale else values
+            root = np.sqrt(np.maximum(statistic, 0))
+            bounds_found = []
+            for indices in [np.arange(len(below) - 1, -1, -1), np.arange(len(below), len(values))]:
+                crossing = None
+                previous = np.searchsorted(values, fitted_system[name])
+                for i in indices:
+                    if not np.isfinite(statistic[i]):
+                        continue
+                    if statistic[i] >= threshold:
+                        r0, r1 = root[previous], root[i]
+                        x0, x1 = scaled[previous], scaled[i]
+                        x = x0 + (np.sqrt(threshold) - r0) * (x1 - x0) / (r1 - r0)
+                        crossing = float(np.exp(x) if log_scale else x)
+                        break
+                    previous = i
+                bounds_found.append(crossing)
+            intervals[name] = tuple(bounds_found)
+        return fitted_system, profiles, intervals
+
     def _residual(self, params, system_parameters: dict, to_fit: dict, y: np.array):
         """
         Residual function for fitting parameters.
@@ -768,7 +1441,243 @@ class BindingCurve:
         for value in params:
             system_parameters[value] = float(params[value])
         return self.system.query(system_parameters) - y
+
+    def _jacobian(self, params, system_parameters: dict, to_fit: dict, y: np.array):
+        """
+        Jacobian of the residual function for fitting parameters.
+
+        Helper function for lm_fit, giving derivatives of the residual with
+        respect to varied parameters, calculated by the system (see
+        BindingSystem.query_derivatives).
+
+        Parameters
+        ----------
+        params : dict
+            A dictionary of the parameters required to be evaluated to a fit model.
+        system_parameters : dict
+            Dictionary containing system parameters, will be used as arguments to the systems equations.
+        to_fit : dict
+            Dictionary containing system parameters to fit.
+        y : np.array
+            A array-like data containing the system parameters should be fit to
+        Returns
+        -------
+            Array of derivatives with a row per datapoint and a column per varied parameter.
+        """
+        for value in params:
+            system_parameters[value] = float(params[value])
+        varied = [value for value in params if params[value].vary]
+        _, derivatives = self.system.query_derivatives(system_parameters, varied)
+        return np.stack(
+            [np.broadcast_to(derivatives[value], np.shape(y)).ravel() for value in varied],
+            axis=-1,
+        )
     
+    def fit_global(
+        self,
+        system_parameters: list,
+        shared: dict,
+        per_curve: Union[dict, list],
+        ycoords: list,
+        bounds: dict = None,
+    ):
+        """
+        Fit the parameters of a system to many curves at once
+
+        Global fitting of several (usually) experimental curves, such as
+        titrations at different protein concentrations, with some parameters
+        shared between all curves (such as a KD) and others fit separately
+        for each curve (such as ymin and ymax). Residuals of all curves are
+        stacked and every curve is evaluated in a single query of the system.
+
+        Parameters
+        ----------
+        system_parameters : list
+            List of dictionaries containing system parameters for each curve,
+            will be used as arguments to the systems equations.
+        shared : dict
+            Dictionary containing system parameters to fit which are shared
+            by all curves, with their initial values.
+        per_curve : dict or list
+            Dictionary containing system parameters to fit separately for
+            each curve, with their initial values, or a list of such
+            dictionaries (one per curve) giving different initial values.
+        ycoords : list
+            List of arrays of Y coordinates for each curve.
+        bounds : dict
+            Dictionary of tuples, indexed by system parameters denoting the
+            lower and upper bounds of a system parameter being fit, applying
+            to shared and per curve parameters alike, optional,
+            default = None
+
+        Returns
+        -------
+        tuple (list, list)
+            Tuple containing a list of dictionaries of best fit system
+            parameters for each curve, then a list of dictionaries containing
+            the accuracy of fitted variables for each curve, including those
+            shared.
+        """
+        num_curves = len(system_parameters)
+        assert len(ycoords) == num_curves, "One array of ycoords is required per curve"
+        if isinstance(per_curve, dict):
+            per_curve = [per_curve] * num_curves
+        assert len(per_curve) == num_curves, "One per_curve dictionary is required per curve"
+        both = sorted(set(shared) & set(k for to_fit in per_curve for k in to_fit))
+        assert len(both) == 0, f"Parameters cannot be both shared and per curve: {both}"
+        for curve_parameters, to_fit in zip(system_parameters, per_curve):
+            missing = sorted(
+                set(self.system.arguments) - set([*curve_parameters, *shared, *to_fit])
+            )
+            assert len(missing) == 0, f"The following parameters were missing: {missing}"
+
+        # lmfit parameters are named as system parameters, with per curve
+        # parameters suffixed by the index of their curve
+        if bounds is None:
+            bounds = {}
+        import lmfit
+
+        params = lmfit.Parameters()
+        for name, value in list(shared.items()) + [
+            (f"{name}_{i}", value)
+            for i, to_fit in enumerate(per_curve)
+            for name, value in to_fit.items()
+        ]:
+            base_name = name if name in shared else name.rsplit("_", 1)[0]
+            bnd_min, bnd_max = bounds.get(base_name, (-np.inf, np.inf))
+            params.add(name, value=value, min=bnd_min, max=bnd_max)
+
+        ycoords = [np.ravel(np.asarray(y, dtype=float)) for y in ycoords]
+        curves = [
+            (dict(curve_parameters), dict(to_fit), len(y))
+            for curve_parameters, to_fit, y in zip(system_parameters, per_curve, ycoords)
+        ]
+        stacked_ycoords = np.concatenate(ycoords)
+
+        fit_kws = {}
+        if self.system.species_function is not None and getattr(self.system, "num_solutions", 1) == 1:
+            fit_kws["Dfun"] = self._global_jacobian
+        lmmini = lmfit.Minimizer(
+            self._global_residual, params, fcn_args=(curves, shared, stacked_ycoords)
+        )
+        result = lmmini.minimize(**fit_kws)
+
+        fitted_systems = []
+        fit_accuracy = []
+        for i, (curve_parameters, to_fit, _) in enumerate(curves):
+            fitted = dict(curve_parameters)
+            accuracy = {}
+            for name in shared:
+                fitted[name] = result.params[name].value
+                accuracy[name] = result.params[name].stderr
+            for name in to_fit:
+                fitted[name] = result.params[f"{name}_{i}"].value
+                accuracy[name] = result.params[f"{name}_{i}"].stderr
+            for k in fitted.keys():
+                if k.startswith("kd"):
+                    assert (
+                        np.all(np.asarray(fitted[k]) > 0)
+                    ), f"Error, Fitted KD is negative ({fitted[k]}), unable to fit"
+            fitted_systems.append(fitted)
+            fit_accuracy.append(accuracy)
+        return fitted_systems, fit_accuracy
+
+    def _stack_global_parameters(self, params, curves: list, shared: dict):
+        """
+        Stack the parameters of all curves for a single query
+
+        Parameters
+        ----------
+        params : dict
+            lmfit parameters, per curve parameters suffixed by curve index.
+        curves : list
+            Tuples of (system parameters, per curve parameters to fit,
+            number of points) for every curve.
+        shared : dict
+            Dictionary containing shared system parameters to fit.
+
+        Returns
+        -------
+        dict
+            System parameters for all curves, concatenated as arrays.
+        """
+        stacked = {}
+        for i, (curve_parameters, to_fit, num_points) in enumerate(curves):
+            curve_parameters = dict(curve_parameters)
+            for name in shared:
+                curve_parameters[name] = float(params[name])
+            for name in to_fit:
+                curve_parameters[name] = float(params[f"{name}_{i}"])
+            for name, value in curve_parameters.items():
+                stacked.setdefault(name, []).append(
+                    np.broadcast_to(np.asarray(value, dtype=float), (num_points,))
+                )
+        return dict((name, np.concatenate(values)) for name, values in stacked.items())
+
+    def _global_residual(self, params, curves: list, shared: dict, y: np.array):
+        """
+        Residual function for global fitting of parameters.
+
+        Helper function for lm_fit, calculating stacked residuals of all
+        curves from one query of the system.
+
+        Parameters
+        ----------
+        params : dict
+            A dictionary of the parameters required to be evaluated to a fit model.
+        curves : list
+            Tuples of (system parameters, per curve parameters to fit,
+            number of points) for every curve.
+        shared : dict
+            Dictionary containing shared system parameters to fit.
+        y : np.array
+            Concatenated y coordinates of all curves
+        Returns
+        -------
+            The cost between the experimental datapoints and the values derived from the model.
+        """
+        return self.system.query(self._stack_global_parameters(params, curves, shared)) - y
+
+    def _global_jacobian(self, params, curves: list, shared: dict, y: np.array):
+        """
+        Jacobian of the residual function for global fitting of parameters.
+
+        Parameters
+        ----------
+        params : dict
+            A dictionary of the parameters required to be evaluated to a fit model.
+        curves : list
+            Tuples of (system parameters, per curve parameters to fit,
+            number of points) for every curve.
+        shared : dict
+            Dictionary containing shared system parameters to fit.
+        y : np.array
+            Concatenated y coordinates of all curves
+        Returns
+        -------
+            Array of derivatives with a row per datapoint and a column per varied parameter.
+        """
+        varied = [name for name in params if params[name].vary]
+        base_names = sorted(
+            set(shared) | set(name for _, to_fit, _ in curves for name in to_fit)
+        )
+        _, derivatives = self.system.query_derivatives(
+            self._stack_global_parameters(params, curves, shared), base_names
+        )
+        ends = np.cumsum([num_points for _, _, num_points in curves])
+        columns = []
+        for name in varied:
+            if name in shared:
+                columns.append(derivatives[name])
+                continue
+            base_name, curve = name.rsplit("_", 1)
+            column = np.zeros(len(y))
+            end = ends[int(curve)]
+            start = end - curves[int(curve)][2]
+            column[start:end] = derivatives[base_name][start:end]
+            columns.append(column)
+        return np.stack(columns, axis=-1)
+
     def get_system_arguments(self):
             if self.system is None:
                 return None
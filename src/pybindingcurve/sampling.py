@@ -0,0 +1,93 @@
+"""Adaptive sampling of titration curves
+
+Binding curves are flat over most of a typical titration, bending only
+around the concentrations comparable to KDs and total concentrations, so
+uniformly spaced points spend most evaluations on plateaus. Here curves are
+sampled on a coarse grid which is then refined where linear interpolation
+between neighbouring points fails to predict the curve.
+"""
+
+import numpy as np
+
+
+def adaptive_sample(
+    function: callable,
+    start: float,
+    stop: float,
+    tolerance: float = 1e-3,
+    initial_points: int = 9,
+    max_points: int = 1000,
+    log_scale: bool = False,
+):
+    """Sample a function where its curvature requires it
+
+    Starting from initial_points evenly spaced points, every interval is
+    bisected, and the value at its midpoint compared with the linear
+    interpolation of the values at its ends. Intervals where these differ by
+    more than tolerance (relative to the range of values sampled) are
+    bisected again in the next round, and others are left as they are. All
+    midpoints of a round are evaluated by one call to function. Refinement
+    stops when every interval is within tolerance or max_points have been
+    evaluated.
+
+    Parameters
+    ----------
+    function : callable
+        Function of an array of x values, returning values with x as the
+        last axis, such as (n_points,) or (n_solutions, n_points). The
+        largest error of any leading axis is used.
+    start : float
+        Lowest x value.
+    stop : float
+        Highest x value.
+    tolerance : float
+        Largest interpolation error at midpoints, relative to the range of
+        values sampled (default = 1e-3).
+    initial_points : int
+        Number of points of the initial grid, at least 2 (default = 9).
+    max_points : int
+        Largest number of points evaluated (default = 1000).
+    log_scale : bool
+        Space and bisect points evenly in log(x), interpolating linearly in
+        log(x), for use with logarithmic x axes. start must be positive
+        (default = False).
+
+    Returns
+    -------
+    tuple (np.ndarray, np.ndarray)
+        Increasing x values, and values of function at them.
+    """
+    assert initial_points >= 2, "At least 2 initial points are required"
+    if log_scale:
+        assert start > 0, "Logarithmic sampling requires a positive start"
+        to_x = np.exp
+        u = np.linspace(np.log(start), np.log(stop), initial_points)
+    else:
+        to_x = np.asarray
+        u = np.linspace(start, stop, initial_points)
+    # Ends are given exactly, rather than as exp(log(x))
+    x = to_x(u)
+    x[0], x[-1] = start, stop
+    y = np.asarray(function(x), dtype=float)
+    refine = np.ones(len(u) - 1, dtype=bool)
+    while np.any(refine) and len(u) < max_points:
+        intervals = np.flatnonzero(refine)[: max_points - len(u)]
+        midpoints = (u[intervals] + u[intervals + 1]) / 2
+        x_midpoints = to_x(midpoints)
+        y_midpoints = np.asarray(function(x_midpoints), dtype=float)
+        interpolated = (y[..., intervals] + y[..., intervals + 1]) / 2
+        error = np.abs(y_midpoints - interpolated).reshape(-1, len(intervals))
+        error = np.max(np.nan_to_num(error), axis=0)
+
+        u = np.insert(u, intervals + 1, midpoints)
+        x = np.insert(x, intervals + 1, x_midpoints)
+        y = np.insert(y, intervals + 1, y_midpoints, axis=-1)
+        scale = np.nanmax(y) - np.nanmin(y) if np.any(np.isfinite(y)) else 0.0
+        # Bisected intervals become two, the first at its index in the new
+        # intervals, which is shifted by the midpoints inserted before it
+        first_halves = intervals + np.arange(len(intervals))
+        failed = first_halves[error > tolerance * (scale if scale > 0 else 1.0)]
+        refine = np.zeros(len(u) - 1, dtype=bool)
+        refine[failed] = True
+        refine[failed + 1] = True
+    return x, y
@@ -0,0 +1,501 @@
+"""Parameter sweeps over grids of system parameters
+
+Sweeps query a binding system at every combination of values along any
+number of parameter axes, such as the KD grids used to make heatmaps. The
+grid is split into tiles which are solved in parallel by a pool of worker
+processes, each writing its results directly into a memory-mapped array.
+
+Sweeps may be kept in a result store, a directory holding the results of
+each sweep along with a bitmap of completed points. Interrupted sweeps then
+resume where they left off, and sweeps over new grids reuse points already
+computed on other grids of the same system, such as a coarser grid.
+"""
+
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from pybindingcurve.pybindingcurve import BindingCurve
+from pybindingcurve.systems import BindingSystem
+
+# State held by each worker process, set by _initialize_worker
+_worker = {}
+
+
+def _initialize_worker(system, parameters, axes, readout, output_path, done_path):
+    _worker["system"] = system
+    _worker["parameters"] = parameters
+    _worker["axes"] = axes
+    _worker["readout"] = readout
+    _worker["output"] = np.load(output_path, mmap_mode="r+")
+    _worker["done"] = None if done_path is None else np.load(done_path, mmap_mode="r+")
+
+
+def _check_picklable(readout):
+    """Raise a clear error for readouts which cannot be sent to workers
+
+    Worker processes started by spawn or forkserver (the default on macOS
+    and Windows) receive the readout by pickling, which fails for lambdas,
+    closures and functions defined inside other functions.
+
+    Args:
+        readout (callable or None): Readout function.
+
+    Raises:
+        ValueError: If readout cannot be pickled.
+    """
+    try:
+        pickle.dumps(readout)
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(
+            f"Readout {readout!r} cannot be pickled to send to worker processes "
+            f"started by {multiprocessing.get_start_method()}. Use a function "
+            "defined at module level, or processes=1"
+        ) from error
+
+
+def _query(parameters: dict, shape: tuple):
+    # Query the worker's system, broadcasting the result to shape
+    result = _worker["system"].query(parameters)
+    if _worker["readout"] is not None:
+        result = _worker["readout"](parameters, result)[1]
+    result = np.asarray(result, dtype=float)
+    output = _worker["output"]
+    num_solutions = output.shape[: output.ndim - len(_worker["axes"])]
+    return np.broadcast_to(result, num_solutions + shape)
+
+
+def _solve_tile(tile: tuple):
+    """Solve one tile of the grid, writing results to the output array
+
+    Points of the tile already marked as done in the completion bitmap (if
+    present) are not solved again. Results are flushed to disk before
+    points are marked as done.
+
+    Args:
+        tile (tuple): Slices into each swept axis.
+
+    Returns:
+        int: Number of grid points in the tile.
+    """
+    output = _worker["output"]
+    done = _worker["done"]
+    axis_values = [values[axis_slice] for values, axis_slice in zip(_worker["axes"].values(), tile)]
+    grid_shape = tuple(len(values) for values in axis_values)
+    # Systems with multiple solutions have a leading solutions axis
+    solutions = (slice(None),) * (output.ndim - len(tile))
+    tile_done = np.zeros(grid_shape, dtype=bool) if done is None else np.array(done[tile])
+
+    tile_parameters = dict(_worker["parameters"])
+    if not np.any(tile_done):
+        for axis_index, (name, values) in enumerate(zip(_worker["axes"], axis_values)):
+            shape = [1] * len(tile)
+            shape[axis_index] = -1
+            tile_parameters[name] = values.reshape(shape)
+        output[solutions + tile] = _query(tile_parameters, grid_shape)
+    elif not np.all(tile_done):
+        # Only solve points not yet done, as a flat list of points
+        missing = np.nonzero(~tile_done)
+        for name, values, index in zip(_worker["axes"], axis_values, missing):
+            tile_parameters[name] = values[index]
+        tile_output = np.array(output[solutions + tile])
+        tile_output[solutions + missing] = _query(tile_parameters, (len(missing[0]),))
+        output[solutions + tile] = tile_output
+    output.flush()
+    if done is not None:
+        done[tile] = True
+        done.flush()
+    return int(np.prod(grid_shape))
+
+
+def _default_tile_shape(grid_shape: tuple, processes: int, max_tile_points: int = 65536):
+    # Halve the longest tile dimension until there are enough tiles to keep
+    # every process busy, and tiles are not too large.
+    tile_shape = list(grid_shape)
+    while True:
+        num_tiles = np.prod([-(-n // t) for n, t in zip(grid_shape, tile_shape)])
+        if num_tiles >= 4 * processes and np.prod(tile_shape) <= max_tile_points:
+            return tuple(tile_shape)
+        longest = int(np.argmax(tile_shape))
+        if tile_shape[longest] == 1:
+            return tuple(tile_shape)
+        tile_shape[longest] = -(-tile_shape[longest] // 2)
+
+
+def _print_progress(completed_points: int, total_points: int):
+    print(
+        f"\rSweep progress: {completed_points}/{total_points} points "
+        f"({100 * completed_points / total_points:.0f}%)",
+        end="\n" if completed_points == total_points else "",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _code_digest(code, digest):
+    # Bytecode, names and constants of code, with nested code (such as that
+    # of comprehensions and inner functions) digested in turn
+    digest.update(code.co_code)
+    digest.update(repr((code.co_names, code.co_varnames)).encode())
+    for constant in code.co_consts:
+        if hasattr(constant, "co_code"):
+            _code_digest(constant, digest)
+        else:
+            digest.update(repr(constant).encode())
+
+
+def _readout_key(readout: callable, digest=None):
+    """Stable description of a readout function, for result store keys
+
+    Readouts are identified by their name and a digest of their code,
+    default arguments and closure values, so that different functions of the
+    same name (as every lambda has) are kept apart. functools.partial objects
+    are identified by the function they wrap and their bound arguments.
+
+    Args:
+        readout (callable): Readout function.
+
+    Raises:
+        ValueError: If readout is neither a python function nor a partial
+            of one, so cannot be identified between sessions.
+
+    Returns:
+        str: Name and digest of the readout.
+    """
+    top_level = digest is None
+    if top_level:
+        digest = hashlib.sha256()
+    if isinstance(readout, functools.partial):
+        _readout_key(readout.func, digest)
+        digest.update(repr((readout.args, sorted(readout.keywords.items()))).encode())
+    elif hasattr(readout, "__code__"):
+        digest.update(f"{readout.__module__}.{readout.__qualname__}".encode())
+        _code_digest(readout.__code__, digest)
+        digest.update(repr((readout.__defaults__, readout.__kwdefaults__)).encode())
+        for cell in readout.__closure__ or ():
+            value = cell.cell_contents
+            if callable(value):
+                _readout_key(value, digest)
+            else:
+                digest.update(repr(value).encode())
+    else:
+        raise ValueError(
+            f"Readout {readout!r} cannot be identified in a result store, pass a python function"
+        )
+    if top_level:
+        name = getattr(getattr(readout, "func", readout), "__qualname__", "partial")
+        return f"{name}:{digest.hexdigest()[:32]}"
+
+
+# System settings which change results, and so the sweeps of a result store
+# they may share
+_result_settings = [
+    "system_string",
+    "dps",
+    "all_solutions",
+    "num_solutions",
+    "escalation_dps",
+    "continuation",
+]
+
+
+def _store_keys(system: BindingSystem, parameters: dict, axes: dict, readout):
+    """Keys identifying a sweep in a result store
+
+    Args:
+        system (BindingSystem): The system being swept.
+        parameters (dict): Fixed system parameters.
+        axes (dict): Swept parameters and their values.
+        readout (callable or None): Readout function.
+
+    Returns:
+        tuple(dict, str, str): Description of the family of sweeps sharing the
+            system, fixed parameters, readout and swept parameter names, its
+            key, and the key of the grid of swept values within the family.
+    """
+    system_description = {"class": f"{type(system).__module__}.{type(system).__qualname__}"}
+    for attribute in _result_settings:
+        value = getattr(system, attribute, None)
+        system_description[attribute] = list(value) if isinstance(value, tuple) else value
+    family = {
+        "system": system_description,
+        "parameters": dict((k, np.asarray(v, dtype=float).tolist()) for k, v in parameters.items()),
+        "readout": None if readout is None else _readout_key(readout),
+        "axes": list(axes.keys()),
+    }
+    family_key = hashlib.sha256(json.dumps(family, sort_keys=True).encode()).hexdigest()[:32]
+    grid_hash = hashlib.sha256()
+    for values in axes.values():
+        grid_hash.update(np.ascontiguousarray(values).tobytes())
+        grid_hash.update(b"|")
+    return family, family_key, grid_hash.hexdigest()[:32]
+
+
+def _matching_indices(new_values: np.ndarray, old_values: np.ndarray):
+    # Indices of values present (to within rounding) in both new and old axes
+    order = np.argsort(old_values)
+    sorted_old = old_values[order]
+    position = np.searchsorted(sorted_old, new_values)
+    new_index, old_index = [], []
+    for candidate in [position - 1, position]:
+        candidate = np.clip(candidate, 0, len(sorted_old) - 1)
+        matches = np.isclose(sorted_old[candidate], new_values, rtol=1e-12, atol=0)
+        matches &= ~np.isin(np.arange(len(new_values)), new_index)
+        new_index.extend(np.flatnonzero(matches))
+        old_index.extend(order[candidate[matches]])
+    return np.array(new_index, dtype=int), np.array(old_index, dtype=int)
+
+
+def _reuse_stored_points(family_directory: Path, axes: dict, values: np.ndarray, done: np.ndarray):
+    """Copy points already computed on other grids in the same family
+
+    Args:
+        family_directory (Path): Store directory holding grids of the family.
+        axes (dict): Swept parameters and their values for the new grid.
+        values (np.ndarray): Results array of the new grid, written to.
+        done (np.ndarray): Completion bitmap of the new grid, written to.
+    """
+    for old_done_path in family_directory.glob("*/done.npy"):
+        old_directory = old_done_path.parent
+        try:
+            old_axes = np.load(old_directory / "axes.npz")
+            old_done = np.load(old_done_path, mmap_mode="r")
+            old_values = np.load(old_directory / "values.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            continue
+        new_index, old_index = zip(
+            *[_matching_indices(v, old_axes[name]) for name, v in axes.items()]
+        )
+        if any(len(i) == 0 for i in new_index):
+            continue
+        new_grid = np.ix_(*new_index)
+        old_grid = np.ix_(*old_index)
+        solutions = (slice(None),) * (values.ndim - done.ndim)
+        reuse = np.asarray(old_done[old_grid]) & ~np.asarray(done[new_grid])
+        values[solutions + new_grid] = np.where(
+            reuse, old_values[solutions + old_grid], values[solutions + new_grid]
+        )
+        done[new_grid] = np.asarray(done[new_grid]) | reuse
+
+
+def _stored_shapes(grid_directory: Path):
+    # Shapes of the values and completion bitmap held in a grid directory,
+    # or None if either cannot be read
+    try:
+        values = np.load(grid_directory / "values.npy", mmap_mode="r")
+        done = np.load(grid_directory / "done.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return values.shape, done.shape
+
+
+def _open_store(
+    store: Path,
+    system: BindingSystem,
+    parameters: dict,
+    axes: dict,
+    readout,
+    output_shape: tuple,
+):
+    """Open (or create) the directory holding a sweep in a result store
+
+    Args:
+        store (Path): Result store directory.
+        system (BindingSystem): The system being swept.
+        parameters (dict): Fixed system parameters.
+        axes (dict): Swept parameters and their values.
+        readout (callable or None): Readout function.
+        output_shape (tuple): Shape of the results array.
+
+    Returns:
+        Path: Directory containing values.npy, done.npy and axes.npz.
+    """
+    family, family_key, grid_key = _store_keys(system, parameters, axes, readout)
+    family_directory = Path(store) / family_key
+    grid_directory = family_directory / grid_key
+    if (grid_directory / "done.npy").exists():
+        done_shape = output_shape[len(output_shape) - len(axes):]
+        if _stored_shapes(grid_directory) == (output_shape, done_shape):
+            return grid_directory
+        # Written by an incompatible version or interrupted while being
+        # created, so started again
+        shutil.rmtree(grid_directory)
+    grid_directory.mkdir(parents=True, exist_ok=True)
+    with open(family_directory / "family.json", "w") as family_file:
+        json.dump(family, family_file, indent=1)
+    np.savez(grid_directory / "axes.npz", **axes)
+    values = np.lib.format.open_memmap(
+        grid_directory / "values.npy", mode="w+", dtype=float, shape=output_shape
+    )
+    done = np.lib.format.open_memmap(
+        grid_directory / "done.npy",
+        mode="w+",
+        dtype=bool,
+        shape=output_shape[len(output_shape) - len(axes):],
+    )
+    _reuse_stored_points(family_directory, axes, values, done)
+    values.flush()
+    done.flush()
+    return grid_directory
+
+
+def sweep(
+    system: Union[str, BindingSystem],
+    parameters: dict,
+    axes: dict,
+    readout=None,
+    output: Union[str, Path] = None,
+    processes: int = None,
+    tile_shape: tuple = None,
+    progress=None,
+    store: Union[str, Path] = None,
+):
+    """
+    Query a binding system over a grid of parameter values in parallel
+
+    Every combination of the values given in axes is queried, with the
+    remaining system parameters fixed. The grid is split into tiles which are
+    spread over a pool of worker processes.
+
+    Parameters
+    ----------
+    system : BindingSystem, BindingCurve or str
+        The system to query, or a string accepted by pbc.BindingCurve.
+    parameters : dict
+        Fixed system parameters.
+    axes : dict
+        Swept parameters, mapping parameter names to 1D arrays of values.
+        The output has one axis per swept parameter, in the same order.
+    readout : func or None
+        Change the readout of the system, a static member function from the
+        pbc.Readout class, or a custom written function following the same
+        defininition as those in pbc.Readout (default = None). Unless
+        processes is 1, or worker processes are started by fork (the
+        default on Linux before Python 3.14), readouts are pickled to send
+        to workers, so must be importable, defined at module level rather
+        than as lambdas or closures.
+    output : str, Path or None
+        If given, results are written to this .npy file and returned as a
+        read-only memory-mapped array. Otherwise, a temporary file is used
+        and results are returned in memory (default = None).
+    processes : int or None
+        Number of worker processes, None uses all available cores, and 1
+        solves all tiles in the calling process (default = None).
+    tile_shape : tuple or None
+        Number of points along each axis in each tile, chosen automatically
+        if None (default = None).
+    progress : callable, bool or None
+        Called as progress(completed_points, total_points) as tiles are
+        completed, or True to print progress (default = None).
+    store : str, Path or None
+        Result store directory. Results are checkpointed tile by tile, so an
+        interrupted sweep resumes from its finished tiles, and points already
+        computed on other grids with the same system, fixed parameters,
+        readout and swept parameters are reused. Results are returned as a
+        read-only memory-mapped array. Cannot be used with output
+        (default = None).
+
+    Returns
+    -------
+    np.ndarray
+        Results with one axis per swept parameter (preceded by a solutions
+        axis for systems with more than one solution).
+    """
+    if output is not None and store is not None:
+        raise ValueError("Only one of output and store may be given")
+    if isinstance(system, str):
+        system = BindingCurve(system).system
+    elif isinstance(system, BindingCurve):
+        system = system.system
+    axes = dict((name, np.asarray(values, dtype=float).ravel()) for name, values in axes.items())
+    parameters = dict((k, v) for k, v in parameters.items() if k not in axes)
+    grid_shape = tuple(len(values) for values in axes.values())
+    num_solutions = getattr(system, "num_solutions", 1)
+    output_shape = grid_shape if num_solutions == 1 else (num_solutions,) + grid_shape
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if tile_shape is None:
+        tile_shape = _default_tile_shape(grid_shape, processes)
+    if progress is True:
+        progress = _print_progress
+    if processes > 1 and multiprocessing.get_start_method() != "fork":
+        _check_picklable(readout)
+
+    tiles = [
+        tuple(
+            slice(start, min(start + t, n))
+            for start, t, n in zip(starts, tile_shape, grid_shape)
+        )
+        for starts in product(*[range(0, n, t) for n, t in zip(grid_shape, tile_shape)])
+    ]
+    total_points = int(np.prod(grid_shape))
+
+    temporary_directory = None
+    done_path = None
+    completed_points = 0
+    if store is not None:
+        grid_directory = _open_store(store, system, parameters, axes, readout, output_shape)
+        output_path = grid_directory / "values.npy"
+        done_path = grid_directory / "done.npy"
+        # Skip finished tiles
+        done = np.load(done_path, mmap_mode="r")
+        finished = [bool(np.all(done[tile])) for tile in tiles]
+        completed_points = sum(
+            int(np.prod(done[tile].shape)) for tile, f in zip(tiles, finished) if f
+        )
+        tiles = [tile for tile, f in zip(tiles, finished) if not f]
+        del done
+    elif output is None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        output_path = Path(temporary_directory.name) / "sweep.npy"
+    else:
+        output_path = Path(output)
+    if store is None:
+        np.lib.format.open_memmap(output_path, mode="w+", dtype=float, shape=output_shape).flush()
+
+    try:
+        initializer_arguments = (
+            system,
+            parameters,
+            axes,
+            readout,
+            str(output_path),
+            None if done_path is None else str(done_path),
+        )
+        if processes == 1:
+            _initialize_worker(*initializer_arguments)
+            try:
+                for tile in tiles:
+                    completed_points += _solve_tile(tile)
+                    if progress is not None:
+                        progress(completed_points, total_points)
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_initialize_worker,
+                initargs=initializer_arguments,
+            ) as executor:
+                for future in as_completed([executor.submit(_solve_tile, tile) for tile in tiles]):
+                    completed_points += future.result()
+                    if progress is not None:
+                        progress(completed_points, total_points)
+        if temporary_directory is not None:
+            return np.array(np.load(output_path, mmap_mode="r"))
+        return np.load(output_path, mmap_mode="r")
+    finally:
+        if temporary_directory is not None:
+            temporary_directory.cleanup()
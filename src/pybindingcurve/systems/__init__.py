@@ -1,5 +1,30 @@
+import importlib
 from .binding_system import BindingSystem
-from .analytical_systems import *
-from .lagrange_systems import *
-from .kinetic_systems import *
-from .minimizer_systems import *
+
+# Backends are imported on first use of one of their names, so that using a
+# single backend does not pay for importing the others (and scipy). Where
+# backends share a name, the last listed takes precedence.
+_backends = ["analytical", "lagrange", "kinetic", "minimizer"]
+
+
+def __getattr__(name: str):
+    # Try the backend named by the attribute first, such as
+    # System_kinetic_custom, then the others in order of precedence
+    backends = sorted(
+        reversed(_backends), key=lambda backend: backend not in name.lower()
+    )
+    for backend in backends:
+        module = importlib.import_module(f".{backend}_systems", __name__)
+        if hasattr(module, name) and not name.startswith("_"):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    names = set(globals())
+    for backend in _backends:
+        module = importlib.import_module(f".{backend}_systems", __name__)
+        names.update(n for n in dir(module) if not n.startswith("_"))
+    return sorted(names)
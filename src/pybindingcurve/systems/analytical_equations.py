@@ -1,4 +1,4 @@
-from mpmath import mpf, sqrt, power, fabs, almosteq
+from mpmath import mpf, sqrt, power, fabs, almosteq, findroot
 
 # 1:1 binding - see https://stevenshave.github.io/pybindingcurve/simulate_1to1.html
 # Readout is PL
@@ -1141,6 +1141,26 @@ def system04_analytical_homodimer_breaking__pp(p, i, kdpp, kdpi):
     ]
 
 
+# Homodimer breaking, physical solution only
+# Readout is PP
+def system04_analytical_homodimer_breaking__physical_pp(p, i, kdpp, kdpi):
+    p = mpf(p)
+    i = mpf(i)
+    kdpp = mpf(kdpp)
+    kdpi = mpf(kdpi)
+    if p == 0:
+        return mpf(0)
+
+    # The protein mass balance residual rises monotonically with free protein
+    # x, from -p at x=0 to at least 0 at x=p, bracketing the only physical
+    # root of the free protein cubic
+    def residual(x):
+        return x + 2 * x * x / kdpp + i * x / (kdpi + x) - p
+
+    x = findroot(residual, (mpf(0), p), solver="anderson")
+    return x * x / kdpp
+
+
 ## Homodimerbreaking-analytical
 # def all_solutions(a,x,kdaa,kdax):
 # 	return np.array([
@@ -0,0 +1,274 @@
+"""Vectorized float64 versions of the analytical binding equations
+
+The functions in analytical_equations.py cast every argument to an mpmath
+mpf and are evaluated one titration point at a time.  The functions here
+take NumPy arrays (or scalars) for every argument, broadcast them against
+each other in the same way as a NumPy ufunc, and evaluate the whole batch
+at once in double precision.
+
+Formulae are rearranged so that no subtraction of nearly equal quantities
+takes place.  Quadratics are solved using the citardauq form of the root
+(2c/(-b-sqrt(b^2-4ac))), and the competition cubic is solved for free
+protein using a monotone Newton iteration, rather than through the Cardano
+expression used in the mpmath version, which suffers from severe
+cancellation in double precision.
+
+Every function returns a tuple of (readout, imprecise), where imprecise is a
+boolean array flagging points at which double precision could not be
+trusted (overflow, non-convergence, or a non-physical result).  Such points
+should be recalculated using the mpmath functions in analytical_equations.py,
+which is what BindingSystem.query does.
+
+Free species functions return the free concentrations of fundamental species
+at equilibrium, used to differentiate readouts with respect to system
+parameters (see BindingSystem.query_derivatives).
+"""
+
+import numpy as np
+
+_eps = np.finfo(float).eps
+_tiny = np.finfo(float).tiny
+_underflow_limit = 1e-250
+# Points whose largest argument lies within (1/_safe_magnitude,
+# _safe_magnitude), or which are all zero, are evaluated without scaling, as
+# squares and products of their arguments can neither overflow nor underflow.
+_safe_magnitude = 1e100
+
+
+def _scale(*args):
+    """Broadcast arguments and find a per-point scale to protect from overflow
+
+    Scaling costs more than the equations themselves, so when no point needs
+    it the arguments are returned unchanged, along with a scale of 1.
+    """
+    args = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+    largest = np.array(np.abs(args[0]))
+    for a in args[1:]:
+        np.maximum(largest, np.abs(a), out=largest)
+    if np.all(
+        (largest < _safe_magnitude) & ((largest > 1 / _safe_magnitude) | (largest == 0))
+    ):
+        return args, 1.0
+    scale = largest
+    scale = np.where((scale > 0) & np.isfinite(scale), scale, 1.0)
+    return [a / scale for a in args], scale
+
+
+def _not_physical(value, upper_bound):
+    """Flag non-finite, negative or too-large readouts"""
+    return (
+        ~np.isfinite(value)
+        | (value < 0)
+        | (value > upper_bound * (1.0 + 8 * _eps))
+    )
+
+
+# 1:1 binding - see https://stevenshave.github.io/pybindingcurve/simulate_1to1.html
+# Readout is PL
+def system01_analytical_one_to_one__pl_vectorized(p, l, kdpl):
+    (p, l, kdpl), scale = _scale(p, l, kdpl)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # (p+l+kdpl)^2-4pl written as a sum of non-negative terms
+        discriminant = (p - l) ** 2 + kdpl * (2 * (p + l) + kdpl)
+        denominator = p + l + kdpl + np.sqrt(discriminant)
+        pl = np.where(denominator > 0, 2 * p * l / denominator, 0.0)
+    imprecise = _not_physical(pl, np.minimum(p, l))
+    return pl * scale, imprecise
+
+
+def system01_analytical_one_to_one__free_species_vectorized(p, l, kdpl):
+    p, l, kdpl = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in (p, l, kdpl)])
+    pl, _ = system01_analytical_one_to_one__pl_vectorized(p, l, kdpl)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # The species in excess is found by subtraction, and the other from
+        # the dissociation constant, avoiding cancellation
+        lf = np.where(p <= l, l - pl, kdpl * pl / (p - pl))
+        pf = np.where(p <= l, kdpl * pl / (l - pl), p - pl)
+    return np.where(np.isfinite(pf), pf, p - pl), np.where(np.isfinite(lf), lf, l - pl)
+
+
+# 1:1:1 competition - see https://stevenshave.github.io/pybindingcurve/simulate_competition.html
+# Readout is PL
+def system02_analytical_competition__pl_vectorized(
+    p, l, i, kdpl, kdpi, max_iterations=200
+):
+    (p, l, i, kdpl, kdpi), scale = _scale(p, l, i, kdpl, kdpi)
+    kdpl = np.maximum(kdpl, _tiny)
+    kdpi = np.maximum(kdpi, _tiny)
+
+    # Free protein, pf, is the root of
+    # g(pf) = pf + l*pf/(kdpl+pf) + i*pf/(kdpi+pf) - p
+    # which is increasing and concave for pf >= 0.  Newton iterations
+    # started at or clipped to a point where g <= 0 therefore increase
+    # monotonically towards the root without overshooting it.
+    pf, converged = _competition_free_protein(p, l, i, kdpl, kdpi, max_iterations)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        pl = l * pf / (kdpl + pf)
+    # Free protein pushed towards the bottom of the float64 range (KDs many
+    # orders of magnitude below concentrations) cannot be resolved.
+    underflow = (p > 0) & (pf < _underflow_limit)
+    imprecise = ~converged | underflow | _not_physical(pl, np.minimum(p, l))
+    return pl * scale, imprecise
+
+
+def _competition_free_protein(p, l, i, kdpl, kdpi, max_iterations):
+    pf = np.zeros_like(p)
+    converged = p <= 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iterations):
+            if np.all(converged):
+                break
+            g = pf + l * pf / (kdpl + pf) + i * pf / (kdpi + pf) - p
+            dg = 1 + l * kdpl / (kdpl + pf) ** 2 + i * kdpi / (kdpi + pf) ** 2
+            step = np.where(converged, 0.0, -g / dg)
+            new_pf = np.clip(pf + step, 0.0, p)
+            converged |= np.abs(new_pf - pf) <= 4 * _eps * new_pf
+            pf = new_pf
+    return pf, converged
+
+
+def system02_analytical_competition__free_species_vectorized(
+    p, l, i, kdpl, kdpi, max_iterations=200
+):
+    (p, l, i, kdpl, kdpi), scale = _scale(p, l, i, kdpl, kdpi)
+    kdpl = np.maximum(kdpl, _tiny)
+    kdpi = np.maximum(kdpi, _tiny)
+    pf, _ = _competition_free_protein(p, l, i, kdpl, kdpi, max_iterations)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        lf = l * kdpl / (kdpl + pf)
+        i_f = i * kdpi / (kdpi + pf)
+    return pf * scale, lf * scale, i_f * scale
+
+
+# Homodimer formation - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerformation.html
+# Readout is PP
+def system03_analytical_homodimer_formation__pp_vectorized(p, kdpp):
+    (p, kdpp), scale = _scale(p, kdpp)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Smaller root of 4pp^2-(4p+kdpp)pp+p^2=0, in citardauq form
+        denominator = 4 * p + kdpp + np.sqrt(kdpp) * np.sqrt(8 * p + kdpp)
+        pp = np.where(denominator > 0, 2 * p * p / denominator, 0.0)
+    imprecise = _not_physical(pp, p / 2.0)
+    return pp * scale, imprecise
+
+
+def system03_analytical_homodimer_formation__free_species_vectorized(p, kdpp):
+    p, kdpp = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in (p, kdpp)])
+    pp, _ = system03_analytical_homodimer_formation__pp_vectorized(p, kdpp)
+    with np.errstate(invalid="ignore"):
+        # Mostly dimerised protein is found from the dissociation constant,
+        # avoiding cancellation
+        pf = np.where(4 * pp > p, np.sqrt(kdpp * pp), p - 2 * pp)
+    return (pf,)
+
+
+# Homodimer breaking - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerbreaking.html
+# Free protein x is a root of the cubic
+# 2x^3+(kdpp+2kdpi)x^2+kdpp(kdpi+i-p)x-p*kdpp*kdpi=0, of which only one is the
+# physical solution.
+def _homodimer_breaking_mass_balance(x, p, i, kdpp, kdpi):
+    """Protein mass balance residual and its derivative by free protein"""
+    residual = x + 2 * x * x / kdpp + i * x / (kdpi + x) - p
+    slope = 1 + 4 * x / kdpp + i * kdpi / ((kdpi + x) * (kdpi + x))
+    return residual, slope
+
+
+def system04_analytical_homodimer_breaking__free_protein_roots_vectorized(
+    p, i, kdpp, kdpi, polish_iterations=3
+):
+    """Every root of the free protein cubic, with a leading axis of length 3
+
+    Roots are eigenvalues of the cubic's companion matrix, found for all
+    points in one batched call, with real roots then polished by Newton's
+    method on the protein mass balance. Non-real roots are complex.
+    """
+    p, i, kdpp, kdpi = np.broadcast_arrays(
+        *[np.asarray(a, dtype=float) for a in (p, i, kdpp, kdpi)]
+    )
+    companion = np.zeros(p.shape + (3, 3))
+    companion[..., 0, 0] = -(kdpp + 2 * kdpi) / 2
+    companion[..., 0, 1] = -kdpp * (kdpi + i - p) / 2
+    companion[..., 0, 2] = p * kdpp * kdpi / 2
+    companion[..., 1, 0] = 1.0
+    companion[..., 2, 1] = 1.0
+    finite = np.all(np.isfinite(companion), axis=(-2, -1))
+    companion[~finite] = 0.0
+    roots = np.moveaxis(np.linalg.eigvals(companion), -1, 0)
+    roots = np.where(finite, roots, np.nan)
+    real = np.abs(roots.imag) <= 1e-6 * np.abs(roots)
+    x = roots.real
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(polish_iterations):
+            residual, slope = _homodimer_breaking_mass_balance(x, p, i, kdpp, kdpi)
+            step = residual / slope
+            x = np.where(real & np.isfinite(step), x - step, x)
+    return np.where(real, x, roots)
+
+
+def select_homodimer_breaking_roots(x, p, i, kdpp, kdpi, rtol=1e-8):
+    """Select the physical free protein concentration of each point
+
+    Candidate roots x (with a leading axis of candidates) are accepted when
+    they are real, positive and no more than total protein (so that all
+    species are non-negative), conserve protein to within rtol of its total, and are
+    stable, with the mass balance residual increasing with free protein so
+    that perturbations relax back to equilibrium. Of accepted candidates,
+    the one conserving protein best is selected.
+
+    Returns a tuple of (free protein, imprecise), with points at which no
+    candidate, or several differing candidates, were accepted flagged as
+    imprecise. Free protein is positive wherever there is protein, so points
+    without protein are imprecise, and best handled by the caller.
+    """
+    x = np.asarray(x)
+    p, i, kdpp, kdpi = np.broadcast_arrays(
+        *[np.asarray(a, dtype=float) for a in (p, i, kdpp, kdpi)]
+    )
+    tolerance = rtol * p
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        real = np.abs(np.imag(x)) <= rtol * np.abs(x)
+        x = np.real(x)
+        residual, slope = _homodimer_breaking_mass_balance(x, p, i, kdpp, kdpi)
+        residual = np.abs(residual)
+        accepted = (
+            real
+            & (x > 0)
+            & (x <= p + tolerance)
+            & (residual <= tolerance)
+            & (slope > 0)
+        )
+        best = np.argmin(np.where(accepted, residual, np.inf), axis=0)
+        selected = np.clip(np.take_along_axis(x, best[None], axis=0)[0], 0, p)
+        differing = accepted & (np.abs(x - selected) > 1e-6 * selected + tolerance)
+    imprecise = ~np.any(accepted, axis=0) | np.any(differing, axis=0)
+    return selected, imprecise
+
+
+# Readout is PP, the physical solution only
+def system04_analytical_homodimer_breaking__pp_vectorized(p, i, kdpp, kdpi):
+    pf, imprecise = _homodimer_breaking_free_protein(p, i, kdpp, kdpi)
+    kdpp = np.maximum(np.asarray(kdpp, dtype=float), _tiny)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        pp = pf * pf / kdpp
+    return pp, imprecise | _not_physical(pp, np.asarray(p) / 2.0)
+
+
+def _homodimer_breaking_free_protein(p, i, kdpp, kdpi):
+    (p, i, kdpp, kdpi), scale = _scale(p, i, kdpp, kdpi)
+    kdpp = np.maximum(kdpp, _tiny)
+    kdpi = np.maximum(kdpi, _tiny)
+    roots = system04_analytical_homodimer_breaking__free_protein_roots_vectorized(
+        p, i, kdpp, kdpi
+    )
+    pf, imprecise = select_homodimer_breaking_roots(roots, p, i, kdpp, kdpi)
+    # Without protein there is no free protein, whatever roots are found
+    pf = np.where(p == 0, 0.0, pf)
+    return pf * scale, imprecise & (p != 0)
+
+
+def system04_analytical_homodimer_breaking__free_species_vectorized(p, i, kdpp, kdpi):
+    pf, _ = _homodimer_breaking_free_protein(p, i, kdpp, kdpi)
+    kdpi = np.maximum(np.asarray(kdpi, dtype=float), _tiny)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        i_f = i * kdpi / (kdpi + pf)
+    return pf, i_f
@@ -1,7 +1,17 @@
 import numpy as np
 from .analytical_equations import *
-from mpmath import mp
+from .analytical_equations_vectorized import *
 from .binding_system import BindingSystem
+from .minimizer_systems import (
+    system01_species,
+    system01_mass_balances,
+    system02_species,
+    system02_mass_balances,
+    system03_species,
+    system03_mass_balances,
+    system04_species,
+    system04_mass_balances,
+)
 
 
 class System_analytical_one_to_one__pl(BindingSystem):
@@ -13,11 +23,19 @@ class System_analytical_one_to_one__pl(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system01_analytical_one_to_one__pl, analytical=True)
+        super().__init__(
+            system01_analytical_one_to_one__pl,
+            analytical=True,
+            vectorized_bindingsystem=system01_analytical_one_to_one__pl_vectorized,
+        )
         self.default_readout = "pl"
+        self.escalation_dps = (100,)
+        self.free_species_function = system01_analytical_one_to_one__free_species_vectorized
+        self.species_function = system01_species
+        self.mass_balances = system01_mass_balances
+        self.signal_denominator = ("l", 1.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -42,11 +60,19 @@ class System_analytical_competition__pl(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system02_analytical_competition__pl, analytical=True)
+        super().__init__(
+            system02_analytical_competition__pl,
+            analytical=True,
+            vectorized_bindingsystem=system02_analytical_competition__pl_vectorized,
+        )
         self.default_readout = "pl"
+        self.escalation_dps = (100,)
+        self.free_species_function = system02_analytical_competition__free_species_vectorized
+        self.species_function = system02_species
+        self.mass_balances = system02_mass_balances
+        self.signal_denominator = ("l", 1.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -71,11 +97,19 @@ class System_analytical_homodimerformation__pp(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system03_analytical_homodimer_formation__pp, analytical=True)
+        super().__init__(
+            system03_analytical_homodimer_formation__pp,
+            analytical=True,
+            vectorized_bindingsystem=system03_analytical_homodimer_formation__pp_vectorized,
+        )
         self.default_readout = "pp"
+        self.escalation_dps = (100,)
+        self.free_species_function = system03_analytical_homodimer_formation__free_species_vectorized
+        self.species_function = system03_species
+        self.mass_balances = system03_mass_balances
+        self.signal_denominator = ("p", 2.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -97,18 +131,38 @@ class System_analytical_homodimerbreaking_pp(BindingSystem):
 
     Class defines homodimer breaking, readout is PP
     See https://stevenshave.github.io/pybindingcurve/simulate_homodimerbreaking.html
+
+    Parameters
+    ----------
+    all_solutions : bool
+        Return both solutions of the closed form equations for every point
+        (default = True). Otherwise only the physical solution is returned,
+        selected from all roots of the free protein cubic for whole arrays
+        at once (see select_homodimer_breaking_roots).
     """
 
-    def __init__(self):
-        super().__init__(
-            system04_analytical_homodimer_breaking__pp,
-            analytical=True,
-        )
+    def __init__(self, all_solutions: bool = True):
+        self.all_solutions = all_solutions
+        if all_solutions:
+            super().__init__(
+                system04_analytical_homodimer_breaking__pp,
+                analytical=True,
+            )
+            self.num_solutions = 2
+        else:
+            super().__init__(
+                system04_analytical_homodimer_breaking__physical_pp,
+                analytical=True,
+                vectorized_bindingsystem=system04_analytical_homodimer_breaking__pp_vectorized,
+            )
+            self.free_species_function = system04_analytical_homodimer_breaking__free_species_vectorized
+            self.species_function = system04_species
+            self.mass_balances = system04_mass_balances
+            self.signal_denominator = ("p", 2.0)
         self.default_readout = "pp"
-        self.num_solutions = 2
+        self.escalation_dps = (100,)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
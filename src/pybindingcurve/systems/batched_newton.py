@@ -0,0 +1,109 @@
+"""Batched damped Newton solver for mass balance equations
+
+Minimizer-based systems find free concentrations of fundamental species at
+which the totals of every fundamental species are conserved.  The solver
+here works on many independent points at once in float64, with arrays of
+shape (n_points, n_fundamental), and is used as a fast first tier before
+falling back to mpmath findroot for points it cannot solve.
+
+Newton steps are taken in the logarithm of the free concentrations, which
+keeps concentrations positive, and are damped by backtracking until the
+scaled residual norm decreases.
+"""
+
+import numpy as np
+
+# Largest change in log concentration allowed in a single step
+_max_log_step = 5.0
+_max_halvings = 30
+
+
+def solve_mass_balances(
+    residual: callable,
+    jacobian: callable,
+    totals: np.ndarray,
+    rtol: float = 1e-12,
+    max_iterations: int = 200,
+):
+    """Solve mass balance equations for many points at once
+
+    Args:
+        residual (callable): Function taking free concentrations x, shape
+            (n_points, n_fundamental), returning totals minus the amount of
+            each fundamental species accounted for by all species, with the
+            same shape as x.
+        jacobian (callable): Function taking x and returning the derivative of
+            residual with respect to x, shape (n_points, n_fundamental,
+            n_fundamental), indexed [point, residual, free species].
+        totals (np.ndarray): Total concentrations of fundamental species,
+            shape (n_points, n_fundamental).
+        rtol (float, optional): Residuals must be no larger than rtol times the
+            total concentration for a point to be considered solved.
+            Defaults to 1e-12.
+        max_iterations (int, optional): Maximum Newton iterations. Defaults to
+            200.
+
+    Returns:
+        tuple(np.ndarray, np.ndarray): Free concentrations with the shape of
+            totals, and a boolean array of shape (n_points,) which is True
+            where the solution passed residual and conservation checks.
+    """
+    totals = np.asarray(totals, dtype=float)
+    num_points, num_fundamental = totals.shape
+    # Fundamental species with zero total concentration have zero free
+    # concentration and are removed from the Newton system.
+    present = totals > 0
+    scale = np.where(present, totals, 1.0)
+    identity = np.broadcast_to(np.eye(num_fundamental), (num_points,) + (num_fundamental,) * 2)
+    decoupled = ~(present[:, :, np.newaxis] & present[:, np.newaxis, :])
+
+    def scaled_norm(x):
+        with np.errstate(over="ignore", invalid="ignore"):
+            scaled = np.where(present, residual(x), 0.0) / scale
+            norm = np.sqrt(np.sum(scaled * scaled, axis=1))
+        return np.where(np.isfinite(norm), norm, np.inf), np.max(np.abs(scaled), axis=1)
+
+    x = np.where(present, totals, 0.0)
+    norm, max_scaled = scaled_norm(x)
+    converged = max_scaled <= rtol
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore", under="ignore"):
+        for _ in range(max_iterations):
+            if np.all(converged):
+                break
+            # Jacobian with respect to log(x)
+            log_jacobian = jacobian(x) * x[:, np.newaxis, :]
+            log_jacobian = np.where(decoupled, identity, log_jacobian)
+            right_hand_side = -np.where(present, residual(x), 0.0)
+            try:
+                step = np.linalg.solve(log_jacobian, right_hand_side[..., np.newaxis])[..., 0]
+            except np.linalg.LinAlgError:
+                step = np.einsum("nij,nj->ni", np.linalg.pinv(log_jacobian), right_hand_side)
+            step = np.where(present & ~converged[:, np.newaxis], step, 0.0)
+            step = np.clip(np.nan_to_num(step), -_max_log_step, _max_log_step)
+
+            # Backtrack each point until its residual norm decreases
+            alpha = np.ones(num_points)
+            accepted = converged.copy()
+            new_x = x.copy()
+            new_norm = norm.copy()
+            new_max_scaled = max_scaled.copy()
+            for _ in range(_max_halvings):
+                trial_x = np.where(present, x * np.exp(alpha[:, np.newaxis] * step), 0.0)
+                trial_norm, trial_max_scaled = scaled_norm(trial_x)
+                better = ~accepted & (trial_norm < norm)
+                new_x[better] = trial_x[better]
+                new_norm[better] = trial_norm[better]
+                new_max_scaled[better] = trial_max_scaled[better]
+                accepted |= better
+                if np.all(accepted):
+                    break
+                alpha = np.where(accepted, alpha, alpha / 2)
+            if not np.any(accepted & ~converged):
+                # No point could make progress
+                break
+            x, norm, max_scaled = new_x, new_norm, new_max_scaled
+            converged = max_scaled <= rtol
+
+    # Conservation check, free concentrations must be physical
+    converged &= np.all(np.isfinite(x) & (x >= 0) & (x <= totals * (1 + rtol)), axis=1)
+    return x, converged
@@ -1,6 +1,49 @@
+from functools import wraps
 from inspect import signature
+import threading
 import numpy as np
-from mpmath import almosteq
+from mpmath import almosteq, mp
+from .equilibrium_derivatives import readout_derivatives
+from .query_cache import QueryCache
+
+# mpmath precision is global to the process, so sections running at a given
+# precision are serialised between threads.
+_mpmath_lock = threading.RLock()
+
+# Systems whose queries are being computed by the current thread, so that
+# queries calling the query of a parent class are cached only once.
+_querying = threading.local()
+
+
+def _cached_query(query: callable):
+    """
+    Answer queries from the system's query_cache where enabled
+
+    The key is computed before the query runs, as queries may add ymin and
+    ymax to parameters, and the query is given a copy of parameters so that
+    the caller's dictionary is left as it was.
+    """
+
+    @wraps(query)
+    def cached_query(self, parameters: dict):
+        cache = self.query_cache
+        active = _querying.__dict__.setdefault("systems", set())
+        if cache is None or id(self) in active:
+            return query(self, parameters)
+        key = cache.key(self._query_cache_identity(), parameters)
+        found, results = cache.get(key)
+        if found:
+            return results
+        active.add(id(self))
+        try:
+            results = query(self, dict(parameters))
+        finally:
+            active.discard(id(self))
+        cache.put(key, results)
+        return results
+
+    return cached_query
+
 
 class BindingSystem:
     """
@@ -17,12 +60,68 @@ class BindingSystem:
         may be varied based on different protein-ligand binding systems.
     analytical: bool
         Perform a analytical analysis (default = False)
+    vectorized_bindingsystem : func or None
+        Optional float64 version of bindingsystem, taking arrays for all
+        arguments and returning a tuple of (result, imprecise_mask).  Where
+        present, it is used in preference to bindingsystem, with points in
+        imprecise_mask recalculated using bindingsystem.
     """
 
     system = None
     analytical = False
     arguments = []
     default_readout = None
+    # Counts of how points were solved in the last query, see _query_vectorized
+    precision_stats = None
+    # Keys of free species concentrations in results returned by the system,
+    # in the order expected by its initial_guess argument (if it has one).
+    free_species = None
+    # Continuation along titrations for systems accepting an initial_guess,
+    # one of None (always start from zero), "previous" (start from the
+    # previous point's free concentrations), or "secant" (extrapolate from
+    # the previous two points). Points solved in mpmath start from these
+    # predictions, or, for points escalated from float64, from their own
+    # float64 estimates where those are physical.
+    continuation = None
+    # Number of points of the last query solved in mpmath from an initial
+    # guess, rather than from a cold start
+    warm_starts = None
+    # Increasing mpmath precisions (mp.dps) at which points not solved in
+    # float64 are attempted by the scalar system, moving on when no physical
+    # solution is found. None solves at the current mpmath precision.
+    escalation_dps = None
+    # Description of the equilibrium, allowing the readout to be
+    # differentiated with respect to system parameters by query_derivatives.
+    # species_function takes free species concentrations (in the order of
+    # mass_balances) and KDs, returning all species concentrations.
+    # mass_balances gives the number of each fundamental species in every
+    # species, indexed by the argument holding its total concentration.
+    # Analytical systems also supply free_species_function, giving free
+    # species concentrations from system arguments.
+    species_function = None
+    mass_balances = None
+    free_species_function = None
+    # Signals are scaled from ymin to ymax by the readout divided by
+    # signal_denominator, a tuple of (argument, divisor), as in query.
+    signal_denominator = None
+    # Reactions of kinetic systems, as tuples of (reactant1, reactant2,
+    # product, KD argument) naming species in all_species, allowing time
+    # courses to be simulated by time_course.
+    reactions = None
+    # Titrations of kinetic systems are integrated in a single call, with
+    # points stacked into one block diagonal system (see _integrate_batch),
+    # unless batch_integration is False.
+    batch_integration = True
+    # Names of species in results of kinetic binding functions, where these
+    # differ from all_species.
+    result_species = None
+    # Optional QueryCache of query results, see enable_query_cache
+    query_cache = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "query" in cls.__dict__:
+            cls.query = _cached_query(cls.__dict__["query"])
 
     def _find_changing_parameters(self, params: dict):
         """
@@ -51,7 +150,12 @@ class BindingSystem:
         else:
             return changing_list
 
-    def __init__(self, bindingsystem: callable, analytical: bool = False):
+    def __init__(
+        self,
+        bindingsystem: callable,
+        analytical: bool = False,
+        vectorized_bindingsystem: callable = None,
+    ):
         """
         Construct BindingSystem objects
 
@@ -68,14 +172,45 @@ class BindingSystem:
             systems.
         analytical: bool
             Perform a analytical analysis (default = False)
+        vectorized_bindingsystem : func or None
+            Optional float64 version of bindingsystem which operates on whole
+            arrays at once (default = None)
         """
         self._system = bindingsystem
+        self._vectorized_system = vectorized_bindingsystem
         self.analytical = analytical
         self.arguments = list(signature(bindingsystem).parameters.keys())
 
-        if not analytical and "interval" in self.arguments:
-            # Make sure interval is not included in arguments
-            self.arguments.remove("interval")
+        if not analytical:
+            # Make sure integration options of kinetic systems are not
+            # included in arguments
+            for option in ["interval", "method", "steady_state_tolerance"]:
+                if option in self.arguments:
+                    self.arguments.remove(option)
+
+        # initial_guess is supplied through continuation, not by the user
+        self._accepts_initial_guess = "initial_guess" in self.arguments
+        if self._accepts_initial_guess:
+            self.arguments.remove("initial_guess")
+
+    def _picklable_state(self):
+        """
+        Instance state excluding the binding and species functions
+
+        Used by custom systems, whose binding functions are generated at run
+        time and cannot be pickled, to support pickling by rebuilding the
+        functions from the system definition.
+
+        Returns
+        -------
+        dict
+            Instance attributes other than the binding functions.
+        """
+        return dict(
+            (k, v)
+            for k, v in self.__dict__.items()
+            if k not in ["_system", "_vectorized_system", "species_function"]
+        )
 
     def _remove_ymin_ymax_keys_from_dict_in_place(self, d: dict):
         """
@@ -128,6 +263,65 @@ class BindingSystem:
             del d["ymax"]
         return d
 
+    def enable_query_cache(self, max_bytes: int = 64 * 2**20):
+        """
+        Cache results of queries
+
+        Queries repeating the parameters of an earlier query are answered
+        from a least recently used cache of bounded size. Parameters are
+        compared by value, including the contents of arrays. The cache is
+        available as query_cache, giving hit and miss counts, and may be
+        emptied by query_cache.clear(), or removed by disable_query_cache.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Maximum memory held by cached results (default = 64 MiB)
+
+        Returns
+        -------
+        QueryCache
+            The system's query cache
+        """
+        self.query_cache = QueryCache(max_bytes)
+        return self.query_cache
+
+    def disable_query_cache(self):
+        """
+        Stop caching results of queries, discarding any cached
+        """
+        self.query_cache = None
+
+    def _query_cache_identity(self):
+        """
+        Values identifying the system and settings affecting its results
+
+        Returns
+        -------
+        tuple
+            Class, system definition (for custom systems), solutions, readout
+            and precision settings, so that a cache may be shared by systems.
+            The readout is taken without the "_f" suffix that queries add on
+            finding only the free species, so that keys do not change after
+            the first query.
+        """
+        readout = self.default_readout
+        if isinstance(readout, str) and readout.endswith("_f"):
+            readout = readout[: -len("_f")]
+        return (
+            type(self).__module__,
+            type(self).__qualname__,
+            getattr(self, "system_string", None),
+            getattr(self, "num_solutions", 1),
+            getattr(self, "all_solutions", None),
+            readout,
+            self.escalation_dps,
+            self.continuation,
+            self.batch_integration,
+            mp.dps,
+        )
+
+    @_cached_query
     def query(self, parameters: dict):
         """
         Query a binding system
@@ -142,7 +336,10 @@ class BindingSystem:
         Returns
         -------
         Single floating point of the concentration of the binding complex, or
-            array-like Response/signal of the system.
+            array-like Response/signal of the system. Single points of systems
+            solved for whole arrays in float64 (analytical systems with
+            vectorized equations, and built in minimizer systems) are numpy
+            floats rather than mpmath numbers.
         """
         results = None
 
@@ -155,58 +352,611 @@ class BindingSystem:
         
         # Are any parameters changing?
         changing_parameters = self._find_changing_parameters(parameters)
-        if changing_parameters is None:  # Querying single point
+        num_solutions = getattr(
+            self, "num_solutions", 1
+        )  # Get attribure of num_solutions in BindingSystem class (default = 1)
+        batched = (
+            self.batch_integration
+            and self.reactions is not None
+            and changing_parameters is not None
+        )
+        if (self._vectorized_system is not None or batched) and num_solutions == 1:
+            results = self._query_vectorized(parameters)
+            if results.ndim == 0:
+                return np.nan_to_num(results)[()]
+        elif changing_parameters is None:  # Querying single point
             if self.analytical:
-                results = self._system(**parameters)  # Analytical
+                results, _, _ = self._solve_escalating(parameters)  # Analytical
             else:
-                simulation_results=self._system(**parameters)
+                simulation_results, _, _ = self._solve_escalating(parameters)
                 if self.default_readout not in simulation_results:
                     self.default_readout=f"{self.default_readout}_f"
                 results = simulation_results[self.default_readout]
-                
         else:
-            # At least 1 changing parameter
-            if len(changing_parameters) == 1:
-                results = None
-                num_solutions = getattr(
-                    self, "num_solutions", 1
-                )  # Get attribure of num_solutions in BindingSystem class (default = 1)
-                if num_solutions == 1:
-                    results = np.empty(len(parameters[changing_parameters[0]]))
-                else:
-                    results = np.empty(
-                        (len(parameters[changing_parameters[0]]), num_solutions)
-                    )
-                # 1 changing parameter
-                if self.analytical:  # Using an analytical solution
-                    for i in range(results.shape[0]):
-                        tmp_params = dict(parameters)
-                        tmp_params[changing_parameters[0]] = parameters[
-                            changing_parameters[0]
-                        ][i]
-                        results[i] = self._system(**tmp_params)
-                else:  # Changing parameter on lagrange or kinetic solution
-                    for i in range(results.shape[0]):
-                        tmp_params = dict(parameters)
-                        tmp_params[changing_parameters[0]] = parameters[
-                            changing_parameters[0]
-                        ][i]
-                        simulation_results=self._system(**tmp_params)
-                        if self.default_readout not in simulation_results:
-                            self.default_readout=f"{self.default_readout}_f"
-                        results[i] = simulation_results[self.default_readout]
-            else:
-                print(
-                    "Only 1 parameter may change, currently changing: ",
-                    changing_parameters,
-                )
-                return None
+            # At least 1 changing parameter, changing parameters are
+            # broadcast against each other and solved point by point.
+            results = self._query_pointwise(parameters, changing_parameters)
         if isinstance(results, (np.ndarray)):
-            if results.ndim > 1:
-                results = results.T
+            if num_solutions > 1:
+                # Solutions first, as in [solution, point]
+                results = np.moveaxis(results, -1, 0)
             return np.nan_to_num(results)
         return results  # We get here if its not a numpy array, but a system with multiple solutions queried at for a single point
 
+    def _query_pointwise(self, parameters: dict, changing_parameters: list):
+        """
+        Query the binding system one point at a time
+
+        Changing parameters are broadcast against each other following NumPy
+        rules, and the binding system is called once for every point of the
+        broadcast shape.  A single dict of arguments is updated in place
+        rather than copied for every point.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the binding system to be simulated.
+        changing_parameters : list
+            Keys of parameters which are array-like.
+
+        Returns
+        -------
+        np.ndarray
+            Readout with the broadcast shape of the changing parameters, with
+            a trailing axis of length num_solutions for systems with more
+            than one solution.
+        """
+        arrays = np.broadcast_arrays(
+            *[np.asarray(parameters[c], dtype=float) for c in changing_parameters]
+        )
+        num_solutions = getattr(self, "num_solutions", 1)
+        shape = arrays[0].shape
+        results = np.empty(shape if num_solutions == 1 else shape + (num_solutions,))
+        point = dict(parameters)
+        use_continuation = (
+            self.continuation is not None
+            and self._accepts_initial_guess
+            and self.free_species is not None
+        )
+        history = []
+        solved_at_dps = {}
+        warm_starts = 0
+        for index in np.ndindex(shape):
+            for name, array in zip(changing_parameters, arrays):
+                point[name] = array[index]
+            if use_continuation:
+                # Continue along the last axis, starting afresh on each line
+                if len(index) > 0 and index[-1] == 0:
+                    history = []
+                position = np.array([array[index] for array in arrays])
+                simulation_results, dps, warm_started = self._solve_escalating(
+                    point, self._predict_initial_guess(history, position)
+                )
+                warm_starts += warm_started
+                history = history[-1:] + [
+                    (position, [simulation_results[s] for s in self.free_species])
+                ]
+            else:
+                simulation_results, dps, _ = self._solve_escalating(point)
+            solved_at_dps[dps] = solved_at_dps.get(dps, 0) + 1
+            if not self.analytical:
+                if self.default_readout not in simulation_results:
+                    self.default_readout = f"{self.default_readout}_f"
+                simulation_results = simulation_results[self.default_readout]
+            results[index] = simulation_results
+        self.warm_starts = warm_starts
+        if self.escalation_dps is not None:
+            self.precision_stats = {
+                "points": int(np.prod(shape)),
+                "float64": 0,
+                "escalated": solved_at_dps,
+            }
+        return results
+
+    def _predict_initial_guess(self, history: list, position: np.ndarray):
+        """
+        Predict free species concentrations for the next titration point
+
+        Parameters
+        ----------
+        history : list
+            Up to two (position, free concentrations) tuples for the previous
+            points on the titration, oldest first.
+        position : np.ndarray
+            Values of the changing parameters at the next point.
+
+        Returns
+        -------
+        list or None
+            Initial guess of free species concentrations, or None if no
+            previous points are available.
+        """
+        if len(history) == 0:
+            return None
+        last_position, last_free = history[-1]
+        if self.continuation == "secant" and len(history) > 1:
+            previous_position, previous_free = history[-2]
+            previous_step = last_position - previous_position
+            moving = np.flatnonzero(previous_step)
+            if len(moving) > 0:
+                ratio = (position - last_position)[moving[0]] / previous_step[moving[0]]
+                predicted = [
+                    last + (last - previous) * ratio
+                    for last, previous in zip(last_free, previous_free)
+                ]
+                # Extrapolation must not leave the physical region
+                if all(x > 0 for x in predicted):
+                    return predicted
+        return last_free
+
+    def _physical_free_species(self, species: dict, index: int):
+        """
+        Free species concentrations of a point, if finite and positive
+
+        Parameters
+        ----------
+        species : dict
+            Species concentration arrays, as returned by vectorized systems.
+        index : int
+            Flat index of the point.
+
+        Returns
+        -------
+        list or None
+            Free species concentrations, in the order of free_species, or
+            None if any is not finite and positive.
+        """
+        free = [float(species[s].flat[index]) for s in self.free_species]
+        if all(np.isfinite(x) and x > 0 for x in free):
+            return free
+        return None
+
+    def _preceding_points(self, arrays: list, species: dict, index: int):
+        """
+        Continuation history of a point from the points before it
+
+        Parameters
+        ----------
+        arrays : list
+            Broadcast argument arrays of the query.
+        species : dict
+            Species concentration arrays, holding float64 or escalated
+            results for points before index.
+        index : int
+            Flat index of the point.
+
+        Returns
+        -------
+        list
+            Up to two (position, free concentrations) tuples for the points
+            preceding index along the last axis, oldest first, as used by
+            _predict_initial_guess. Points without physical free
+            concentrations end the history.
+        """
+        shape = arrays[0].shape
+        if len(shape) == 0:
+            return []
+        position = np.unravel_index(index, shape)
+        history = []
+        for step in [1, 2]:
+            if position[-1] - step < 0:
+                break
+            previous = np.ravel_multi_index(position[:-1] + (position[-1] - step,), shape)
+            free = self._physical_free_species(species, previous)
+            if free is None:
+                break
+            history.insert(0, (np.array([v.flat[previous] for v in arrays]), free))
+        return history
+
+    def _solve_with_initial_guess(self, point: dict, initial_guess: list):
+        """
+        Solve a single point, starting from initial_guess if possible
+
+        If the warm started solve fails to converge, or converges to a
+        non-physical solution with negative free concentrations, the point
+        is solved again from a cold start.
+
+        Parameters
+        ----------
+        point : dict
+            Parameters defining the point to be simulated.
+        initial_guess : list or None
+            Starting free species concentrations.
+
+        Returns
+        -------
+        tuple
+            Simulation results from the binding system, and whether they were
+            found from initial_guess.
+        """
+        if initial_guess is not None:
+            try:
+                simulation_results = self._system(**point, initial_guess=initial_guess)
+                if all(simulation_results[s] >= 0 for s in self.free_species):
+                    return simulation_results, True
+            except (ValueError, ZeroDivisionError):
+                pass
+        return self._system(**point), False
+
+    def _solve_escalating(self, point: dict, initial_guess: list = None):
+        """
+        Solve a single point at increasing mpmath precision
+
+        The point is solved at each precision in escalation_dps in turn,
+        stopping at the first which converges to a solution with non-negative
+        free species concentrations. Failure at the highest precision is
+        raised, or its non-physical solution returned.
+
+        Parameters
+        ----------
+        point : dict
+            Parameters defining the point to be simulated.
+        initial_guess : list or None
+            Starting free species concentrations, used by systems accepting
+            an initial_guess (default = None).
+
+        Returns
+        -------
+        tuple
+            Simulation results from the binding system, the mpmath precision
+            (dps) at which they were obtained, and whether they were found
+            from initial_guess.
+        """
+        levels = self.escalation_dps if self.escalation_dps is not None else [mp.dps]
+        warm_start = self._accepts_initial_guess and self.free_species is not None
+        warm_started = False
+        for dps in levels:
+            last = dps == levels[-1]
+            with _mpmath_lock, mp.workdps(dps):
+                try:
+                    if warm_start:
+                        simulation_results, warm_started = self._solve_with_initial_guess(
+                            point, initial_guess
+                        )
+                    else:
+                        simulation_results = self._system(**point)
+                except (ValueError, ZeroDivisionError):
+                    if last:
+                        raise
+                    continue
+            if (
+                last
+                or self.free_species is None
+                or all(simulation_results[s] >= 0 for s in self.free_species)
+            ):
+                return simulation_results, dps, warm_started
+
+    def _query_vectorized(self, parameters: dict, all_species: bool = False):
+        """
+        Query the binding system using its vectorized float64 implementation
+
+        All arguments are broadcast against each other and passed in one call
+        to the vectorized system, or, for kinetic systems without one, to
+        _integrate_batch. Points flagged as imprecise are then
+        recalculated individually using the (mpmath) scalar system at the
+        precisions given by escalation_dps, starting from their float64 free
+        species concentrations where these are physical, or otherwise from
+        those predicted by continuation from the preceding points along the
+        last axis. Counts of points solved at each precision are recorded in
+        self.precision_stats.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the binding system to be simulated.
+        all_species : bool
+            Return concentrations of all species, rather than the readout,
+            for systems which are not analytical (default = False).
+
+        Returns
+        -------
+        np.ndarray or dict
+            Readout with the broadcast shape of the system arguments, or a
+            dict of such arrays for every species if all_species is True.
+        """
+        arrays = np.broadcast_arrays(
+            *[np.asarray(parameters[a], dtype=float) for a in self.arguments]
+        )
+        vectorized_system = self._vectorized_system
+        if vectorized_system is None:
+            vectorized_system = self._integrate_batch
+        result, imprecise = vectorized_system(**dict(zip(self.arguments, arrays)))
+        species = None
+        if not self.analytical:
+            species = result
+            if self.default_readout not in species:
+                self.default_readout = f"{self.default_readout}_f"
+            result = species[self.default_readout]
+        result = np.array(result, dtype=float)
+
+        escalated = np.flatnonzero(imprecise)
+        solved_at_dps = {}
+        warm_starts = 0
+        use_free_species = species is not None and self.free_species is not None
+        for index in escalated:
+            point = dict((a, v.flat[index]) for a, v in zip(self.arguments, arrays))
+            initial_guess = None
+            if use_free_species:
+                initial_guess = self._physical_free_species(species, index)
+                if initial_guess is None and self.continuation is not None:
+                    initial_guess = self._predict_initial_guess(
+                        self._preceding_points(arrays, species, index),
+                        np.array([v.flat[index] for v in arrays]),
+                    )
+            simulation_result, dps, warm_started = self._solve_escalating(
+                point, initial_guess
+            )
+            warm_starts += warm_started
+            if not self.analytical:
+                # Escalated results replace float64 estimates, including
+                # those of free species used to predict later points
+                for name in species if all_species else self.free_species or []:
+                    species[name].flat[index] = simulation_result[name]
+                simulation_result = simulation_result[self.default_readout]
+            result.flat[index] = simulation_result
+            solved_at_dps[dps] = solved_at_dps.get(dps, 0) + 1
+        self.warm_starts = warm_starts
+
+        self.precision_stats = {
+            "points": result.size,
+            "float64": result.size - len(escalated),
+            "escalated": solved_at_dps,
+        }
+        if all_species and species is not None:
+            return species
+        return result
+
+    def _integrate_batch(self, **arguments):
+        """
+        Integrate a kinetic system to steady state at many points at once
+
+        Every point of the (broadcast) arguments is an independent copy of
+        the reactions, and all are integrated together as one block diagonal
+        system. Batches of fewer than batch_sparse_size (300) concentrations,
+        which covers typical titrations, are integrated by LSODA with dense
+        Jacobians, and larger batches by BDF with sparse Jacobians (see
+        integrate_batch_to_steady_state). If integration fails, or gives
+        non-finite concentrations, points are flagged to be solved
+        individually by the binding function.
+
+        Parameters
+        ----------
+        **arguments : np.ndarray
+            System arguments, all of the same shape.
+
+        Returns
+        -------
+        tuple (dict, np.ndarray)
+            Concentrations of every species, named as in results of the
+            binding function, and a boolean array flagging points to be
+            recalculated.
+        """
+        # Imported here as only kinetic systems need scipy.integrate
+        from .kinetic_integration import integrate_batch_to_steady_state
+
+        shape = np.shape(arguments[self.arguments[0]])
+        species_index = dict((s, i) for i, s in enumerate(self.all_species))
+        initial = np.stack(
+            [
+                np.ravel(arguments[s]) if s in arguments else np.zeros(int(np.prod(shape)))
+                for s in self.all_species
+            ],
+            axis=-1,
+        )
+        concentrations, success = integrate_batch_to_steady_state(
+            [tuple(species_index[s] for s in r[:3]) for r in self.reactions],
+            initial,
+            np.stack([np.ravel(arguments[r[3]]) for r in self.reactions], axis=-1),
+        )
+        imprecise = ~np.all(np.isfinite(concentrations), axis=-1) | (not success)
+        names = self.result_species if self.result_species is not None else self.all_species
+        return (
+            dict((n, concentrations[:, i].reshape(shape)) for i, n in enumerate(names)),
+            imprecise.reshape(shape),
+        )
+
+    def query_derivatives(self, parameters: dict, wrt: list):
+        """
+        Query a binding system along with derivatives of the readout
+
+        Derivatives with respect to concentrations, KDs, ymin and ymax are
+        found by implicit differentiation of the mass balances at
+        equilibrium, rather than by finite differences which would require
+        the system to be solved again for every parameter. Available for
+        systems defining species_function and mass_balances.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the binding system to be simulated.
+        wrt : list
+            Names of parameters to differentiate with respect to.
+
+        Returns
+        -------
+        tuple (np.ndarray, dict)
+            Readout (or signal if ymin or ymax are present), and a dict of
+            its derivatives with respect to each parameter in wrt, all with
+            the broadcast shape of the system arguments.
+        """
+        if self.species_function is None or getattr(self, "num_solutions", 1) > 1:
+            raise NotImplementedError(
+                "query_derivatives is not implemented for this type of binding system"
+            )
+        parameters = dict(parameters)
+        signal = self._are_ymin_ymax_present(parameters)
+        unknown = sorted(set(wrt) - set(self.arguments) - set(["ymin", "ymax"]))
+        assert len(unknown) == 0, f"Cannot differentiate with respect to: {unknown}"
+        assert signal or not set(["ymin", "ymax"]) & set(wrt), "ymin and ymax are not present"
+
+        arrays = np.broadcast_arrays(
+            *[np.asarray(parameters[a], dtype=float) for a in self.arguments]
+        )
+        shape = arrays[0].shape
+        flat = dict((a, v.ravel()) for a, v in zip(self.arguments, arrays))
+        # KDs almost equal to zero are nudged, as when solving systems
+        kds = dict(
+            (a, np.where(np.abs(flat[a]) <= 1e-10, flat[a] + 1e-10, flat[a]))
+            for a in self.arguments
+            if a not in self.mass_balances
+        )
+        if self.analytical:
+            value = self._query_vectorized(flat)
+            free = np.stack(
+                [np.ravel(x) for x in self.free_species_function(**{**flat, **kds})],
+                axis=-1,
+            )
+        else:
+            species = self._query_vectorized(flat, all_species=True)
+            value = species[self.default_readout]
+            free = np.stack([species[s] for s in self.free_species], axis=-1)
+        derivatives = readout_derivatives(
+            self.species_function,
+            self.mass_balances,
+            free,
+            kds,
+            self.default_readout,
+            [w for w in wrt if w in self.arguments],
+        )
+
+        if signal:
+            ymin, ymax = [
+                np.broadcast_to(np.asarray(parameters[y], dtype=float), shape).ravel()
+                for y in ["ymin", "ymax"]
+            ]
+            name, divisor = self.signal_denominator
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fraction = value / (flat[name] / divisor)
+                for w in list(derivatives):
+                    derivatives[w] = (ymax - ymin) * derivatives[w] / (flat[name] / divisor)
+                if name in derivatives:
+                    derivatives[name] -= (ymax - ymin) * fraction / flat[name]
+            derivatives["ymin"] = 1 - fraction
+            derivatives["ymax"] = fraction
+            value = ymin + (ymax - ymin) * fraction
+        return (
+            np.nan_to_num(value).reshape(shape),
+            dict((w, np.nan_to_num(derivatives[w]).reshape(shape)) for w in wrt),
+        )
+
+    def time_course_chunks(
+        self,
+        parameters: dict,
+        t_eval: np.ndarray,
+        kon=None,
+        method: str = "LSODA",
+        chunk_size: int = 1000,
+    ):
+        """
+        Simulate time courses of a kinetic system in chunks of time points
+
+        All species start unbound at time zero, and reactions proceed with
+        association rate constants kon and dissociation rate constants
+        kon*KD. Integration proceeds step by step, with a chunk yielded as
+        soon as it is complete, so that long, densely sampled time courses
+        need not be held in memory at once.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the binding system to be simulated, which may
+            be array-like, giving time courses for every point of their
+            broadcast shape.
+        t_eval : np.ndarray
+            Non-negative, increasing times at which to record concentrations.
+        kon : float, dict or None
+            Association rate constant of every reaction, or a dict of them
+            indexed by the KD argument of each reaction. None sets all to 1,
+            as used when integrating to equilibrium (default = None).
+        method : str
+            Integration method of scipy.integrate.solve_ivp (default =
+            "LSODA").
+        chunk_size : int
+            Number of time points in each chunk (default = 1000).
+
+        Yields
+        ------
+        tuple (np.ndarray, np.ndarray)
+            Times in the chunk, and concentrations of every species (in the
+            order of all_species) at those times, with shape (broadcast
+            shape of parameters, n_species, n_times).
+        """
+        if self.reactions is None:
+            raise NotImplementedError(
+                "time_course is not implemented for this type of binding system"
+            )
+        from .kinetic_integration import integrate_trajectory_chunks, mass_action_functions
+
+        missing = sorted(set(self.arguments) - set(parameters.keys()))
+        assert len(missing) == 0, f"The following parameters were missing: {missing}"
+        if not isinstance(kon, dict):
+            kon = dict((r[3], 1.0 if kon is None else kon) for r in self.reactions)
+        arrays = np.broadcast_arrays(
+            *[np.asarray(parameters[a], dtype=float) for a in self.arguments]
+        )
+        shape = arrays[0].shape
+        species_index = dict((s, i) for i, s in enumerate(self.all_species))
+        trajectories = []
+        for index in np.ndindex(shape):
+            point = dict((a, v[index]) for a, v in zip(self.arguments, arrays))
+            ode, jacobian = mass_action_functions(
+                [
+                    (species_index[r1], species_index[r2], species_index[product], point[kd])
+                    for r1, r2, product, kd in self.reactions
+                ],
+                len(self.all_species),
+                kon=[kon[r[3]] for r in self.reactions],
+            )
+            initial = [point.get(s, 0.0) for s in self.all_species]
+            trajectories.append(
+                integrate_trajectory_chunks(ode, jacobian, initial, t_eval, method, chunk_size)
+            )
+        for chunks in zip(*trajectories):
+            times = chunks[0][0]
+            yield times, np.stack([c for _, c in chunks]).reshape(
+                shape + (len(self.all_species), len(times))
+            )
+
+    def time_course(
+        self, parameters: dict, t_eval: np.ndarray, kon=None, method: str = "LSODA"
+    ):
+        """
+        Simulate time courses of a kinetic system
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters defining the binding system to be simulated, which may
+            be array-like, giving time courses for every point of their
+            broadcast shape.
+        t_eval : np.ndarray
+            Non-negative, increasing times at which to record concentrations.
+        kon : float, dict or None
+            Association rate constants, as for time_course_chunks (default =
+            None).
+        method : str
+            Integration method of scipy.integrate.solve_ivp (default =
+            "LSODA").
+
+        Returns
+        -------
+        np.ndarray
+            Concentrations of every species (in the order of all_species) at
+            times t_eval, shape (broadcast shape of parameters, n_species,
+            n_times).
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        chunks = [
+            c
+            for _, c in self.time_course_chunks(
+                parameters, t_eval, kon, method, chunk_size=max(len(t_eval), 1)
+            )
+        ]
+        if len(chunks) == 0:
+            shape = np.broadcast_shapes(*[np.shape(parameters[a]) for a in self.arguments])
+            return np.empty(shape + (len(self.all_species), 0))
+        return chunks[0]
+
     def get_all_species(self):
         if hasattr(self, "all_species"):
             return self.all_species
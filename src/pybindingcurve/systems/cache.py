@@ -0,0 +1,40 @@
+"""Location of PyBindingCurve's on-disk cache
+
+Generated code and other expensive to produce files are cached under a
+per-user cache directory, which may be changed by setting the
+PYBINDINGCURVE_CACHE_DIR environment variable. Setting it to an empty
+string disables the on-disk cache.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+def user_cache_dir(*subdirectories: str):
+    """Get (and create) a directory within the PyBindingCurve cache
+
+    Args:
+        subdirectories (str): Names of nested subdirectories within the cache.
+
+    Returns:
+        Path or None: Path to the directory, or None if the on-disk cache is
+            disabled or the directory cannot be created.
+    """
+    root = os.environ.get("PYBINDINGCURVE_CACHE_DIR")
+    if root is None:
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+        elif sys.platform == "darwin":
+            base = Path.home() / "Library" / "Caches"
+        else:
+            base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+        root = Path(base) / "pybindingcurve"
+    elif root == "":
+        return None
+    directory = Path(root).joinpath(*subdirectories)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return directory
@@ -0,0 +1,123 @@
+"""Derivatives of equilibrium concentrations with respect to system parameters
+
+At equilibrium, the concentration of every species is an explicit function
+of the free concentrations of fundamental species and of KDs, and the free
+concentrations are fixed by mass balances, requiring that the total of each
+fundamental species is conserved. Differentiating the mass balances
+(implicit differentiation) gives derivatives of free concentrations with
+respect to total concentrations and KDs from a single linear solve at each
+point, without solving the system again.
+
+Partial derivatives of the explicit species expressions are taken by the
+complex step method, which is exact to rounding error for the rational
+expressions used by binding systems.
+"""
+
+import numpy as np
+
+# Imaginary step, relative to the magnitude of the value stepped
+_complex_step = 1e-20
+
+
+def _complex_step_partials(species_function: callable, free: list, kds: dict, wrt: list):
+    """Partial derivatives of species concentrations by the complex step method
+
+    Args:
+        species_function (callable): Function taking free concentrations as
+            positional arguments and KDs as keyword arguments, returning a
+            dict of all species concentrations.
+        free (list): Free concentrations of fundamental species, as arrays.
+        kds (dict): KDs, as arrays.
+        wrt (list): Free species indices (int) and KD names (str) to
+            differentiate with respect to.
+
+    Returns:
+        dict: Indexed by entries of wrt, dicts of derivatives of each species.
+    """
+    partials = {}
+    for variable in wrt:
+        stepped_free = [np.asarray(x, dtype=complex) for x in free]
+        stepped_kds = dict((k, np.asarray(v, dtype=complex)) for k, v in kds.items())
+        values = stepped_free if isinstance(variable, int) else stepped_kds
+        value = values[variable]
+        step = _complex_step * np.where(value.real == 0, 1.0, np.abs(value.real))
+        values[variable] = value + 1j * step
+        with np.errstate(divide="ignore", invalid="ignore"):
+            species = species_function(*stepped_free, **stepped_kds)
+            partials[variable] = dict(
+                (name, np.imag(concentration) / step) for name, concentration in species.items()
+            )
+    return partials
+
+
+def readout_derivatives(
+    species_function: callable,
+    mass_balances: dict,
+    free: np.ndarray,
+    kds: dict,
+    readout: str,
+    wrt: list,
+):
+    """Derivatives of a species concentration at equilibrium
+
+    Args:
+        species_function (callable): Function taking free concentrations as
+            positional arguments and KDs as keyword arguments, returning a
+            dict of all species concentrations.
+        mass_balances (dict): Indexed by the name of the total concentration
+            of each fundamental species, in the order of free, dicts of the
+            number of that fundamental species in each species.
+        free (np.ndarray): Free concentrations of fundamental species at
+            equilibrium, shape (n_points, n_fundamental).
+        kds (dict): KDs, as arrays of shape (n_points,).
+        readout (str): Species to differentiate.
+        wrt (list): Names of total concentrations and KDs to differentiate
+            with respect to.
+
+    Returns:
+        dict: Derivatives of readout with respect to each entry of wrt, as
+            arrays of shape (n_points,).
+    """
+    num_points, num_fundamental = free.shape
+    free_columns = [free[:, j] for j in range(num_fundamental)]
+    kds_wrt = [name for name in wrt if name in kds]
+    partials = _complex_step_partials(
+        species_function, free_columns, kds, list(range(num_fundamental)) + kds_wrt
+    )
+
+    def accounted_for(derivatives):
+        # Derivative of the amount of each fundamental species accounted for
+        # by all species, shape (n_points, n_fundamental)
+        return np.stack(
+            [
+                sum(count * derivatives[name] for name, count in balance.items())
+                * np.ones(num_points)
+                for balance in mass_balances.values()
+            ],
+            axis=-1,
+        )
+
+    # Derivatives of the mass balances with respect to free concentrations
+    jacobian = np.stack([accounted_for(partials[j]) for j in range(num_fundamental)], axis=-1)
+    # Derivatives of free concentrations, indexed [point, free species, wrt]
+    right_hand_side = np.zeros((num_points, num_fundamental, len(wrt)))
+    for column, name in enumerate(wrt):
+        if name in mass_balances:
+            right_hand_side[:, list(mass_balances).index(name), column] = 1.0
+        else:
+            right_hand_side[:, :, column] = -accounted_for(partials[name])
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        try:
+            free_derivatives = np.linalg.solve(jacobian, right_hand_side)
+        except np.linalg.LinAlgError:
+            free_derivatives = np.linalg.pinv(jacobian) @ right_hand_side
+        readout_by_free = np.stack(
+            [partials[j][readout] * np.ones(num_points) for j in range(num_fundamental)], axis=-1
+        )
+        derivatives = np.einsum("nj,njw->nw", readout_by_free, free_derivatives)
+    result = {}
+    for column, name in enumerate(wrt):
+        result[name] = derivatives[:, column]
+        if name in kds:
+            result[name] = result[name] + partials[name][readout]
+    return result
@@ -0,0 +1,84 @@
+"""Isolated modules and a registry for generated custom system code
+
+Custom system factories generate Python source for binding functions. Each
+generated system is executed into its own module object, rather than the
+factory's globals, so that any number of custom systems can coexist and be
+built from multiple threads. Compiled systems are held in a thread safe
+registry so that building the same system again reuses them.
+"""
+
+import threading
+import types
+from collections import OrderedDict
+
+
+def load_generated_module(name: str, *code, namespace: dict = None):
+    """Execute generated code in a new module
+
+    Args:
+        name (str): Name given to the new module.
+        code (str or code): Source strings or compiled code objects to
+            execute, in order.
+        namespace (dict, optional): Names made available to the generated
+            code, such as functions it calls but does not import. Defaults to
+            None.
+
+    Returns:
+        types.ModuleType: Module containing everything defined by code.
+    """
+    module = types.ModuleType(name)
+    if namespace is not None:
+        module.__dict__.update(namespace)
+    for c in code:
+        exec(c, module.__dict__)
+    return module
+
+
+class GeneratedSystemRegistry:
+    """Thread safe, least recently used registry of compiled custom systems
+
+    Args:
+        maxsize (int, optional): Maximum number of systems held, with the
+            least recently used removed first. Defaults to 128.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._systems = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get_or_create(self, key: str, create: callable):
+        """Get a registered system, creating and registering it if not present
+
+        Creation is performed while holding the registry lock, so concurrent
+        requests for the same system create it only once.
+
+        Args:
+            key (str): Key identifying the system.
+            create (callable): Called with no arguments to create the system.
+
+        Returns:
+            The registered system.
+        """
+        with self._lock:
+            if key in self._systems:
+                self._systems.move_to_end(key)
+                return self._systems[key]
+            system = create()
+            self._systems[key] = system
+            while len(self._systems) > self.maxsize:
+                self._systems.popitem(last=False)
+            return system
+
+    def clear(self):
+        """Remove all registered systems"""
+        with self._lock:
+            self._systems.clear()
+
+    def __contains__(self, key: str):
+        with self._lock:
+            return key in self._systems
+
+    def __len__(self):
+        with self._lock:
+            return len(self._systems)
@@ -0,0 +1,115 @@
+from inspect import Parameter, Signature
+from .kinetic_integration import integrate_to_steady_state, mass_action_functions
+from .minimizer_binding_system_factory import MinimizerBindingSystemFactory
+
+# Methods of solve_ivp accepting sparse Jacobians (LSODA requires them dense),
+# used for systems with at least sparse_species species
+sparse_methods = ("BDF", "Radau")
+sparse_species = 20
+
+
+class KineticBindingSystemFactory(MinimizerBindingSystemFactory):
+	"""
+	KineticBindingSystemFactory produces custom kinetic binding system functions
+
+	Systems are defined in the same way as for MinimizerBindingSystemFactory,
+	whose parser is used, for example:
+
+	P+L<->PL1
+	P+L<->PL2
+	PL1+L<->PL1L2*
+	PL2+L<->PL1L2
+
+	Rather than generating code, every reaction is represented by the indices
+	of its two reactants and product, and the name of its KD. When called, the
+	binding function builds the stoichiometry matrix and reaction rates from
+	these (see kinetic_integration.mass_action_functions) and integrates mass
+	action kinetics from the total fundamental species concentrations to
+	steady state. Unlike minimizer systems, each route to a product keeps its
+	own reaction, so systems need not be thermodynamically consistent.
+
+	The binding function takes total fundamental species concentrations and
+	KDs as arguments, along with the interval, method and
+	steady_state_tolerance options of kinetic systems, and returns a dict of
+	all species concentrations, with free fundamental species given the
+	suffix _f, as for minimizer systems. For systems of many species, BDF and
+	Radau methods use sparse Jacobians.
+	"""
+
+	# Reactions as tuples of (reactant1, reactant2, product) species indices,
+	# and their KD argument names, in order of appearance
+	reactions = None
+	reaction_kds = None
+
+	def __init__(self, system_string: str):
+		"""Construct a kinetic custom binding system object
+
+		Args:
+			system_string (str): Custom system definition string
+		"""
+		reaction_dict = self.parse_system_definition_string(system_string)
+		species, fundamental_species = self.get_species_and_fundamental_species(reaction_dict)
+		species_composed_of_matrix = self.build_species_composed_of_matrix(species, fundamental_species, reaction_dict)
+		self.all_species = list(species)
+		self.fundamental_species = list(fundamental_species)
+		self.mass_balances = self.get_mass_balances(species, fundamental_species, species_composed_of_matrix)
+		self.reactions = [
+			(self.all_species.index(r1), self.all_species.index(r2), self.all_species.index(product))
+			for product, reactions in reaction_dict.items()
+			for r1, r2 in reactions
+		]
+		self.reaction_kds = [
+			self.kd_from_reaction_tuple(reaction, product)
+			for product, reactions in reaction_dict.items()
+			for reaction in reactions
+		]
+		kds = list(self.get_kds(reaction_dict))
+		self.binding_function = self.gen_custom_kinetic_func(kds)
+		self.binding_function_arguments = self.fundamental_species + kds
+
+	def gen_custom_kinetic_func(self, kds: list):
+		"""Make the custom kinetic binding function
+
+		Args:
+			kds (list): Unique KDs in order of appearance in the system
+
+		Returns:
+			callable: Binding function, with a signature naming total fundamental species concentrations, KDs and integration options
+		"""
+		reactions = self.reactions
+		reaction_kds = self.reaction_kds
+		num_species = len(self.all_species)
+		fundamental_species = self.fundamental_species
+		species_names = [s + ("_f" if s in fundamental_species else "") for s in self.all_species]
+
+		# BindingSystem takes system arguments from the function signature
+		function_signature = Signature(
+			[Parameter(name, Parameter.POSITIONAL_OR_KEYWORD) for name in fundamental_species + kds]
+			+ [
+				Parameter("interval", Parameter.KEYWORD_ONLY, default=(0, 100)),
+				Parameter("method", Parameter.KEYWORD_ONLY, default="LSODA"),
+				Parameter("steady_state_tolerance", Parameter.KEYWORD_ONLY, default=1e-12),
+			]
+		)
+
+		def custom_kinetic_system(*args, **kwargs):
+			bound = function_signature.bind(*args, **kwargs)
+			bound.apply_defaults()
+			arguments = bound.arguments
+			ode, jacobian = mass_action_functions(
+				[reaction + (arguments[kd],) for reaction, kd in zip(reactions, reaction_kds)],
+				num_species,
+				sparse=arguments["method"] in sparse_methods and num_species >= sparse_species,
+			)
+			concentrations = integrate_to_steady_state(
+				ode,
+				jacobian,
+				[arguments[fs] for fs in fundamental_species] + [0.0] * (num_species - len(fundamental_species)),
+				arguments["interval"],
+				arguments["method"],
+				arguments["steady_state_tolerance"],
+			)
+			return dict(zip(species_names, concentrations))
+
+		custom_kinetic_system.__signature__ = function_signature
+		return custom_kinetic_system
@@ -0,0 +1,300 @@
+"""Integration of binding kinetics to equilibrium
+
+Kinetic systems find equilibrium by integrating rate equations, with every
+association rate constant set to 1 so that dissociation rate constants are
+equal to KDs. With KDs spanning orders of magnitude the equations are
+stiff, so by default they are integrated by LSODA (switching between
+explicit and implicit methods as stiffness requires) supplied with analytic
+Jacobians. Integration stops early once every derivative has fallen below
+a threshold, rather than continuing to the end of the interval long after
+equilibrium has been reached.
+
+Time courses are integrated step by step, with concentrations at requested
+times interpolated from each step and returned in chunks, so that long,
+densely sampled trajectories need not be held in memory at once.
+"""
+
+import numpy as np
+import scipy.integrate
+from scipy.sparse import bsr_matrix, csr_matrix
+
+# Methods of solve_ivp making use of a Jacobian
+implicit_methods = ("BDF", "Radau", "LSODA")
+# Batches of at least this many concentrations are integrated using sparse
+# Jacobians
+batch_sparse_size = 300
+
+
+def integrate_to_steady_state(
+    ode: callable,
+    jacobian: callable,
+    initial: list,
+    interval: tuple = (0, 100),
+    method: str = "LSODA",
+    steady_state_tolerance: float = 1e-12,
+):
+    """Integrate rate equations until steady state or the end of an interval
+
+    Args:
+        ode (callable): Derivatives of concentrations, called as ode(t, y).
+        jacobian (callable): Jacobian of ode with respect to concentrations,
+            called as jacobian(t, y), used by implicit methods.
+        initial (list): Concentrations at the start of the interval.
+        interval (tuple, optional): Start and end times. Defaults to
+            (0, 100).
+        method (str, optional): Integration method of solve_ivp. Defaults to
+            "LSODA".
+        steady_state_tolerance (float, optional): Integration stops when the
+            largest absolute derivative falls below this, or continues to the
+            end of the interval if None. Defaults to 1e-12.
+
+    Returns:
+        np.ndarray: Concentrations at the end of integration.
+    """
+    options = {"jac": jacobian} if method in implicit_methods else {}
+    solver = getattr(scipy.integrate, method)(
+        ode,
+        interval[0],
+        np.asarray(initial, dtype=float),
+        interval[1],
+        rtol=1e-12,
+        atol=1e-12,
+        **options,
+    )
+    return _step_to_steady_state(solver, steady_state_tolerance)
+
+
+def _step_to_steady_state(solver, steady_state_tolerance: float):
+    """Step a solve_ivp solver until steady state or the end of its interval
+
+    The largest absolute derivative is checked before every step, rather
+    than located between steps by a terminal event, whose root finding fails
+    when rounding of the dense output flips the sign of derivatives within
+    steady_state_tolerance of zero.
+
+    Args:
+        solver: Solver object of scipy.integrate, such as LSODA.
+        steady_state_tolerance (float): Largest absolute derivative at steady
+            state, or None to step to the end of the interval.
+
+    Returns:
+        np.ndarray: Concentrations at the last step.
+    """
+    while solver.status == "running":
+        if (
+            steady_state_tolerance is not None
+            and np.max(np.abs(solver.fun(solver.t, solver.y))) < steady_state_tolerance
+        ):
+            break
+        solver.step()
+    return solver.y
+
+
+def integrate_trajectory_chunks(
+    ode: callable,
+    jacobian: callable,
+    initial: list,
+    t_eval: np.ndarray,
+    method: str = "LSODA",
+    chunk_size: int = 1000,
+):
+    """Integrate rate equations from time zero, yielding chunks of a trajectory
+
+    Args:
+        ode (callable): Derivatives of concentrations, called as ode(t, y).
+        jacobian (callable): Jacobian of ode with respect to concentrations,
+            called as jacobian(t, y), used by implicit methods.
+        initial (list): Concentrations at time zero.
+        t_eval (np.ndarray): Non-negative, increasing times at which to
+            return concentrations.
+        method (str, optional): Integration method of solve_ivp. Defaults to
+            "LSODA".
+        chunk_size (int, optional): Number of times in each chunk. Defaults
+            to 1000.
+
+    Yields:
+        tuple: Times in the chunk, and concentrations at those times, shape
+            (n_species, n_times).
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    assert np.all(t_eval >= 0) and np.all(np.diff(t_eval) >= 0), "t_eval must be non-negative and increasing"
+    initial = np.asarray(initial, dtype=float)
+    options = {"jac": jacobian} if method in implicit_methods else {}
+    end_time = t_eval[-1] if len(t_eval) > 0 else 0.0
+    solver = getattr(scipy.integrate, method)(
+        ode, 0.0, initial, end_time, rtol=1e-12, atol=1e-12, **options
+    )
+    interpolant = None
+    for start in range(0, len(t_eval), chunk_size):
+        times = t_eval[start : start + chunk_size]
+        chunk = np.empty((len(initial), len(times)))
+        filled = 0
+        while filled < len(times):
+            # Fill times reached by the solver, then take another step
+            reached = np.searchsorted(times, solver.t, side="right")
+            if reached > filled:
+                if interpolant is None:
+                    chunk[:, filled:reached] = initial[:, None]
+                else:
+                    chunk[:, filled:reached] = interpolant(times[filled:reached])
+                filled = reached
+            else:
+                message = solver.step()
+                if solver.status == "failed":
+                    raise RuntimeError(f"Integration failed: {message}")
+                interpolant = solver.dense_output()
+        yield times, chunk
+
+
+def mass_action_functions(
+    reactions: list, num_species: int, sparse: bool = False, kon: np.ndarray = None
+):
+    """Rate equations and their Jacobian for reversible binding reactions
+
+    Each reaction is the binding of two species (or of a species to itself)
+    to form a product, A + B <-> AB, with net rate of dissociation
+    r = kon*(-[A][B] + kd*[AB]), where kon is the association rate constant
+    (1 unless given) and kon*kd the dissociation rate constant. Derivatives of concentrations are the product of
+    the stoichiometry matrix and the vector of reaction rates, and the
+    Jacobian the product of the stoichiometry matrix and derivatives of
+    reaction rates, each reaction depending upon at most three species.
+
+    Args:
+        reactions (list): Tuples of (A, B, AB, kd), where A, B and AB are
+            indices of species concentrations.
+        num_species (int): Number of species.
+        sparse (bool, optional): Hold the stoichiometry matrix and return
+            Jacobians as scipy.sparse CSR matrices, as used by the BDF and
+            Radau methods of solve_ivp for large systems. Defaults to False.
+        kon (np.ndarray, optional): Association rate constant of each
+            reaction. Defaults to None, setting all to 1.
+
+    Returns:
+        tuple: Functions ode(t, y) and jacobian(t, y), as used by
+            integrate_to_steady_state.
+    """
+    a, b, product = [np.array([r[k] for r in reactions], dtype=int) for k in range(3)]
+    kd = np.array([r[3] for r in reactions], dtype=float)
+    kon = np.ones(len(reactions)) if kon is None else np.asarray(kon, dtype=float)
+    reaction_index = np.arange(len(reactions))
+    # Change in each species per unit of dissociation, with entries for
+    # the same species summed
+    stoichiometry = csr_matrix(
+        (
+            np.repeat([1.0, 1.0, -1.0], len(reactions)),
+            (np.concatenate((a, b, product)), np.tile(reaction_index, 3)),
+        ),
+        shape=(num_species, len(reactions)),
+    )
+    rows = np.tile(reaction_index, 3)
+    columns = np.concatenate((a, b, product))
+    if not sparse:
+        stoichiometry = stoichiometry.toarray()
+
+    def ode(t, y):
+        return stoichiometry @ (kon * (-y[a] * y[b] + kd * y[product]))
+
+    def jacobian(t, y):
+        rate_derivatives = csr_matrix(
+            (np.concatenate((-kon * y[b], -kon * y[a], kon * kd)), (rows, columns)),
+            shape=(len(reactions), num_species),
+        )
+        if not sparse:
+            return stoichiometry @ rate_derivatives.toarray()
+        return stoichiometry @ rate_derivatives
+
+    return ode, jacobian
+
+
+def integrate_batch_to_steady_state(
+    reactions: list,
+    initial: np.ndarray,
+    kd: np.ndarray,
+    kon: np.ndarray = None,
+    interval: tuple = (0, 100),
+    method: str = None,
+    steady_state_tolerance: float = 1e-12,
+):
+    """Integrate many independent copies of a reaction system at once
+
+    The systems of n_points parameter sets are stacked into one system of
+    rate equations, whose Jacobian is block diagonal, with a block per
+    parameter set. Derivatives are evaluated for all parameter sets at once
+    (and for several states at once, as the vectorized option of solve_ivp
+    solvers allows), and the Jacobian is returned as a sparse block matrix,
+    so a whole titration is integrated by a single solver. Integration stops
+    once every derivative of every parameter set has fallen below
+    steady_state_tolerance.
+
+    Args:
+        reactions (list): Tuples of (A, B, AB) species indices, as for
+            mass_action_functions, without KDs.
+        initial (np.ndarray): Concentrations at the start of the interval,
+            shape (n_points, n_species).
+        kd (np.ndarray): KD of every reaction, shape (n_points, n_reactions).
+        kon (np.ndarray, optional): Association rate constant of every
+            reaction, broadcastable to the shape of kd. Defaults to None,
+            setting all to 1.
+        interval (tuple, optional): Start and end times. Defaults to
+            (0, 100).
+        method (str, optional): Integration method of solve_ivp. Methods
+            other than BDF and Radau are given dense Jacobians, so scale
+            poorly with the number of parameter sets. Defaults to None,
+            using LSODA for batches of fewer than batch_sparse_size
+            concentrations, and BDF for larger batches.
+        steady_state_tolerance (float, optional): Integration stops when the
+            largest absolute derivative falls below this, or continues to the
+            end of the interval if None. Defaults to 1e-12.
+
+    Returns:
+        tuple (np.ndarray, bool): Concentrations at the end of integration,
+            shape (n_points, n_species), and whether integration succeeded.
+    """
+    initial = np.asarray(initial, dtype=float)
+    num_points, num_species = initial.shape
+    if method is None:
+        method = "LSODA" if initial.size < batch_sparse_size else "BDF"
+    a, b, product = [np.array([r[k] for r in reactions], dtype=int) for k in range(3)]
+    kon = np.broadcast_to(1.0 if kon is None else np.asarray(kon, dtype=float), kd.shape)
+    reaction_index = np.arange(len(reactions))
+    stoichiometry = np.zeros((num_species, len(reactions)))
+    np.add.at(stoichiometry, (a, reaction_index), 1)
+    np.add.at(stoichiometry, (b, reaction_index), 1)
+    np.add.at(stoichiometry, (product, reaction_index), -1)
+    block_indices = np.arange(num_points)
+    block_pointers = np.arange(num_points + 1)
+
+    def ode(t, y):
+        # y is (n_points*n_species,) or, when vectorized, (n_points*n_species, k)
+        states = y.reshape((num_points, num_species) + y.shape[1:])
+        ya, yb, yp = states[:, a], states[:, b], states[:, product]
+        extra = (None,) * (y.ndim - 1)
+        rates = kon[(...,) + extra] * (-ya * yb + kd[(...,) + extra] * yp)
+        return np.einsum("sr,nr...->ns...", stoichiometry, rates).reshape(y.shape)
+
+    def jacobian(t, y):
+        states = y.reshape(num_points, num_species)
+        rate_derivatives = np.zeros((num_points, len(reactions), num_species))
+        np.add.at(rate_derivatives, (slice(None), reaction_index, a), -kon * states[:, b])
+        np.add.at(rate_derivatives, (slice(None), reaction_index, b), -kon * states[:, a])
+        np.add.at(rate_derivatives, (slice(None), reaction_index, product), kon * kd)
+        blocks = np.einsum("sr,nrk->nsk", stoichiometry, rate_derivatives)
+        matrix = bsr_matrix(
+            (blocks, block_indices, block_pointers),
+            shape=(num_points * num_species, num_points * num_species),
+        )
+        return matrix if method in ("BDF", "Radau") else matrix.toarray()
+
+    options = {"jac": jacobian} if method in implicit_methods else {}
+    solver = getattr(scipy.integrate, method)(
+        ode,
+        interval[0],
+        initial.ravel(),
+        interval[1],
+        rtol=1e-12,
+        atol=1e-12,
+        vectorized=True,
+        **options,
+    )
+    concentrations = _step_to_steady_state(solver, steady_state_tolerance)
+    return concentrations.reshape(num_points, num_species), solver.status != "failed"
@@ -1,9 +1,12 @@
 import numpy as np
 from .binding_system import BindingSystem
-from scipy.integrate import solve_ivp
+from .kinetic_binding_system_factory import KineticBindingSystemFactory
+from .kinetic_integration import integrate_to_steady_state
 
 # 1:1 binding - see https://stevenshave.github.io/pybindingcurve/simulate_1to1.html
-def system01_kinetic(p, l, kdpl, interval=(0, 100)):
+def system01_kinetic(
+    p, l, kdpl, interval=(0, 100), method="LSODA", steady_state_tolerance=1e-12
+):
     def ode(concs, t, kdpl):
         p, l, pl = concs
         r1 = -p * l + kdpl * pl
@@ -12,14 +15,26 @@ def system01_kinetic(p, l, kdpl, interval=(0, 100)):
         dpldt = -r1
         return [dpdt, dldt, dpldt]
 
-    ode_result = solve_ivp(
-        lambda t, y: ode(y, t, kdpl), interval, [p, l, 0.0], rtol=1e-12, atol=1e-12
-    ).y[:, -1]
+    def jacobian(concs, t, kdpl):
+        p, l, pl = concs
+        dr1 = [-l, -p, kdpl]
+        return [dr1, dr1, [-x for x in dr1]]
+
+    ode_result = integrate_to_steady_state(
+        lambda t, y: ode(y, t, kdpl),
+        lambda t, y: jacobian(y, t, kdpl),
+        [p, l, 0.0],
+        interval,
+        method,
+        steady_state_tolerance,
+    )
     return {"p": ode_result[0], "l": ode_result[1], "pl": ode_result[2]}
 
 
 # 1:1:1 competition - see https://stevenshave.github.io/pybindingcurve/simulate_competition.html
-def system02_kinetic(p, l, i, kdpl, kdpi, interval=(0, 100)):
+def system02_kinetic(
+    p, l, i, kdpl, kdpi, interval=(0, 100), method="LSODA", steady_state_tolerance=1e-12
+):
     def ode(concs, t, kdpl, kdpi):
         p, l, i, pl, pi = concs
         r1 = -p * l + kdpl * pl
@@ -31,13 +46,20 @@ def system02_kinetic(p, l, i, kdpl, kdpi, interval=(0, 100)):
         dpidt = -r2
         return [dpdt, dldt, didt, dpldt, dpidt]
 
-    ode_result = solve_ivp(
+    def jacobian(concs, t, kdpl, kdpi):
+        p, l, i, pl, pi = concs
+        dr1 = np.array([-l, -p, 0.0, kdpl, 0.0])
+        dr2 = np.array([-i, 0.0, -p, 0.0, kdpi])
+        return [dr1 + dr2, dr1, dr2, -dr1, -dr2]
+
+    ode_result = integrate_to_steady_state(
         lambda t, y: ode(y, t, kdpl, kdpi),
-        interval,
+        lambda t, y: jacobian(y, t, kdpl, kdpi),
         [p, l, i, 0.0, 0.0],
-        rtol=1e-12,
-        atol=1e-12,
-    ).y[:, -1]
+        interval,
+        method,
+        steady_state_tolerance,
+    )
     return {
         "p": ode_result[0],
         "l": ode_result[1],
@@ -48,7 +70,9 @@ def system02_kinetic(p, l, i, kdpl, kdpi, interval=(0, 100)):
 
 
 # Homodimer formation - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerformation.html
-def system03_kinetic(p, kdpp, interval=(0, 100)):
+def system03_kinetic(
+    p, kdpp, interval=(0, 100), method="LSODA", steady_state_tolerance=1e-12
+):
     def ode(concs, t, kdpp):
         p, pp = concs
         r1 = -(p * p) + kdpp * pp
@@ -56,14 +80,25 @@ def system03_kinetic(p, kdpp, interval=(0, 100)):
         dppdt = -r1
         return [dpdt, dppdt]
 
-    ode_result = solve_ivp(
-        lambda t, y: ode(y, t, kdpp), interval, [p, 0.0], rtol=1e-12, atol=1e-12
-    ).y[:, -1]
+    def jacobian(concs, t, kdpp):
+        p, pp = concs
+        return [[-4 * p, 2 * kdpp], [2 * p, -kdpp]]
+
+    ode_result = integrate_to_steady_state(
+        lambda t, y: ode(y, t, kdpp),
+        lambda t, y: jacobian(y, t, kdpp),
+        [p, 0.0],
+        interval,
+        method,
+        steady_state_tolerance,
+    )
     return {"p": ode_result[0], "pp": ode_result[1]}
 
 
 # Homodimer breaking - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerbreaking.html
-def system04_kinetic(p, i, kdpp, kdpi, interval=(0, 100)):
+def system04_kinetic(
+    p, i, kdpp, kdpi, interval=(0, 100), method="LSODA", steady_state_tolerance=1e-12
+):
     def ode(concs, t, kdpp, kdpi):
         p, i, pp, pi = concs
         r_pp = -(p * p) + kdpp * pp
@@ -71,16 +106,23 @@ def system04_kinetic(p, i, kdpp, kdpi, interval=(0, 100)):
         dpdt = 2 * r_pp + r_pi
         didt = r_pi
         dppdt = -r_pp
-        dpldt = -r_pi
-        return [dpdt, didt, dppdt, didt]
+        dpidt = -r_pi
+        return [dpdt, didt, dppdt, dpidt]
+
+    def jacobian(concs, t, kdpp, kdpi):
+        p, i, pp, pi = concs
+        dr_pp = np.array([-2 * p, 0.0, kdpp, 0.0])
+        dr_pi = np.array([-i, -p, 0.0, kdpi])
+        return [2 * dr_pp + dr_pi, dr_pi, -dr_pp, -dr_pi]
 
-    ode_result = solve_ivp(
+    ode_result = integrate_to_steady_state(
         lambda t, y: ode(y, t, kdpp, kdpi),
-        interval,
+        lambda t, y: jacobian(y, t, kdpp, kdpi),
         [p, i, 0.0, 0.0],
-        rtol=1e-12,
-        atol=1e-12,
-    ).y[:, -1]
+        interval,
+        method,
+        steady_state_tolerance,
+    )
     return {
         "p": ode_result[0],
         "i": ode_result[1],
@@ -100,6 +142,8 @@ class System_kinetic_one_to_one__pl(BindingSystem):
     def __init__(self):
         super().__init__(system01_kinetic)
         self.default_readout = "pl"
+        self.all_species = ["p", "l", "pl"]
+        self.reactions = [("p", "l", "pl", "kdpl")]
 
     def query(self, parameters: dict):
         if self._are_ymin_ymax_present(parameters):
@@ -128,6 +172,8 @@ class System_kinetic_competition_pl(BindingSystem):
     def __init__(self):
         super().__init__(system02_kinetic)
         self.default_readout = "pl"
+        self.all_species = ["p", "l", "i", "pl", "pi"]
+        self.reactions = [("p", "l", "pl", "kdpl"), ("p", "i", "pi", "kdpi")]
 
     def query(self, parameters: dict):
         if self._are_ymin_ymax_present(parameters):
@@ -156,6 +202,8 @@ class System_kinetic_homodimerformation__pp(BindingSystem):
     def __init__(self):
         super().__init__(system03_kinetic, False)
         self.default_readout = "pp"
+        self.all_species = ["p", "pp"]
+        self.reactions = [("p", "p", "pp", "kdpp")]
 
     def query(self, parameters: dict):
         if self._are_ymin_ymax_present(parameters):
@@ -184,6 +232,8 @@ class System_kinetic_homodimerbreaking__pp(BindingSystem):
     def __init__(self):
         super().__init__(system04_kinetic, False)
         self.default_readout = "pp"
+        self.all_species = ["p", "i", "pp", "pi"]
+        self.reactions = [("p", "p", "pp", "kdpp"), ("p", "i", "pi", "kdpi")]
 
     def query(self, parameters: dict):
         if self._are_ymin_ymax_present(parameters):
@@ -212,6 +262,8 @@ class System_kinetic_homodimerbreaking__pl(BindingSystem):
     def __init__(self):
         super().__init__(system04_kinetic, False)
         self.default_readout = "pl"
+        self.all_species = ["p", "i", "pp", "pi"]
+        self.reactions = [("p", "p", "pp", "kdpp"), ("p", "i", "pi", "kdpi")]
 
     def query(self, parameters: dict):
         if self._are_ymin_ymax_present(parameters):
@@ -227,3 +279,46 @@ class System_kinetic_homodimerbreaking__pl(BindingSystem):
                 )
         else:
             return super().query(parameters)
+
+
+class System_kinetic_custom(BindingSystem):
+    """
+    Kinetic custom binding system
+
+    Class uses KineticBindingSystemFactory to make a custom kinetic function,
+    integrating mass action kinetics of a custom system to steady state.
+    """
+
+    def __init__(self, system_string):
+        self.system_string = system_string
+        custom_system = KineticBindingSystemFactory(system_string)
+        super().__init__(custom_system.binding_function, False)
+        self.all_species = custom_system.all_species
+        self.default_readout = custom_system.readout
+        self.reactions = [
+            tuple(self.all_species[i] for i in reaction) + (kd,)
+            for reaction, kd in zip(custom_system.reactions, custom_system.reaction_kds)
+        ]
+        self.result_species = [
+            s + ("_f" if s in custom_system.fundamental_species else "")
+            for s in self.all_species
+        ]
+
+    def __reduce__(self):
+        # Binding functions are rebuilt from the system definition
+        return (self.__class__, (self.system_string,), self._picklable_state())
+
+    def query(self, parameters: dict):
+        if self._are_ymin_ymax_present(parameters):
+            parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
+                parameters
+            )
+            value = super().query(parameters_no_min_max)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.nan_to_num(
+                    parameters["ymin"]
+                    + ((parameters["ymax"] - parameters["ymin"]) * value)
+                    / parameters["l"]
+                )
+        else:
+            return super().query(parameters)
@@ -6,6 +6,8 @@
 
 from inspect import signature
 from copy import deepcopy
+import hashlib
+from .generated_systems import GeneratedSystemRegistry, load_generated_module
 
 class LagrangeBindingSystemFactory:
     """
@@ -33,6 +35,9 @@ class LagrangeBindingSystemFactory:
     func_string = None
     _add_nonzero_constraints = False
 
+    # Modules containing generated functions, keyed by a hash of their source
+    registry = GeneratedSystemRegistry(maxsize=128)
+
     def __init__(
         self, system_string, add_nonzero_constraints=False, output_filename=None
     ):
@@ -40,6 +45,9 @@ class LagrangeBindingSystemFactory:
         # Adding non-zero constraints used in testing and development
         self._add_nonzero_constraints = add_nonzero_constraints
 
+        # Species are collected per system, not shared between systems
+        self.species = []
+
         # Get reactions tuples
         reactions = self._get_reactions_and_set_readout(system_string.lower())
         # Populate self.species, an ordered list of species encountered
@@ -99,8 +107,14 @@ class LagrangeBindingSystemFactory:
         self.func_string = self.get_func_string()
         if output_filename is not None:
             self.write_func_to_python_file(output_filename)
-        exec(self.func_string, globals())
-        self.binding_function = eval("custom_lagrange_binding_system")
+        key = hashlib.sha256(self.func_string.encode()).hexdigest()
+        module = self.registry.get_or_create(
+            key,
+            lambda: load_generated_module(
+                f"pybindingcurve.generated.lagrange_{key[:16]}", self.func_string
+            ),
+        )
+        self.binding_function = module.custom_lagrange_binding_system
         self.custom_function_arguments = list(
             signature(self.binding_function).parameters.keys()
         )
@@ -113,23 +127,25 @@ class LagrangeBindingSystemFactory:
     def get_func_string(self):
         # Write header and function definition
         custom_lagrange_definition = '"""\nCustom generated binding system\n\nLagrane multiplier binding system genetated with generated with \nhttps://github.com/stevenshave/lagrange-binding-systems/write_custom_system.py"""\n\n'
-        custom_lagrange_definition += f"from scipy.optimize import fsolve\nfrom autograd import grad\ndef custom_lagrange_binding_system("
+        custom_lagrange_definition += f"from pybindingcurve.systems.lagrange_gradients import solve_lagrange\ndef custom_lagrange_binding_system("
         custom_lagrange_definition += (
             ", ".join([f"{x}0" for x in self.fundamental_species])
             + ", "
             + ", ".join([x[2] for _, r in self.reactions_dictionary.items() for x in r])
             + "):\n"
         )
-        custom_lagrange_definition += "\tdef F(X): # Augmented Lagrange function\n"
-        # Write fundamental species concs
+        # Complexes are monomials in free fundamental species concentrations,
+        # their coefficients being their concentrations with all free
+        # fundamental species at 1 (see lagrange_gradients)
+        custom_lagrange_definition += "\t# Coefficients of complexes\n"
         custom_lagrange_definition += "".join(
-            [f"\t\t{x}=X[{ix}]\n" for ix, x in enumerate(self.fundamental_species)]
+            [f"\t{x}=1.0\n" for x in self.fundamental_species]
         )
 
         # Write the mass balances
         mass_balances = []
         for k, v in self.original_reactions_dictionary.items():
-            line = f"\t\t{k}=(" + "+".join([f"({sr[0]}*{sr[1]})" for sr in v]) + ")/("
+            line = f"\t{k}=(" + "+".join([f"({sr[0]}*{sr[1]})" for sr in v]) + ")/("
             line += "+".join([sr[2] for sr in v]) + ")"
             mass_balances.append(line + "\n")
         custom_lagrange_definition += "".join(mass_balances)
@@ -140,50 +156,21 @@ class LagrangeBindingSystemFactory:
             line += "+".join([sr[2] for sr in v]) + ")"
             long_mass_balances.append(line + "\n")
 
-        # Write constraints
-        constraints = []
-        for constraint_num in range(1, len(self.fundamental_species) + 1):
-            line = f"\t\tconstraint{constraint_num}={self.fundamental_species[constraint_num-1]}0-({self.fundamental_species[constraint_num-1]}+"
-            line += (
-                "+".join(
-                    [
-                        f"{count}*{product}"
-                        for product, count in self.fundamental_species_in_products[
-                            self.fundamental_species[constraint_num - 1]
-                        ].items()
-                    ]
-                )
-                + ")"
-            )
-            constraints.append(line + "\n")
-        if self._add_nonzero_constraints:
-            constraints.append(
-                f"\t\tnonzero_constraint={'-'.join([f'(constraint{x}-abs(constraint{x}))' for x in range(1, len(self.fundamental_species)+1)])}\n"
-            )
-        custom_lagrange_definition += "".join(constraints)
-
-        # Write return statement
-        return_statements = ["\t\treturn " + self.default_readout + "-"]
-        return_statements.append(
-            "+".join(
-                [
-                    f"X[{i+len(self.fundamental_species)}]*constraint{i+1}"
-                    for i in range(len(self.fundamental_species))
-                ]
-            )
-        )
-        if self._add_nonzero_constraints:
-            return_statements.append(
-                f"+X[{len(self.fundamental_species)+len(self.fundamental_species)}]*nonzero_constraint"
-            )
-        return_statements[-1] = return_statements[-1] + "\n"
-        custom_lagrange_definition += "".join(return_statements)
-
-        # Write derivation
-        custom_lagrange_definition += (
-            "\tderivative_function = grad(F) # Gradients of the Lagrange function\n"
-        )
+        # Numbers of each fundamental species in complexes and the readout
+        products = list(self.original_reactions_dictionary.keys())
+        exponents = [
+            [
+                self.fundamental_species_in_products[f].get(product, 0)
+                for f in self.fundamental_species
+            ]
+            for product in products
+        ]
+        if self.default_readout in products:
+            readout = f"({self.default_readout}, {exponents[products.index(self.default_readout)]})"
+        else:
+            readout = f"(1.0, {[int(f == self.default_readout) for f in self.fundamental_species]})"
 
+        # Write solution
         custom_lagrange_definition += (
             "\t"
             + ", ".join([f"{s}" for s in self.fundamental_species])
@@ -196,18 +183,9 @@ class LagrangeBindingSystemFactory:
                     )
                 ]
             )
-            + " = fsolve(derivative_function, ["
+            + f" = solve_lagrange([{', '.join(products)}], {exponents}, {readout}, ["
             + ", ".join([f"{x}0" for x in self.fundamental_species])
-            + ", "
-            + ", ".join(
-                [
-                    "1.0"
-                    for x in range(
-                        len(self.fundamental_species) + self._add_nonzero_constraints
-                    )
-                ]
-            )
-            + "])\n"
+            + f"], {self._add_nonzero_constraints})\n"
         )
         custom_lagrange_definition += (
             "\treturn {"
@@ -0,0 +1,143 @@
+"""Analytic gradients of augmented Lagrange functions
+
+Lagrange systems find equilibrium as a stationary point of the augmented
+Lagrange function F = R - sum(lam_k * C_k), where R is the readout species
+and C_k the mass balance constraint of fundamental species k. Every complex
+is a monomial in free fundamental species concentrations x,
+c * prod(x**e), with a coefficient c depending only on KDs and exponents e
+counting the fundamental species it contains. Constraints are then
+C_k = total_k - x_k - sum(e_k * c * prod(x**e)) over complexes, and first
+and second derivatives of F follow exactly from those of monomials, so the
+gradient of F and its Jacobian (the Hessian of F) are supplied to fsolve
+without automatic or numerical differentiation.
+"""
+
+import numpy as np
+from scipy.optimize import fsolve
+
+
+def _monomial_derivatives(coefficients: np.ndarray, exponents: np.ndarray, x: np.ndarray):
+    """Values, first and second derivatives of monomials c * prod(x**e)
+
+    Args:
+        coefficients (np.ndarray): Coefficient of each monomial, shape (n,).
+        exponents (np.ndarray): Exponents of each monomial, shape (n, m).
+        x (np.ndarray): Free fundamental species concentrations, shape (m,).
+
+    Returns:
+        tuple: Values, shape (n,), first derivatives, shape (n, m), and
+            second derivatives, shape (n, m, m).
+    """
+    identity = np.eye(len(x), dtype=int)
+    # Exponents after differentiating by x_j, then x_k; negative exponents
+    # only occur with zero multipliers, so are clipped to avoid 0**-1
+    first_exponents = exponents[:, None, :] - identity
+    second_exponents = first_exponents[:, :, None, :] - identity
+    values = coefficients * np.prod(x**exponents, axis=-1)
+    first = (coefficients[:, None] * exponents) * np.prod(
+        x ** np.maximum(first_exponents, 0), axis=-1
+    )
+    second = (
+        coefficients[:, None, None]
+        * exponents[:, :, None]
+        * (exponents[:, None, :] - identity)
+    ) * np.prod(x ** np.maximum(second_exponents, 0), axis=-1)
+    return values, first, second
+
+
+def lagrange_functions(
+    coefficients: list,
+    exponents: list,
+    readout: tuple,
+    totals: list,
+    nonzero_constraint: bool = False,
+):
+    """Gradient of an augmented Lagrange function and its Jacobian
+
+    Args:
+        coefficients (list): Coefficient of each complex.
+        exponents (list): Number of each fundamental species in each
+            complex, shape (n_complexes, n_fundamental_species).
+        readout (tuple): Coefficient and exponents of the readout species.
+        totals (list): Total concentration of each fundamental species.
+        nonzero_constraint (bool, optional): Add a constraint, with its own
+            multiplier, that is zero while the first mass balance is
+            non-negative and the others non-positive, as used in testing
+            and development. Defaults to False.
+
+    Returns:
+        tuple: Functions gradient(X) and jacobian(X) of X, the free
+            fundamental species concentrations followed by the multipliers.
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    exponents = np.asarray(exponents, dtype=int).reshape(len(coefficients), len(totals))
+    readout_coefficient = np.array([readout[0]], dtype=float)
+    readout_exponents = np.array([readout[1]], dtype=int)
+    totals = np.asarray(totals, dtype=float)
+    num_species = len(totals)
+    identity = np.eye(num_species)
+    # Weights of constraints in the nonzero constraint
+    signs = np.array([1.0] + [-1.0] * (num_species - 1))
+
+    def parts(X):
+        x = np.asarray(X[:num_species], dtype=float)
+        multipliers = np.asarray(X[num_species:], dtype=float)
+        _, dr, d2r = _monomial_derivatives(readout_coefficient, readout_exponents, x)
+        values, first, second = _monomial_derivatives(coefficients, exponents, x)
+        constraints = totals - x - exponents.T @ values
+        dc = -identity - exponents.T @ first
+        d2c = -np.einsum("nk,nij->kij", exponents, second)
+        if nonzero_constraint:
+            weights = signs * (1 - np.sign(constraints))
+            constraints = np.append(constraints, signs @ (constraints - np.abs(constraints)))
+            dc = np.vstack((dc, weights @ dc))
+            d2c = np.concatenate((d2c, np.einsum("k,kij->ij", weights, d2c)[None]))
+        return multipliers, dr[0], d2r[0], constraints, dc, d2c
+
+    def gradient(X):
+        multipliers, dr, _, constraints, dc, _ = parts(X)
+        return np.concatenate((dr - multipliers @ dc, -constraints))
+
+    def jacobian(X):
+        multipliers, _, d2r, _, dc, d2c = parts(X)
+        hessian = d2r - np.einsum("k,kij->ij", multipliers, d2c)
+        zeros = np.zeros((len(multipliers), len(multipliers)))
+        return np.block([[hessian, -dc.T], [-dc, zeros]])
+
+    return gradient, jacobian
+
+
+def solve_lagrange(
+    coefficients: list,
+    exponents: list,
+    readout: tuple,
+    totals: list,
+    nonzero_constraint: bool = False,
+):
+    """Find the stationary point of an augmented Lagrange function
+
+    Arguments are as for lagrange_functions. Free fundamental species
+    concentrations start at their totals, and multipliers at 1.
+
+    Raises:
+        ValueError: If fsolve does not converge, or converges to negative
+            free fundamental species concentrations, a stationary point which
+            is not the physical equilibrium.
+
+    Returns:
+        np.ndarray: Free fundamental species concentrations, followed by the
+            multipliers.
+    """
+    gradient, jacobian = lagrange_functions(
+        coefficients, exponents, readout, totals, nonzero_constraint
+    )
+    initial = list(totals) + [1.0] * (len(totals) + nonzero_constraint)
+    solution, _, ier, message = fsolve(gradient, initial, fprime=jacobian, full_output=True)
+    if ier != 1:
+        raise ValueError(f"Lagrange system did not converge: {message}")
+    free = solution[: len(totals)]
+    if np.any(free < -1e-9 * max(np.max(np.abs(totals)), 1e-300)):
+        raise ValueError(
+            f"Lagrange system converged to negative free concentrations {free}"
+        )
+    return solution
@@ -1,78 +1,54 @@
-from scipy.optimize import fsolve
-from autograd import grad
 from .binding_system import BindingSystem
 from .lagrange_binding_system_factory import LagrangeBindingSystemFactory
+from .lagrange_gradients import solve_lagrange
 import numpy as np
 
 
+# Complexes are monomials in free species concentrations, given to
+# solve_lagrange as coefficients and numbers of each fundamental species (see
+# lagrange_gradients), from which the gradients of the augmented Lagrange
+# function and their Jacobian are calculated analytically.
+
+
 # 1:1 binding - see https://stevenshave.github.io/pybindingcurve/simulate_1to1.html
 def system01_lagrange(p, l, kdpl):
-    def F(X):  # Augmented Lagrange function
-        response = (X[0] * X[1]) / kdpl
-        return (
-            response - X[2] * (p - (response + X[0])) - X[3] * (l - (response + X[1]))
-        )
-
-    dfdL = grad(F)  # Gradients of the Lagrange function
-    pf, lf, lam1, lam2 = fsolve(dfdL, [p, l, 1.0, 1.0])
+    # pl = pf*lf/kdpl
+    pf, lf, lam1, lam2 = solve_lagrange([1 / kdpl], [[1, 1]], (1 / kdpl, [1, 1]), [p, l])
     return {"pf": pf, "lf": lf, "pl": (pf * lf) / kdpl}
 
 
 # 1:1:1 competition - see https://stevenshave.github.io/pybindingcurve/simulate_competition.html
 def system02_lagrange(p, l, i, kdpl, kdpi):
-    def F(X):  # Augmented Lagrange function
-        response = (X[0] * X[1]) / kdpl
-        constraint1 = p - (response + X[0] + (X[0] * X[2] / kdpi))
-        constraint2 = l - (response + X[1])
-        constraint3 = i - (X[2] + (X[0] * X[2] / kdpi))
-        return response - X[3] * constraint1 - X[4] * constraint2 - X[5] * constraint3
-
-    dfdL = grad(F, 0)  # Gradients of the Lagrange function
-    pf, lf, inhf, lam1, lam2, lam3 = fsolve(dfdL, [p, l, i, 1.0, 1.0, 1.0])
+    # pl = pf*lf/kdpl, pi = pf*if/kdpi
+    pf, lf, inhf, lam1, lam2, lam3 = solve_lagrange(
+        [1 / kdpl, 1 / kdpi], [[1, 1, 0], [1, 0, 1]], (1 / kdpl, [1, 1, 0]), [p, l, i]
+    )
     return {"pf": pf, "lf": lf, "pl": (pf * lf) / kdpl}
 
 
 # Homodimer formation - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerformation.html
 def system03_lagrange(p, kdpp):
-    def F(X):  # Augmented Lagrange function
-        response = (X[0] * X[0]) / kdpp
-        constraint1 = p - (response * 2 + X[0])
-        return response - X[1] * constraint1
-
-    dfdL = grad(F, 0)  # Gradients of the Lagrange function
-    pf, lam1 = fsolve(dfdL, [p, 1.0])
+    # pp = pf*pf/kdpp
+    pf, lam1 = solve_lagrange([1 / kdpp], [[2]], (1 / kdpp, [2]), [p])
     return {"pf": pf, "pp": ((pf * pf) / kdpp)}
 
 
 # Homodimer breaking - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerbreaking.html
 def system04_lagrange(p, i, kdpp, kdpi):
-    def F(X):  # Augmented Lagrange function
-        pp = (X[0] * X[0]) / kdpp
-        pi = (X[0] * X[1]) / kdpi
-        constraint1 = p - (pp * 2 + pi + X[0])
-        constraint2 = i - (pi + X[1])
-        return pp - X[2] * constraint1 - X[3] * constraint2
-
-    dfdL = grad(F, 0)  # Gradients of the Lagrange function
-    pf, i_f, lam1, lam2 = fsolve(dfdL, [p, i, 1.0, 1.0])
+    # pp = pf*pf/kdpp, pi = pf*if/kdpi
+    pf, i_f, lam1, lam2 = solve_lagrange(
+        [1 / kdpp, 1 / kdpi], [[2, 0], [1, 1]], (1 / kdpp, [2, 0]), [p, i]
+    )
     return {"pf": pf, "if": i_f, "pp": ((pf * pf) / kdpp), "pi": (pf * i_f) / kdpi}
 
 
 # 1:2 binding
 def system12_lagrange(p, l, kdpl1, kdpl2):
-    def F(X):  # Augmented Lagrange function
-        pf = X[0]
-        lf = X[1]
-        pl1 = pf * lf / kdpl1
-        pl2 = pf * lf / kdpl2
-        pl12 = (pl1 * lf + pl2 * lf) / (kdpl1 + kdpl2)
-        constraint1 = p - (pf + pl1 + pl2 + pl12)
-        constraint2 = l - (lf + pl1 + pl2 + 2 * pl12)
-        return pl12 - X[2] * constraint1 - X[3] * constraint2
-
-    dfdL = grad(F, 0)  # Gradients of the Lagrange function
-
-    pf, lf, lam1, lam2 = fsolve(dfdL, [p, l] + [1.0] * 2)
+    # pl1 = pf*lf/kdpl1, pl2 = pf*lf/kdpl2, pl12 = (pl1*lf + pl2*lf)/(kdpl1 + kdpl2)
+    kpl12 = (1 / kdpl1 + 1 / kdpl2) / (kdpl1 + kdpl2)
+    pf, lf, lam1, lam2 = solve_lagrange(
+        [1 / kdpl1, 1 / kdpl2, kpl12], [[1, 1], [1, 1], [1, 2]], (kpl12, [1, 2]), [p, l]
+    )
     pl1 = pf * lf / kdpl1
     pl2 = pf * lf / kdpl2
     pl12 = (pl1 * lf + pl2 * lf) / (kdpl1 + kdpl2)
@@ -81,29 +57,18 @@ def system12_lagrange(p, l, kdpl1, kdpl2):
 
 # 1:3 binding
 def system13_lagrange(p, l, kdpl1, kdpl2, kdpl3):
-    def F(X):  # Augmented Lagrange function
-        pf = X[0]
-        lf = X[1]
-        pl1 = pf * lf / kdpl1
-        pl2 = pf * lf / kdpl2
-        pl3 = pf * lf / kdpl3
-        pl12 = (pl1 * lf + pl2 * lf) / (kdpl1 + kdpl2)
-        pl13 = (pl1 * lf + pl3 * lf) / (kdpl1 + kdpl3)
-        pl23 = (pl2 * lf + pl3 * lf) / (kdpl2 + kdpl3)
-        pl123 = (pl12 * lf + pl13 * lf + pl23 * lf) / (kdpl1 + kdpl2 + kdpl3)
-        constraint1 = p - (pf + pl1 + pl2 + pl3 + pl12 + pl13 + pl23 + pl123)
-        constraint2 = l - (
-            lf + pl1 + pl2 + pl3 + 2 * (pl12 + pl13 + pl23) + 3 * (pl123)
-        )
-        nonzero_constraint = (constraint1 - abs(constraint1)) - (
-            constraint2 - abs(constraint2)
-        )
-        return (
-            pl123 - X[2] * constraint1 - X[3] * constraint2 - X[4] * nonzero_constraint
-        )
-
-    dfdL = grad(F, 0)  # Gradients of the Lagrange function
-    pf, lf, lam1, lam2, lam3 = fsolve(dfdL, [p, l] + [1.0] * 3)
+    # As for 1:2 binding, with pl123 = (pl12*lf + pl13*lf + pl23*lf)/(kdpl1 + kdpl2 + kdpl3)
+    kpl12 = (1 / kdpl1 + 1 / kdpl2) / (kdpl1 + kdpl2)
+    kpl13 = (1 / kdpl1 + 1 / kdpl3) / (kdpl1 + kdpl3)
+    kpl23 = (1 / kdpl2 + 1 / kdpl3) / (kdpl2 + kdpl3)
+    kpl123 = (kpl12 + kpl13 + kpl23) / (kdpl1 + kdpl2 + kdpl3)
+    pf, lf, lam1, lam2, lam3 = solve_lagrange(
+        [1 / kdpl1, 1 / kdpl2, 1 / kdpl3, kpl12, kpl13, kpl23, kpl123],
+        [[1, 1]] * 3 + [[1, 2]] * 3 + [[1, 3]],
+        (kpl123, [1, 3]),
+        [p, l],
+        nonzero_constraint=True,
+    )
     pl1 = pf * lf / kdpl1
     pl2 = pf * lf / kdpl2
     pl3 = pf * lf / kdpl3
@@ -330,10 +295,15 @@ class System_lagrange_custom(BindingSystem):
     """
 
     def __init__(self, system_string):
+        self.system_string = system_string
         custom_system = LagrangeBindingSystemFactory(system_string)
         super().__init__(custom_system.binding_function)
         self.default_readout = custom_system.default_readout
 
+    def __reduce__(self):
+        # Generated functions are rebuilt from the system definition
+        return (self.__class__, (self.system_string,), self._picklable_state())
+
     def query(self, parameters: dict):
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
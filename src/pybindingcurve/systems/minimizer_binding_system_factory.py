@@ -1,7 +1,24 @@
 from inspect import signature
 import numpy as np
 from sys import version_info
+import hashlib
+import importlib.util
+import marshal
+import os
 from mpmath import mpf, mp, findroot, almosteq
+from .batched_newton import solve_mass_balances
+from .cache import user_cache_dir
+from .generated_systems import GeneratedSystemRegistry, load_generated_module
+
+# Names used by generated code, which is executed in its own module
+_generated_code_namespace = {
+	"mpf": mpf,
+	"mp": mp,
+	"findroot": findroot,
+	"almosteq": almosteq,
+	"np": np,
+	"solve_mass_balances": solve_mass_balances,
+}
 
 class MinimizerBindingSystemFactory:
 	"""
@@ -31,7 +48,7 @@ class MinimizerBindingSystemFactory:
 	Numbers like ### 1 ### denote sections which are described bellow and documented
 	in the code
 
-	def custom_minimizer_system(p,l,kd_p_p_pp,kd_p_l_pl,kd_pp_l_ppl1,kd_pp_l_ppl2,kd_ppl1_l_ppl1l2,kd_ppl2_l_ppl1l2): ### 1 ###
+	def custom_minimizer_system(p,l,kd_p_p_pp,kd_p_l_pl,kd_pp_l_ppl1,kd_pp_l_ppl2,kd_ppl1_l_ppl1l2,kd_ppl2_l_ppl1l2,initial_guess=None): ### 1 ###
 			p=mpf(p) ### 2 ###
 			l=mpf(l) ### 2 ###
 			kd_p_p_pp=mpf(kd_p_p_pp) ### 3 ###
@@ -47,7 +64,9 @@ class MinimizerBindingSystemFactory:
 					ppl2=pp*l_f/kd_pp_l_ppl2 ### 5 ###
 					ppl1l2=(ppl1*l_f+ppl2*l_f)/(kd_ppl1_l_ppl1l2+kd_ppl2_l_ppl1l2) ### 5 ###
 					return p0-(p+2*pp+2*ppl1+2*ppl2+pl+2*ppl1l2),l0-(l+ppl1+ppl2+pl+2*ppl1l2) ### 6 ###
-			p_f,l_f=findroot(f, [mpf(0), mpf(0)], tol=1e-10) ### 7 ###
+			if initial_guess is None: ### 7 ###
+					initial_guess=[mpf(0), mpf(0)] ### 7 ###
+			p_f,l_f=findroot(f, [mpf(x) for x in initial_guess], tol=1e-10) ### 7 ###
 			pp=p_f*p_f/kd_p_p_pp ### 5 ###
 			pl=p_f*l_f/kd_p_l_pl ### 5 ###
 			ppl1=pp*l_f/kd_pp_l_ppl1 ### 5 ###
@@ -56,7 +75,8 @@ class MinimizerBindingSystemFactory:
 			return {'p_f':p_f,'l_f':l_f,'pp':pp,'pl':pl,'ppl1':ppl1,'ppl2':ppl2,'ppl1l2':ppl1l2} ### 8 ###
 
 	Section ### 1 ### :	Define the custom minimizer function which takes arguments for fundamental species 
-						centration and KDs.
+						centration and KDs, and an optional initial guess of free fundamental species
+						concentrations.
 	Section ### 2 ### :	Cast input fundamental species to mpf arbitary precision datatypes.
 	Section ### 3 ### :	Cast input KDs to mpf arbitary precision datatypes.
 	Section ### 4 ### :	Define objective function for the minimiser.
@@ -66,10 +86,53 @@ class MinimizerBindingSystemFactory:
 						species monomers in each species to know what to multiply the concentration by.
 	Section ### 7 ### :	Run the mpmath find_root function on the newly defined objective function, minimising
 						the values in returned tuples. This reflects the fundamental species free concentration
-						at equilibrium.
+						at equilibrium. The search starts from initial_guess if given, otherwise from zero.
 	Section ### 8 ### :	Return the dictionary of results, containing concentrations for all species at
 						equilibrium.
-	
+
+	A second, vectorized function is also generated, taking the same arguments (without
+	initial_guess) as NumPy arrays which are broadcast against each other, and solving all
+	points at once in float64. For Example 1, it has the form:
+
+	def custom_minimizer_system_vectorized(p,l,i,kd_p_l_pl,kd_p_i_pi):
+		p,l,i,kd_p_l_pl,kd_p_i_pi=np.broadcast_arrays(*[np.asarray(a,dtype=float) for a in (p,l,i,kd_p_l_pl,kd_p_i_pi,)])
+		shape=p.shape
+		p,l,i,kd_p_l_pl,kd_p_i_pi=[a.ravel() for a in (p,l,i,kd_p_l_pl,kd_p_i_pi,)]
+		kd_p_l_pl=np.where(np.abs(kd_p_l_pl)<=1e-10,kd_p_l_pl+1e-10,kd_p_l_pl)
+		kd_p_i_pi=np.where(np.abs(kd_p_i_pi)<=1e-10,kd_p_i_pi+1e-10,kd_p_i_pi)
+		def f(x):
+			p_f,l_f,i_f=x.T
+			pl=p_f*l_f/kd_p_l_pl
+			pi=p_f*i_f/kd_p_i_pi
+			return np.stack((p-(p_f+pl+pi),l-(l_f+pl),i-(i_f+pi)),axis=-1)
+		def jacobian(x):
+			p_f,l_f,i_f=x.T
+			zero=np.zeros(x.shape[0])
+			pl=p_f*l_f/kd_p_l_pl
+			d_pl_d_p_f=(l_f)/(kd_p_l_pl)
+			d_pl_d_l_f=(p_f)/(kd_p_l_pl)
+			pi=p_f*i_f/kd_p_i_pi
+			d_pi_d_p_f=(i_f)/(kd_p_i_pi)
+			d_pi_d_i_f=(p_f)/(kd_p_i_pi)
+			return np.stack((np.stack((zero-(1+d_pl_d_p_f+d_pi_d_p_f),zero-(d_pl_d_l_f),zero-(d_pi_d_i_f),),axis=-1),...,),axis=-2)
+		x,converged=solve_mass_balances(f,jacobian,np.stack((p,l,i,),axis=-1))
+		p_f,l_f,i_f=x.T
+		pl=p_f*l_f/kd_p_l_pl
+		pi=p_f*i_f/kd_p_i_pi
+		return {'p_f':p_f.reshape(shape),'l_f':l_f.reshape(shape),'i_f':i_f.reshape(shape),'pl':pl.reshape(shape),'pi':pi.reshape(shape)},~converged.reshape(shape)
+
+	Jacobian entries are derivatives of the mass balances with respect to free fundamental
+	species concentrations, built up species by species using the product rule.
+
+	Finally, a function giving all species concentrations from free fundamental species
+	concentrations and KDs is generated, used along with the mass balances (the number of
+	each fundamental species in every species) to differentiate the readout with respect to
+	system parameters. For Example 1, it has the form:
+
+	def custom_minimizer_system_species(p_f,l_f,i_f,kd_p_l_pl,kd_p_i_pi):
+		pl=p_f*l_f/kd_p_l_pl
+		pi=p_f*i_f/kd_p_i_pi
+		return {'p_f':p_f,'l_f':l_f,'i_f':i_f,'pl':pl,'pi':pi}
 	"""
 
 	assert version_info >= (3, 7), "Requires Python version >=3.7 as dictionary insertion order need to be preserved"
@@ -82,6 +145,29 @@ class MinimizerBindingSystemFactory:
 	binding_function_string = None
 	binding_function=None
 	binding_function_arguments=None
+	vectorized_binding_function_string = None
+	vectorized_binding_function = None
+	species_function_string = None
+	species_function = None
+
+	# Number of each fundamental species in every species, indexed by
+	# fundamental species and then species
+	mass_balances = None
+
+	# Species in order of appearance, fundamental species first
+	all_species = None
+	fundamental_species = None
+
+	# Highest decimal precision used by mpmath when solving the system
+	dps = 100
+
+	# Generated code is held in a registry of loaded systems and, as compiled
+	# bytecode, on disk, keyed by the canonical system string,
+	# factory_version, dps and Python bytecode version. Increment
+	# factory_version whenever generated code changes, invalidating
+	# previously cached code.
+	factory_version = 3
+	registry = GeneratedSystemRegistry(maxsize=128)
 
 	def __init__(self, system_string:str, output_filename=None, dps:int=100):
 		"""Construct a minimiser-based custom binding system object
@@ -89,8 +175,78 @@ class MinimizerBindingSystemFactory:
 		Args:
 			system_string (str): Custom system definition string
 			output_filename ([str, Path], optional): Optional file to write generated function to. Defaults to None.
-			dps (int, optional): Decimal precision used for calculations performed by MPMath. Defaults to 100.
+			dps (int, optional): Highest decimal precision used for calculations performed by MPMath. Defaults to 100.
 		"""		
+		self.dps = dps
+		key = self.cache_key(system_string, dps)
+
+		# Look for the system in the registry, then on disk, and finally
+		# generate it.
+		cached = self.registry.get_or_create(key, lambda: self.load(key, system_string))
+
+		self.readout = cached["readout"]
+		self.all_species = list(cached["all_species"])
+		self.fundamental_species = list(cached["fundamental_species"])
+		self.binding_function_string = cached["binding_function_string"]
+		self.vectorized_binding_function_string = cached["vectorized_binding_function_string"]
+		self.binding_function = cached["binding_function"]
+		self.vectorized_binding_function = cached["vectorized_binding_function"]
+		self.species_function_string = cached["species_function_string"]
+		self.species_function = cached["species_function"]
+		self.mass_balances = dict((fs, dict(counts)) for fs, counts in cached["mass_balances"].items())
+		self.binding_function_arguments = list(signature(self.binding_function).parameters.keys())
+
+		# If requested, write the functions to a file
+		if output_filename is not None:
+			out_file = open(output_filename, "w")
+			out_file.write(f"from mpmath import mpf, findroot, mp, almosteq\nmp.dps={dps}\n")
+			out_file.write("import numpy as np\nfrom pybindingcurve.systems.batched_newton import solve_mass_balances\n\n")
+			out_file.write(self.binding_function_string)
+			out_file.write("\n")
+			out_file.write(self.vectorized_binding_function_string)
+			out_file.write("\n")
+			out_file.write(self.species_function_string)
+			out_file.close()
+
+	def load(self, key: str, system_string: str):
+		"""Load a system into its own module, from the on-disk cache or by generating it
+
+		Args:
+			key (str): Cache key from cache_key
+			system_string (str): Custom system definition string
+
+		Returns:
+			dict: Generated code as returned by generate, along with compiled code objects, the module and the functions it defines
+		"""
+		generated = self.read_disk_cache(key)
+		if generated is None:
+			generated = self.generate(system_string)
+			generated["binding_function_code"] = compile(generated["binding_function_string"], "<custom_minimizer_system>", "exec")
+			generated["vectorized_binding_function_code"] = compile(generated["vectorized_binding_function_string"], "<custom_minimizer_system_vectorized>", "exec")
+			generated["species_function_code"] = compile(generated["species_function_string"], "<custom_minimizer_system_species>", "exec")
+			self.write_disk_cache(key, generated)
+		loaded = dict(generated)
+		loaded["module"] = load_generated_module(
+			f"pybindingcurve.generated.minimizer_{key[:16]}",
+			generated["binding_function_code"],
+			generated["vectorized_binding_function_code"],
+			generated["species_function_code"],
+			namespace=_generated_code_namespace,
+		)
+		loaded["binding_function"] = loaded["module"].custom_minimizer_system
+		loaded["vectorized_binding_function"] = loaded["module"].custom_minimizer_system_vectorized
+		loaded["species_function"] = loaded["module"].custom_minimizer_system_species
+		return loaded
+
+	def generate(self, system_string: str):
+		"""Parse a system definition and generate function strings
+
+		Args:
+			system_string (str): Custom system definition string
+
+		Returns:
+			dict: Readout, all_species, fundamental_species, mass_balances, binding_function_string, vectorized_binding_function_string and species_function_string
+		"""
 		# Get the reaction dictionary, which takes the form:
 		# reaction_dictionary[product]=[[reactant1, reactant2]]
 		# list may contain multiple approaches to make product.
@@ -119,19 +275,79 @@ class MinimizerBindingSystemFactory:
 		# product for writing out.
 		simplified_reaction_dict = self.get_simplified_reaction_dict(reaction_dict, species, fundamental_species)
 
-		# Generate the function string and store in self.custom_func_string
-		self.binding_function_string = self.gen_custom_func(species,fundamental_species,kds,simplified_reaction_dict,species_composed_of_matrix)
+		# Generate the function strings
+		return {
+			"readout": self.readout,
+			"all_species": list(species.keys()),
+			"fundamental_species": list(fundamental_species.keys()),
+			"binding_function_string": self.gen_custom_func(species,fundamental_species,kds,simplified_reaction_dict,species_composed_of_matrix),
+			"vectorized_binding_function_string": self.gen_custom_vectorized_func(species,fundamental_species,kds,reaction_dict,simplified_reaction_dict,species_composed_of_matrix),
+			"species_function_string": self.gen_custom_species_func(fundamental_species,kds,simplified_reaction_dict),
+			"mass_balances": self.get_mass_balances(species,fundamental_species,species_composed_of_matrix),
+		}
 
-		# If requested, write the function to a file
-		if output_filename is not None:
-			out_file = open(output_filename, "w")
-			out_file.write("from mpmath import mpf, findroot, mp, almosteq\nmp.dps=100\n\n")
-			out_file.write(self.binding_function_string)
-			out_file.close()
-		
-		exec(self.binding_function_string, globals())
-		self.binding_function = eval("custom_minimizer_system")
-		self.binding_function_arguments = list(signature(self.binding_function).parameters.keys())
+	def canonicalize_system_string(self, system_string: str):
+		"""Canonical form of a system definition, ignoring case, whitespace and blank lines
+
+		Args:
+			system_string (str): Custom system definition string
+
+		Returns:
+			str: Reaction definitions, one per line
+		"""
+		return "\n".join(self.get_definition_lines(system_string))
+
+	def cache_key(self, system_string: str, dps: int):
+		"""Key under which generated code is cached
+
+		Args:
+			system_string (str): Custom system definition string
+			dps (int): Highest decimal precision used by MPMath
+
+		Returns:
+			str: Hex digest identifying the system, factory version, dps and Python bytecode version
+		"""
+		text = f"{self.factory_version}\n{dps}\n{importlib.util.MAGIC_NUMBER.hex()}\n{self.canonicalize_system_string(system_string)}"
+		return hashlib.sha256(text.encode()).hexdigest()
+
+	def read_disk_cache(self, key: str):
+		"""Read generated code from the on-disk cache
+
+		Args:
+			key (str): Cache key from cache_key
+
+		Returns:
+			dict or None: Generated code as returned by generate, along with compiled code objects, or None if not cached
+		"""
+		directory = user_cache_dir("minimizer_systems")
+		if directory is None:
+			return None
+		try:
+			with open(directory / f"{key}.marshal", "rb") as cache_file:
+				return marshal.load(cache_file)
+		except (OSError, ValueError, EOFError, TypeError):
+			return None
+
+	def write_disk_cache(self, key: str, generated: dict):
+		"""Write generated code to the on-disk cache
+
+		Files are written under a temporary name and then renamed, so that
+		processes sharing the cache never read partially written files.
+
+		Args:
+			key (str): Cache key from cache_key
+			generated (dict): Generated code as returned by generate, along with compiled code objects
+		"""
+		directory = user_cache_dir("minimizer_systems")
+		if directory is None:
+			return
+		temporary_path = directory / f"{key}.{os.getpid()}.tmp"
+		try:
+			with open(temporary_path, "wb") as cache_file:
+				marshal.dump(generated, cache_file)
+			os.replace(temporary_path, directory / f"{key}.marshal")
+		except OSError:
+			pass
 
 
 	def get_simplified_reaction_dict(self, reaction_dict, species, fundamental_species):
@@ -200,7 +416,7 @@ class MinimizerBindingSystemFactory:
 			+ ",".join(f for f in fundamental_species)
 			+ ","
 			+ ",".join(kd for kd in kds)
-			+ "):\n"
+			+ ",initial_guess=None):\n"
 		)
 		
 		# Section ### 2 ### : Cast input fundamental species to mpf arbitary
@@ -251,12 +467,16 @@ class MinimizerBindingSystemFactory:
 		# defined objective function, minimising the values in returned
 		# tuples. This reflects the fundamental species free concentration
 		# at equilibrium.
+		text += (
+			"\tif initial_guess is None:\n"
+			+ "\t\tinitial_guess=["
+			+ ", ".join(f"mpf(0)" for fs in fundamental_species)
+			+ "]\n"
+		)
 		text += (
 			"\t"
 			+ ",".join(f"{fs}_f" for fs in fundamental_species)
-			+ "=findroot(f, ["
-			+ ", ".join(f"mpf(0)" for fs in fundamental_species)
-			+ "], tol=1e-10, maxsteps=1e6)\n"
+			+ "=findroot(f, [mpf(x) for x in initial_guess], tol=1e-10, maxsteps=1e6)\n"
 		)
 		
 		# Section ### 5 ### REPEATED: Calculate species concentrations from
@@ -276,6 +496,143 @@ class MinimizerBindingSystemFactory:
 		
 		return text
 
+	def gen_custom_vectorized_func(self, species: dict, fundamental_species: dict, kds: dict, reaction_dict: dict, simplified_reaction_dict: dict, species_composed_of_matrix: np.array):
+		"""Generate custom vectorized function text
+
+		Args:
+			species (dict): All species in system
+			fundamental_species (dict): Fundamental species in system
+			kds (dict): Unique KDs in order of appearance in the system.
+			reaction_dict (dict): Reaction dictionary derived from custom binding system string
+			simplified_reaction_dict (dict): Simplified/unified reaction dictionary
+			species_composed_of_matrix (np.array): Numpy int array of monomer counts for all species with shape (len(fundamental_species), len(species))
+
+		Returns:
+			str: String representing the custom binding system, solved for arrays of points in float64 using solve_mass_balances
+
+		The docstring for the MinimizerBindingSystemFactory class outlines the target function text which this function generates.
+		"""
+		arguments = ",".join(list(fundamental_species) + list(kds))
+		free = ",".join(f"{fs}_f" for fs in fundamental_species) + ("," if len(fundamental_species) == 1 else "")
+		species_names = list(species.keys())
+
+		# Broadcast and flatten arguments, nudging KDs of zero as in the mpmath function
+		text = f"def custom_minimizer_system_vectorized({arguments}):\n"
+		text += f"\t{arguments}=np.broadcast_arrays(*[np.asarray(a,dtype=float) for a in ({arguments},)])\n"
+		text += f"\tshape={list(fundamental_species)[0]}.shape\n"
+		text += f"\t{arguments}=[a.ravel() for a in ({arguments},)]\n"
+		for kd in kds:
+			text += f"\t{kd}=np.where(np.abs({kd})<=1e-10,{kd}+1e-10,{kd})\n"
+
+		# Residuals of the mass balances, as in the mpmath objective function
+		balances = []
+		for fsi, fs in enumerate(fundamental_species):
+			terms = []
+			for si, count in enumerate(species_composed_of_matrix[:, fsi]):
+				if count == 0:
+					continue
+				name = species_names[si] + ("_f" if species_names[si] in fundamental_species else "")
+				terms.append(name if count == 1 else f"{count}*{name}")
+			balances.append(f"{fs}-({'+'.join(terms)})")
+		text += "\tdef f(x):\n"
+		text += f"\t\t{free}=x.T\n"
+		for product, reaction in simplified_reaction_dict.items():
+			text += f"\t\t{product}={reaction}\n"
+		text += f"\t\treturn np.stack(({','.join(balances)}),axis=-1)\n"
+
+		# Derivatives of each species with respect to each free fundamental
+		# species, by the product rule. derivatives[(s, fs)] holds the name
+		# of the variable containing the derivative, 1, or None for zero.
+		derivatives = {}
+		for fs in fundamental_species:
+			for other in fundamental_species:
+				derivatives[(fs, other)] = 1 if fs == other else None
+		text += "\tdef jacobian(x):\n"
+		text += f"\t\t{free}=x.T\n"
+		text += "\t\tzero=np.zeros(x.shape[0])\n"
+		for product, reaction in simplified_reaction_dict.items():
+			text += f"\t\t{product}={reaction}\n"
+			denominator = "+".join(self.kd_from_reaction_tuple(r, product) for r in reaction_dict[product])
+			for fs in fundamental_species:
+				terms = []
+				for r1, r2 in reaction_dict[product]:
+					for dr, other in ((r1, r2), (r2, r1)):
+						other_name = f"{other}_f" if other in fundamental_species else other
+						derivative = derivatives[(dr, fs)]
+						if derivative == 1:
+							terms.append(other_name)
+						elif derivative is not None:
+							terms.append(f"{derivative}*{other_name}")
+				if len(terms) == 0:
+					derivatives[(product, fs)] = None
+				else:
+					derivatives[(product, fs)] = f"d_{product}_d_{fs}_f"
+					text += f"\t\td_{product}_d_{fs}_f=({'+'.join(terms)})/({denominator})\n"
+		rows = []
+		for fsi, fs in enumerate(fundamental_species):
+			row = []
+			for wrt in fundamental_species:
+				terms = []
+				for si, count in enumerate(species_composed_of_matrix[:, fsi]):
+					derivative = derivatives[(species_names[si], wrt)]
+					if count == 0 or derivative is None:
+						continue
+					derivative = str(derivative)
+					terms.append(derivative if count == 1 else f"{count}*{derivative}")
+				row.append(f"zero-({'+'.join(terms)})" if len(terms) > 0 else "zero")
+			rows.append(f"np.stack(({','.join(row)},),axis=-1)")
+		text += f"\t\treturn np.stack(({','.join(rows)},),axis=-2)\n"
+
+		# Solve, and return all species as for the mpmath function, along with the imprecise mask
+		text += f"\tx,converged=solve_mass_balances(f,jacobian,np.stack(({','.join(fundamental_species)},),axis=-1))\n"
+		text += f"\t{free}=x.T\n"
+		for product, reaction in simplified_reaction_dict.items():
+			text += f"\t{product}={reaction}\n"
+		text += "\treturn {"
+		text += ",".join(
+			[f"'{fs}_f':{fs}_f.reshape(shape)" for fs in fundamental_species]
+			+ [f"'{product}':{product}.reshape(shape)" for product in simplified_reaction_dict]
+		)
+		text += "},~converged.reshape(shape)\n"
+		return text
+
+	def gen_custom_species_func(self, fundamental_species: dict, kds: dict, simplified_reaction_dict: dict):
+		"""Generate custom species function text
+
+		Args:
+			fundamental_species (dict): Fundamental species in system
+			kds (dict): Unique KDs in order of appearance in the system.
+			simplified_reaction_dict (dict): Simplified/unified reaction dictionary
+
+		Returns:
+			str: String representing a function returning all species concentrations from free fundamental species concentrations and KDs
+		"""
+		free = [f"{fs}_f" for fs in fundamental_species]
+		text = f"def custom_minimizer_system_species({','.join(free + list(kds))}):\n"
+		for product, reaction in simplified_reaction_dict.items():
+			text += f"\t{product}={reaction}\n"
+		text += "\treturn {"
+		text += ",".join([f"'{name}':{name}" for name in free + list(simplified_reaction_dict)])
+		text += "}\n"
+		return text
+
+	def get_mass_balances(self, species: dict, fundamental_species: dict, species_composed_of_matrix: np.array):
+		"""Get the number of each fundamental species in every species
+
+		Args:
+			species (dict): All species in system
+			fundamental_species (dict): Fundamental species in system
+			species_composed_of_matrix (np.array): Numpy int array of monomer counts for all species
+
+		Returns:
+			dict: Dicts of counts indexed by species name (free fundamental species with the suffix _f), indexed by fundamental species
+		"""
+		species_names = [s + ("_f" if s in fundamental_species else "") for s in species]
+		return dict(
+			(fs, dict((name, int(count)) for name, count in zip(species_names, species_composed_of_matrix[:, fsi]) if count != 0))
+			for fsi, fs in enumerate(fundamental_species)
+		)
+
 	def get_kds(self, reaction_dictionary: dict):
 		"""Get KDs dictionary from reaction_dictionary
 
@@ -303,6 +660,18 @@ class MinimizerBindingSystemFactory:
 		"""		
 		return f"kd_{reaction_tuple[0]}_{reaction_tuple[1]}_{product}"
 
+	def get_definition_lines(self, system_string: str):
+		"""Split a system definition into lower case reaction definitions
+
+		Args:
+				system_string (str): Custom system definition
+		Returns:
+				list: Reaction definition strings, split on new lines and commas,
+					with all whitespace removed
+		"""
+		reactions = ["".join(c.split()) for nl in system_string.lower().split("\n") for c in nl.split(",")]
+		return [r for r in reactions if len(r)>=7]
+
 	def parse_system_definition_string(self, system_string: str):
 		"""Parse system definition, generate reaction_dict
 
@@ -313,9 +682,7 @@ class MinimizerBindingSystemFactory:
 		"""
 		reaction_dict = {}
 
-		lines = [
-			l for l in [c.strip() for nl in system_string.lower().split("\n") for c in nl.split(",") if len(c.strip())>=7]
-		]
+		lines = self.get_definition_lines(system_string)
 		assert len(lines) > 0, "No system defined"
 
 		# Loop over lines parsing reactions, setting readout, and generating reaction_dict
@@ -2,13 +2,46 @@ import numpy as np
 from .binding_system import BindingSystem
 from mpmath import mpf, findroot, mp, almosteq
 from .minimizer_binding_system_factory import MinimizerBindingSystemFactory
+from .batched_newton import solve_mass_balances
 
 mpf_zero=mpf(0)
 mpf_tol=mpf("1e-10")
 max_iters=1e6
 
+# Points which cannot be solved in float64 are solved by findroot at these
+# increasing precisions, see BindingSystem._solve_escalating
+escalation_dps = (30, 100)
+
+def _starting_point(initial_guess, num_free_species):
+    # Start findroot from a supplied guess of free concentrations (used for
+    # continuation along a titration), or from zero.
+    if initial_guess is None:
+        return [mpf_zero] * num_free_species
+    return [mpf(x) for x in initial_guess]
+
+def _broadcast_flat(*args):
+    # Broadcast arguments of vectorized systems, returning their common shape
+    # and flattened float64 arrays
+    arrays = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+    return arrays[0].shape, [a.ravel() for a in arrays]
+
+def _nudge_kd(kd):
+    # Float64 equivalent of nudging KDs almost equal to zero by mpf_tol
+    return np.where(np.abs(kd) <= 1e-10, kd + 1e-10, kd)
+
+def _stack_jacobian(rows):
+    # Stack nested lists of per-point derivatives into (n_points, n, n)
+    return np.stack([np.stack(np.broadcast_arrays(*row), axis=-1) for row in rows], axis=-2)
+
+def _vectorized_results(shape, converged, **species):
+    # Shape species concentrations and the imprecise mask as the inputs
+    return (
+        {name: concentration.reshape(shape) for name, concentration in species.items()},
+        ~converged.reshape(shape),
+    )
+
 # 1:1 binding - see https://stevenshave.github.io/pybindingcurve/simulate_1to1.html
-def system01_minimizer(p, l, kdpl):
+def system01_minimizer(p, l, kdpl, initial_guess=None):
     p = mpf(p)
     l = mpf(l)
     kdpl = mpf(kdpl)
@@ -17,12 +50,33 @@ def system01_minimizer(p, l, kdpl):
     def f(p_f, l_f):
         pl = p_f * l_f / kdpl
         return p - (p_f + pl), l - (l_f + pl)
-    p_f, l_f = findroot(f, [mpf_zero, mpf_zero], tol=mpf_tol, maxsteps=1e6)
+    p_f, l_f = findroot(f, _starting_point(initial_guess, 2), tol=mpf_tol, maxsteps=1e6)
     return {"pf": p_f, "lf": l_f, "pl": (p_f * l_f) / kdpl}
 
+def system01_species(p_f, l_f, kdpl):
+    return {"pf": p_f, "lf": l_f, "pl": p_f * l_f / kdpl}
+
+system01_mass_balances = {"p": {"pf": 1, "pl": 1}, "l": {"lf": 1, "pl": 1}}
+
+def system01_minimizer_vectorized(p, l, kdpl):
+    shape, (p, l, kdpl) = _broadcast_flat(p, l, kdpl)
+    kdpl = _nudge_kd(kdpl)
+    def f(x):
+        p_f, l_f = x.T
+        pl = p_f * l_f / kdpl
+        return np.stack((p - (p_f + pl), l - (l_f + pl)), axis=-1)
+    def jacobian(x):
+        p_f, l_f = x.T
+        return _stack_jacobian(
+            [[-1 - l_f / kdpl, -p_f / kdpl], [-l_f / kdpl, -1 - p_f / kdpl]]
+        )
+    x, converged = solve_mass_balances(f, jacobian, np.stack((p, l), axis=-1))
+    p_f, l_f = x.T
+    return _vectorized_results(shape, converged, **system01_species(p_f, l_f, kdpl))
+
 
 # 1:1:1 competition - see https://stevenshave.github.io/pybindingcurve/simulate_competition.html
-def system02_minimizer(p, l, i, kdpl, kdpi):
+def system02_minimizer(p, l, i, kdpl, kdpi, initial_guess=None):
     kdpl = mpf(kdpl)
     kdpi = mpf(kdpi)
     if almosteq(kdpl, mpf_zero, mpf_tol):
@@ -36,7 +90,7 @@ def system02_minimizer(p, l, i, kdpl, kdpi):
         pl = p_f * l_f / kdpl
         pi = p_f * i_f / kdpi
         return p - (p_f + pl + pi), l - (l_f + pl), i - (i_f + pi)
-    p_f, l_f, i_f = findroot(f, [mpf_zero, mpf_zero, mpf_zero], tol=mpf_tol, maxsteps=1e6)
+    p_f, l_f, i_f = findroot(f, _starting_point(initial_guess, 3), tol=mpf_tol, maxsteps=1e6)
     return {
         "pf": p_f,
         "lf": l_f,
@@ -45,9 +99,40 @@ def system02_minimizer(p, l, i, kdpl, kdpi):
         "pi": (p_f * i_f) / kdpi,
     }
 
+def system02_species(p_f, l_f, i_f, kdpl, kdpi):
+    return {"pf": p_f, "lf": l_f, "if": i_f, "pl": p_f * l_f / kdpl, "pi": p_f * i_f / kdpi}
+
+system02_mass_balances = {
+    "p": {"pf": 1, "pl": 1, "pi": 1},
+    "l": {"lf": 1, "pl": 1},
+    "i": {"if": 1, "pi": 1},
+}
+
+def system02_minimizer_vectorized(p, l, i, kdpl, kdpi):
+    shape, (p, l, i, kdpl, kdpi) = _broadcast_flat(p, l, i, kdpl, kdpi)
+    kdpl = _nudge_kd(kdpl)
+    kdpi = _nudge_kd(kdpi)
+    def f(x):
+        p_f, l_f, i_f = x.T
+        pl = p_f * l_f / kdpl
+        pi = p_f * i_f / kdpi
+        return np.stack((p - (p_f + pl + pi), l - (l_f + pl), i - (i_f + pi)), axis=-1)
+    def jacobian(x):
+        p_f, l_f, i_f = x.T
+        return _stack_jacobian(
+            [
+                [-1 - l_f / kdpl - i_f / kdpi, -p_f / kdpl, -p_f / kdpi],
+                [-l_f / kdpl, -1 - p_f / kdpl, 0.0],
+                [-i_f / kdpi, 0.0, -1 - p_f / kdpi],
+            ]
+        )
+    x, converged = solve_mass_balances(f, jacobian, np.stack((p, l, i), axis=-1))
+    p_f, l_f, i_f = x.T
+    return _vectorized_results(shape, converged, **system02_species(p_f, l_f, i_f, kdpl, kdpi))
+
 
 # Homodimer formation - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerformation.html
-def system03_minimizer(p, kdpp):
+def system03_minimizer(p, kdpp, initial_guess=None):
     p = mpf(p)
     kdpp = mpf(kdpp)
     if almosteq(kdpp, mpf_zero, mpf_tol):
@@ -55,12 +140,30 @@ def system03_minimizer(p, kdpp):
     def f(p_f):
         pp = p_f * p_f / kdpp
         return p - (p_f + 2 * pp)
-    p_f = findroot(f, [mpf_zero], tol=mpf_tol, maxsteps=1e6)
+    p_f = findroot(f, _starting_point(initial_guess, 1), tol=mpf_tol, maxsteps=1e6)
     return {"pf": p_f, "pp": (p_f * p_f) / kdpp}
 
+def system03_species(p_f, kdpp):
+    return {"pf": p_f, "pp": p_f * p_f / kdpp}
+
+system03_mass_balances = {"p": {"pf": 1, "pp": 2}}
+
+def system03_minimizer_vectorized(p, kdpp):
+    shape, (p, kdpp) = _broadcast_flat(p, kdpp)
+    kdpp = _nudge_kd(kdpp)
+    def f(x):
+        p_f = x[:, 0]
+        return (p - (p_f + 2 * p_f * p_f / kdpp))[:, np.newaxis]
+    def jacobian(x):
+        p_f = x[:, 0]
+        return _stack_jacobian([[-1 - 4 * p_f / kdpp]])
+    x, converged = solve_mass_balances(f, jacobian, p[:, np.newaxis])
+    p_f = x[:, 0]
+    return _vectorized_results(shape, converged, **system03_species(p_f, kdpp))
+
 
 # Homodimer breaking - see https://stevenshave.github.io/pybindingcurve/simulate_homodimerbreaking.html
-def system04_minimizer(p, i, kdpp, kdpi):
+def system04_minimizer(p, i, kdpp, kdpi, initial_guess=None):
     p = mpf(p)
     i = mpf(i)
     kdpp = mpf(kdpp)
@@ -73,12 +176,38 @@ def system04_minimizer(p, i, kdpp, kdpi):
         pp = p_f * p_f / kdpp
         pi = p_f * i_f / kdpi
         return p - (p_f + pi + 2 * pp), i - (i_f + pi)
-    p_f, i_f = findroot(f, (mpf_zero,mpf_zero), tol=mpf_tol, maxsteps=1e6)
+    p_f, i_f = findroot(f, _starting_point(initial_guess, 2), tol=mpf_tol, maxsteps=1e6)
     return {"pf": p_f, "if": i_f, "pp": (p_f * p_f) / kdpp, "pi": (p_f * i_f) / kdpi}
 
+def system04_species(p_f, i_f, kdpp, kdpi):
+    return {"pf": p_f, "if": i_f, "pp": p_f * p_f / kdpp, "pi": p_f * i_f / kdpi}
+
+system04_mass_balances = {"p": {"pf": 1, "pp": 2, "pi": 1}, "i": {"if": 1, "pi": 1}}
+
+def system04_minimizer_vectorized(p, i, kdpp, kdpi):
+    shape, (p, i, kdpp, kdpi) = _broadcast_flat(p, i, kdpp, kdpi)
+    kdpp = _nudge_kd(kdpp)
+    kdpi = _nudge_kd(kdpi)
+    def f(x):
+        p_f, i_f = x.T
+        pp = p_f * p_f / kdpp
+        pi = p_f * i_f / kdpi
+        return np.stack((p - (p_f + pi + 2 * pp), i - (i_f + pi)), axis=-1)
+    def jacobian(x):
+        p_f, i_f = x.T
+        return _stack_jacobian(
+            [
+                [-1 - i_f / kdpi - 4 * p_f / kdpp, -p_f / kdpi],
+                [-i_f / kdpi, -1 - p_f / kdpi],
+            ]
+        )
+    x, converged = solve_mass_balances(f, jacobian, np.stack((p, i), axis=-1))
+    p_f, i_f = x.T
+    return _vectorized_results(shape, converged, **system04_species(p_f, i_f, kdpp, kdpi))
+
 
 # 1:2 binding
-def system12_minimizer(p, l, kdpl1, kdpl2):
+def system12_minimizer(p, l, kdpl1, kdpl2, initial_guess=None):
     p = mpf(p)
     l = mpf(l)
     kdpl1 = mpf(kdpl1)
@@ -92,7 +221,7 @@ def system12_minimizer(p, l, kdpl1, kdpl2):
         pl2 = p_f * l_f / kdpl2
         pl12 = (pl1 * l_f + pl2 * l_f) / (kdpl1 + kdpl2)
         return p - (p_f + pl1 + pl2 + pl12), l - (l_f + pl1 + pl2 + 2 * pl12)
-    p_f, l_f = findroot(f, [mpf_zero, mpf_zero], tol=mpf_tol, maxsteps=1e6)
+    p_f, l_f = findroot(f, _starting_point(initial_guess, 2), tol=mpf_tol, maxsteps=1e6)
     pl1 = (p_f * l_f) / kdpl1
     pl2 = (p_f * l_f) / kdpl2
     return {
@@ -103,9 +232,51 @@ def system12_minimizer(p, l, kdpl1, kdpl2):
         "pl12": (pl1 * l_f + pl2 * l_f) / (kdpl1 + kdpl2),
     }
 
+def system12_species(p_f, l_f, kdpl1, kdpl2):
+    pl1 = p_f * l_f / kdpl1
+    pl2 = p_f * l_f / kdpl2
+    return {
+        "pf": p_f,
+        "lf": l_f,
+        "pl1": pl1,
+        "pl2": pl2,
+        "pl12": (pl1 * l_f + pl2 * l_f) / (kdpl1 + kdpl2),
+    }
+
+system12_mass_balances = {
+    "p": {"pf": 1, "pl1": 1, "pl2": 1, "pl12": 1},
+    "l": {"lf": 1, "pl1": 1, "pl2": 1, "pl12": 2},
+}
+
+def system12_minimizer_vectorized(p, l, kdpl1, kdpl2):
+    shape, (p, l, kdpl1, kdpl2) = _broadcast_flat(p, l, kdpl1, kdpl2)
+    kdpl1 = _nudge_kd(kdpl1)
+    kdpl2 = _nudge_kd(kdpl2)
+    # pl1 + pl2 = a*p_f*l_f and pl12 = b*p_f*l_f**2
+    a = 1 / kdpl1 + 1 / kdpl2
+    b = a / (kdpl1 + kdpl2)
+    def f(x):
+        p_f, l_f = x.T
+        single = a * p_f * l_f
+        double = b * p_f * l_f * l_f
+        return np.stack(
+            (p - (p_f + single + double), l - (l_f + single + 2 * double)), axis=-1
+        )
+    def jacobian(x):
+        p_f, l_f = x.T
+        return _stack_jacobian(
+            [
+                [-1 - a * l_f - b * l_f * l_f, -p_f * (a + 2 * b * l_f)],
+                [-a * l_f - 2 * b * l_f * l_f, -1 - p_f * (a + 4 * b * l_f)],
+            ]
+        )
+    x, converged = solve_mass_balances(f, jacobian, np.stack((p, l), axis=-1))
+    p_f, l_f = x.T
+    return _vectorized_results(shape, converged, **system12_species(p_f, l_f, kdpl1, kdpl2))
+
 
 # 1:3 binding
-def system13_minimizer(p, l, kdpl1, kdpl2, kdpl3):
+def system13_minimizer(p, l, kdpl1, kdpl2, kdpl3, initial_guess=None):
     p = mpf(p)
     l = mpf(l)
     kdpl1 = mpf(kdpl1)
@@ -125,10 +296,29 @@ def system13_minimizer(p, l, kdpl1, kdpl2, kdpl3):
         pl23 = (pl2 * l_f + pl3 * l_f) / (kdpl2 + kdpl3)
         pl13 = (pl1 * l_f + pl3 * l_f) / (kdpl1 + kdpl3)
         pl123 = (pl12 * l_f + pl23 * l_f + pl13 * l_f) / (kdpl1 + kdpl2 + kdpl3)
-        return p - (p_f + pl1 + pl2 + pl3 + pl12 + pl13 + pl23), l - (
+        return p - (p_f + pl1 + pl2 + pl3 + pl12 + pl13 + pl23 + pl123), l - (
             l_f + pl1 + pl2 + pl3 + 2 * (pl12 + pl13 + pl23) + 3 * pl123
         )
-    p_f, l_f = findroot(f, [mpf_zero, mpf_zero], tol=mpf_tol, maxsteps=1e6)
+    p_f, l_f = findroot(f, _starting_point(initial_guess, 2), tol=mpf_tol, maxsteps=1e6)
+    pl1 = p_f * l_f / kdpl1
+    pl2 = p_f * l_f / kdpl2
+    pl3 = p_f * l_f / kdpl3
+    pl12 = (pl1 * l_f + pl2 * l_f) / (kdpl1 + kdpl2)
+    pl23 = (pl2 * l_f + pl3 * l_f) / (kdpl2 + kdpl3)
+    pl13 = (pl1 * l_f + pl3 * l_f) / (kdpl1 + kdpl3)
+    return {
+        "pf": p_f,
+        "lf": l_f,
+        "pl1": pl1,
+        "pl2": pl2,
+        "pl3": pl3,
+        "pl12": pl12,
+        "pl13": pl13,
+        "pl23": pl23,
+        "pl123": (pl12 * l_f + pl23 * l_f + pl13 * l_f) / (kdpl1 + kdpl2 + kdpl3),
+    }
+
+def system13_species(p_f, l_f, kdpl1, kdpl2, kdpl3):
     pl1 = p_f * l_f / kdpl1
     pl2 = p_f * l_f / kdpl2
     pl3 = p_f * l_f / kdpl3
@@ -147,6 +337,55 @@ def system13_minimizer(p, l, kdpl1, kdpl2, kdpl3):
         "pl123": (pl12 * l_f + pl23 * l_f + pl13 * l_f) / (kdpl1 + kdpl2 + kdpl3),
     }
 
+system13_mass_balances = {
+    "p": {"pf": 1, "pl1": 1, "pl2": 1, "pl3": 1, "pl12": 1, "pl13": 1, "pl23": 1, "pl123": 1},
+    "l": {"lf": 1, "pl1": 1, "pl2": 1, "pl3": 1, "pl12": 2, "pl13": 2, "pl23": 2, "pl123": 3},
+}
+
+def system13_minimizer_vectorized(p, l, kdpl1, kdpl2, kdpl3):
+    shape, (p, l, kdpl1, kdpl2, kdpl3) = _broadcast_flat(p, l, kdpl1, kdpl2, kdpl3)
+    kdpl1 = _nudge_kd(kdpl1)
+    kdpl2 = _nudge_kd(kdpl2)
+    kdpl3 = _nudge_kd(kdpl3)
+    # Species with n ligands bound sum to a*p_f*l_f, b*p_f*l_f**2 and
+    # c*p_f*l_f**3 for n = 1, 2 and 3
+    a = 1 / kdpl1 + 1 / kdpl2 + 1 / kdpl3
+    b = (
+        (1 / kdpl1 + 1 / kdpl2) / (kdpl1 + kdpl2)
+        + (1 / kdpl2 + 1 / kdpl3) / (kdpl2 + kdpl3)
+        + (1 / kdpl1 + 1 / kdpl3) / (kdpl1 + kdpl3)
+    )
+    c = b / (kdpl1 + kdpl2 + kdpl3)
+    def f(x):
+        p_f, l_f = x.T
+        single = a * p_f * l_f
+        double = b * p_f * l_f ** 2
+        triple = c * p_f * l_f ** 3
+        return np.stack(
+            (
+                p - (p_f + single + double + triple),
+                l - (l_f + single + 2 * double + 3 * triple),
+            ),
+            axis=-1,
+        )
+    def jacobian(x):
+        p_f, l_f = x.T
+        return _stack_jacobian(
+            [
+                [
+                    -1 - a * l_f - b * l_f ** 2 - c * l_f ** 3,
+                    -p_f * (a + 2 * b * l_f + 3 * c * l_f ** 2),
+                ],
+                [
+                    -a * l_f - 2 * b * l_f ** 2 - 3 * c * l_f ** 3,
+                    -1 - p_f * (a + 4 * b * l_f + 9 * c * l_f ** 2),
+                ],
+            ]
+        )
+    x, converged = solve_mass_balances(f, jacobian, np.stack((p, l), axis=-1))
+    p_f, l_f = x.T
+    return _vectorized_results(shape, converged, **system13_species(p_f, l_f, kdpl1, kdpl2, kdpl3))
+
 class System_minimizer_one_to_one__pl(BindingSystem):
     """
     Minimizer-based one to one binding
@@ -156,11 +395,16 @@ class System_minimizer_one_to_one__pl(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system01_minimizer, False)
+        super().__init__(system01_minimizer, False, system01_minimizer_vectorized)
         self.default_readout = "pl"
+        self.free_species = ["pf", "lf"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system01_species
+        self.mass_balances = system01_mass_balances
+        self.signal_denominator = ("p", 2.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -185,11 +429,16 @@ class System_minimizer_homodimerformation__pp(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system03_minimizer, False)
+        super().__init__(system03_minimizer, False, system03_minimizer_vectorized)
         self.default_readout = "pp"
+        self.free_species = ["pf"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system03_species
+        self.mass_balances = system03_mass_balances
+        self.signal_denominator = ("p", 2.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -214,11 +463,16 @@ class System_minimizer_competition__pl(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system02_minimizer, False)
+        super().__init__(system02_minimizer, False, system02_minimizer_vectorized)
         self.default_readout = "pl"
+        self.free_species = ["pf", "lf", "if"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system02_species
+        self.mass_balances = system02_mass_balances
+        self.signal_denominator = ("p", 2.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -243,11 +497,16 @@ class System_minimizer_homodimerbreaking__pp(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system04_minimizer, False)
+        super().__init__(system04_minimizer, False, system04_minimizer_vectorized)
         self.default_readout = "pp"
+        self.free_species = ["pf", "if"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system04_species
+        self.mass_balances = system04_mass_balances
+        self.signal_denominator = ("p", 2.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -272,11 +531,16 @@ class System_minimizer_homodimerbreaking__pl(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system04_minimizer, False)
+        super().__init__(system04_minimizer, False, system04_minimizer_vectorized)
         self.default_readout = "pl"
+        self.free_species = ["pf", "if"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system04_species
+        self.mass_balances = system04_mass_balances
+        self.signal_denominator = ("p", 2.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -302,11 +566,16 @@ class System_minimizer_1_to_2__pl12(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system12_minimizer, False)
+        super().__init__(system12_minimizer, False, system12_minimizer_vectorized)
         self.default_readout = "pl12"
+        self.free_species = ["pf", "lf"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system12_species
+        self.mass_balances = system12_mass_balances
+        self.signal_denominator = ("l", 1.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -332,11 +601,16 @@ class System_minimizer_1_to_3__pl123(BindingSystem):
     """
 
     def __init__(self):
-        super().__init__(system13_minimizer, False)
+        super().__init__(system13_minimizer, False, system13_minimizer_vectorized)
         self.default_readout = "pl123"
+        self.free_species = ["pf", "lf"]
+        self.continuation = "secant"
+        self.escalation_dps = escalation_dps
+        self.species_function = system13_species
+        self.mass_balances = system13_mass_balances
+        self.signal_denominator = ("l", 1.0)
 
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -359,15 +633,26 @@ class System_minimizer_custom(BindingSystem):
     Class uses LagrangeBindingSystemFactory to make a custom lagrange function.
     """
 
-    def __init__(self, system_string):
-        custom_system = MinimizerBindingSystemFactory(system_string)
-        super().__init__(custom_system.binding_function)
+    def __init__(self, system_string, dps: int = 100):
+        self.system_string = system_string
+        self.dps = dps
+        custom_system = MinimizerBindingSystemFactory(system_string, dps=dps)
+        super().__init__(custom_system.binding_function, False, custom_system.vectorized_binding_function)
         self.all_species=custom_system.all_species
         self.default_readout = custom_system.readout
-        self.arguments=custom_system.binding_function_arguments
+        self.free_species = [f"{fs}_f" for fs in custom_system.fundamental_species]
+        self.species_function = custom_system.species_function
+        self.mass_balances = custom_system.mass_balances
+        self.signal_denominator = ("l", 1.0)
+        self.continuation = "secant"
+        # Escalate up to the precision requested of the factory
+        self.escalation_dps = tuple(sorted({min(escalation_dps[0], dps), dps}))
+
+    def __reduce__(self):
+        # Generated functions are rebuilt from the system definition
+        return (self.__class__, (self.system_string, self.dps), self._picklable_state())
         
     def query(self, parameters: dict):
-        mp.dps = 100
         if self._are_ymin_ymax_present(parameters):
             parameters_no_min_max = self._remove_ymin_ymax_keys_from_dict_return_new(
                 parameters
@@ -0,0 +1,117 @@
+"""Memoization of binding system queries
+
+Queries with parameters identical to an earlier query, as made repeatedly by
+interactive dashboards and fits, may be answered from a QueryCache attached
+to a binding system (see BindingSystem.enable_query_cache) rather than by
+solving the system again. Keys combine the identity of the system with a
+hash of its parameters, array parameters being hashed by their dtype, shape
+and contents, so that equal arrays give equal keys whichever objects hold
+them.
+"""
+
+import copy
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class QueryCache:
+    """Thread safe, least recently used cache of query results
+
+    Args:
+        max_bytes (int, optional): Maximum memory held by cached results,
+            with the least recently used removed first. Results larger than
+            this are not cached. Defaults to 64 MiB.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._results = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(identity: tuple, parameters: dict):
+        """Key of a query
+
+        Args:
+            identity (tuple): Values identifying the system and anything
+                else affecting results, such as precision.
+            parameters (dict): Query parameters, with scalar or array-like
+                values.
+
+        Returns:
+            bytes: Digest of the identity and parameters.
+        """
+        digest = hashlib.blake2b(repr(identity).encode(), digest_size=32)
+        for name in sorted(parameters):
+            value = parameters[name]
+            digest.update(name.encode() + b"\0")
+            if isinstance(value, (np.ndarray, list, tuple)):
+                array = np.ascontiguousarray(value)
+                digest.update(f"{array.dtype.str}{array.shape}".encode())
+                digest.update(array.tobytes() if array.dtype != object else repr(value).encode())
+            else:
+                digest.update(f"{type(value).__name__}:{value!r}".encode())
+            digest.update(b"\0")
+        return digest.digest()
+
+    def get(self, key: bytes):
+        """Get a cached result, counting the hit or miss
+
+        Args:
+            key (bytes): Key of the query.
+
+        Returns:
+            tuple: Whether the result was cached, and a copy of it (or None).
+        """
+        with self._lock:
+            if key not in self._results:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._results.move_to_end(key)
+            value, _ = self._results[key]
+        return True, copy.copy(value)
+
+    def put(self, key: bytes, value):
+        """Cache a result, evicting the least recently used as required
+
+        Args:
+            key (bytes): Key of the query.
+            value: Query result, copied (as are results returned by get) so
+                that changes made to it by callers do not affect the cache.
+        """
+        value = copy.copy(value)
+        # Includes the data of arrays, which copies own
+        nbytes = sys.getsizeof(value) + len(key)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._results:
+                self.nbytes -= self._results.pop(key)[1]
+            self._results[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self._results.popitem(last=False)[1][1]
+
+    def clear(self):
+        """Remove all cached results and reset hit and miss counters"""
+        with self._lock:
+            self._results.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._results)
+
+    def __reduce__(self):
+        # Locks cannot be pickled, so copies (as sent to worker processes)
+        # start empty
+        return (self.__class__, (self.max_bytes,))
@@ -1,6 +1,11 @@
 import pytest
 import numpy as np
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep code generated for custom systems out of the user cache"""
+    monkeypatch.setenv("PYBINDINGCURVE_CACHE_DIR", str(tmp_path / "pybindingcurve_cache"))
+
 @pytest.fixture
 def data_res_one_to_one():
     """Classification dataset, 7 classes, 7 clusters, 100 samples, 10 features"""
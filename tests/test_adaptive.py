@@ -0,0 +1,56 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+from pybindingcurve.sampling import adaptive_sample
+import numpy as np
+
+#############################################
+### Test adaptive titration sampling
+#############################################
+
+def test_adaptive_titration_reproduces_curve_with_few_points():
+	my_system = pbc.BindingCurve("1:1")
+	parameters = {"p": np.linspace(0, 20, 500), "l": 10, "kdpl": 0.1}
+	x, y = my_system.adaptive_titration(parameters, tolerance=1e-3)
+	assert len(x) < 60
+	assert np.all(np.diff(x) > 0) and x[0] == 0 and x[-1] == 20
+	dense = my_system.query(parameters)
+	assert np.max(np.abs(np.interp(parameters["p"], x, y) - dense)) < 2e-3 * np.ptp(dense)
+	# Points are concentrated around the equivalence point, p = l
+	spacing = np.diff(x)
+	assert spacing[np.searchsorted(x, 10) - 1] < spacing[0] / 4
+
+def test_adaptive_titration_on_log_scale():
+	my_system = pbc.BindingCurve("1:1")
+	parameters = {"p": np.logspace(-3, 3, 100), "l": 1, "kdpl": 1}
+	x, y = my_system.adaptive_titration(parameters, tolerance=1e-3)
+	assert x[0] == 1e-3 and x[-1] == 1e3
+	dense = my_system.query(parameters)
+	assert np.max(np.abs(np.interp(np.log(parameters["p"]), np.log(x), y) - dense)) < 2e-3 * np.ptp(dense)
+
+def test_adaptive_sample_counts_and_batches_evaluations():
+	calls = []
+
+	def step(x):
+		calls.append(len(x))
+		return np.tanh(50 * (x - 0.3))
+
+	x, y = adaptive_sample(step, 0, 1, tolerance=1e-3, initial_points=5, max_points=200)
+	assert sum(calls) == len(x) <= 200
+	assert len(calls) < 20
+	assert np.allclose(y, np.tanh(50 * (x - 0.3)))
+
+def test_adaptive_curves_with_multiple_solutions():
+	my_system = pbc.BindingCurve("homodimerbreakinganalytical")
+	parameters = {"p": np.linspace(0.1, 10, 5), "i": 3, "kdpp": 1, "kdpi": 2}
+	curves = my_system.compute_curves(parameters, adaptive_tolerance=1e-3)
+	assert len(curves) > 1
+	assert all(np.array_equal(c.xcoords, curves[0].xcoords) for c in curves)
+	assert np.allclose(np.stack([c.ycoords for c in curves]), my_system.query({**parameters, "p": curves[0].xcoords}))
@@ -0,0 +1,30 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+import numpy as np
+
+#######################################
+### Test broadcasting batch queries
+#######################################
+
+def test_query_batch_grid_matches_single_queries():
+	my_system = pbc.BindingCurve("1:1")
+	p = np.linspace(0, 20, 5)
+	kdpl = np.logspace(-2, 2, 3)
+	grid = my_system.query_batch({"p": p[:, np.newaxis], "l": 10, "kdpl": kdpl[np.newaxis, :]})
+	assert grid.shape == (5, 3)
+	for ik, k in enumerate(kdpl):
+		assert np.allclose(grid[:, ik], my_system.query({"p": p, "l": 10, "kdpl": k}))
+
+def test_query_batch_pointwise_backend():
+	my_system = pbc.BindingCurve("1:1min")
+	reference = pbc.BindingCurve("1:1")
+	parameters = {"p": [[1.0], [5.0]], "l": 10, "kdpl": [0.1, 1.0, 10.0]}
+	assert np.allclose(my_system.query_batch(parameters), reference.query_batch(parameters), atol=1e-8)
@@ -0,0 +1,54 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+import numpy as np
+
+################################################
+### Test warm started minimizer titrations
+################################################
+
+def test_continuation_matches_cold_start():
+	my_system = pbc.BindingCurve("1:3")
+	parameters = {"p": 10, "l": np.linspace(0, 40, 20), "kdpl1": 1, "kdpl2": 5, "kdpl3": 10}
+	# Solve every point in mpmath, one at a time
+	my_system.system._vectorized_system = None
+	results = {}
+	for continuation in [None, "previous", "secant"]:
+		my_system.system.continuation = continuation
+		results[continuation] = my_system.query(dict(parameters))
+		if continuation is None:
+			assert my_system.system.warm_starts == 0
+		else:
+			# Every point but the first starts from its predecessors
+			assert my_system.system.warm_starts == 19
+	assert np.allclose(results[None], results["previous"], atol=1e-8)
+	assert np.allclose(results[None], results["secant"], atol=1e-8)
+
+def test_escalated_points_continue_from_preceding_points():
+	my_system = pbc.BindingCurve("1:3")
+	parameters = {"p": 10, "l": np.linspace(1, 40, 20), "kdpl1": 1, "kdpl2": 5, "kdpl3": 10}
+	float64_readout = my_system.query(parameters)
+	# Escalate every point, without usable float64 free concentrations
+	vectorized_system = my_system.system._vectorized_system
+
+	def failing_system(**kwargs):
+		species, imprecise = vectorized_system(**kwargs)
+		species = dict((name, np.array(value, dtype=float)) for name, value in species.items())
+		for name in my_system.system.free_species:
+			species[name][:] = np.nan
+		return species, np.ones_like(imprecise)
+
+	my_system.system._vectorized_system = failing_system
+	for continuation, warm_starts in [(None, 0), ("secant", 19)]:
+		my_system.system.continuation = continuation
+		escalated_readout = my_system.query(parameters)
+		assert my_system.system.precision_stats["float64"] == 0
+		assert my_system.system.warm_starts == warm_starts
+		assert np.allclose(escalated_readout, float64_readout, atol=1e-8)
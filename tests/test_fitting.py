@@ -29,4 +29,134 @@ def test_1_to_1_fit_analytical():
 	system_parameters = {"p": xcoords, "l": 10}
 	fitted_system, fit_accuracy = my_system.fit(system_parameters, {"kdpl": 0}, ycoords)
 	assert pytest.approx(fitted_system["kdpl"])==16.3715989783099
- 
\ No newline at end of file
+ 
+@pytest.mark.parametrize(
+	"make_system, parameters",
+	[
+		(lambda: pbc.systems.System_analytical_one_to_one__pl(), {"p": np.linspace(0.1, 10, 7), "l": 5, "kdpl": 0.7, "ymin": 0.3, "ymax": 3.0}),
+		(lambda: pbc.systems.System_analytical_competition__pl(), {"p": 2, "l": np.linspace(0.1, 10, 7), "i": 5, "kdpl": 0.7, "kdpi": 0.2}),
+		(lambda: pbc.systems.System_minimizer_competition__pl(), {"p": 2, "l": np.linspace(0, 10, 7), "i": 5, "kdpl": 0.7, "kdpi": 0.2}),
+		(lambda: pbc.systems.System_minimizer_1_to_3__pl123(), {"p": 2, "l": np.linspace(0, 10, 7), "kdpl1": 0.7, "kdpl2": 2.0, "kdpl3": 1.3}),
+		(lambda: pbc.systems.System_minimizer_custom("p+l<->pl*, p+i<->pi, pl+i<->pli"), {"p": 2, "l": np.linspace(0, 10, 7), "i": 3, "kd_p_l_pl": 0.7, "kd_p_i_pi": 2.0, "kd_pl_i_pli": 1.3, "ymin": 0, "ymax": 1}),
+	],
+)
+def test_query_derivatives_match_finite_differences(make_system, parameters):
+	# Systems are built within the test, not at collection, so that custom
+	# systems use the test cache directory
+	system = make_system()
+	wrt = [k for k in parameters if not isinstance(parameters[k], np.ndarray)]
+	value, derivatives = system.query_derivatives(parameters, wrt)
+	assert np.allclose(value, system.query(dict(parameters)))
+	for name in wrt:
+		step = 1e-6 * max(abs(parameters[name]), 1)
+		above = system.query({**parameters, name: parameters[name] + step})
+		below = system.query({**parameters, name: parameters[name] - step})
+		assert np.allclose(derivatives[name], (above - below) / (2 * step), rtol=1e-6, atol=1e-9)
+
+def test_fit_with_derivatives_matches_finite_differences():
+	xcoords = np.linspace(0, 20, 15)
+	my_system = pbc.BindingCurve("competition")
+	system_parameters = {"p": xcoords, "l": 10, "i": 5, "kdpi": 0.4}
+	ycoords = my_system.query({**system_parameters, "kdpl": 1.5, "ymin": 0.5, "ymax": 4.0})
+	to_fit = {"kdpl": 5.0, "ymin": 0.0, "ymax": 3.0}
+	fitted_system, _ = my_system.fit(system_parameters, to_fit, ycoords)
+	my_system.system.species_function = None
+	reference_system, _ = my_system.fit(system_parameters, to_fit, ycoords)
+	for name, value in [("kdpl", 1.5), ("ymin", 0.5), ("ymax", 4.0)]:
+		assert fitted_system[name] == pytest.approx(value)
+		assert fitted_system[name] == pytest.approx(reference_system[name])
+
+def test_global_fit_shared_kd_per_curve_signal():
+	my_system = pbc.BindingCurve("competition")
+	rng = np.random.default_rng(0)
+	system_parameters = []
+	ycoords = []
+	for curve, p in enumerate([0.5, 1, 2, 5]):
+		curve_parameters = {"p": p, "l": np.linspace(0.5, 30, 20), "i": 5, "kdpi": 0.4}
+		truth = {**curve_parameters, "kdpl": 2.0, "ymin": 0.1 * curve, "ymax": 2.0 + curve}
+		system_parameters.append(curve_parameters)
+		ycoords.append(my_system.query(truth) + rng.normal(0, 1e-4, 20))
+	fitted_systems, fit_accuracy = my_system.fit_global(
+		system_parameters, {"kdpl": 1.0}, {"ymin": 0.0, "ymax": 1.0}, ycoords
+	)
+	assert len(fitted_systems) == 4
+	for curve, (fitted, accuracy) in enumerate(zip(fitted_systems, fit_accuracy)):
+		assert fitted["kdpl"] == pytest.approx(2.0, rel=1e-2)
+		assert fitted["ymin"] == pytest.approx(0.1 * curve, abs=1e-2)
+		assert fitted["ymax"] == pytest.approx(2.0 + curve, rel=1e-2)
+		assert fitted["p"] == system_parameters[curve]["p"]
+		assert set(accuracy) == {"kdpl", "ymin", "ymax"}
+	assert fit_accuracy[0]["kdpl"] == fit_accuracy[3]["kdpl"]
+
+def test_multistart_fit_stops_when_starts_agree():
+	my_system = pbc.BindingCurve("competition")
+	system_parameters = {"p": 1, "l": np.linspace(0, 20, 25), "i": 5}
+	ycoords = my_system.query({**system_parameters, "kdpl": 0.3, "kdpi": 0.05})
+	bounds = {"kdpl": (1e-4, 1e3), "kdpi": (1e-4, 1e3)}
+	fitted_system, fit_accuracy, optima = my_system.fit_multistart(
+		system_parameters, {"kdpl": 100, "kdpi": 100}, ycoords, bounds, num_starts=16, processes=1, seed=1
+	)
+	assert fitted_system["kdpl"] == pytest.approx(0.3)
+	assert fitted_system["kdpi"] == pytest.approx(0.05)
+	assert set(fit_accuracy) == {"kdpl", "kdpi"}
+	assert len(optima) < 16
+	assert [o["chisqr"] for o in optima] == sorted(o["chisqr"] for o in optima)
+	for optimum in optima[1:]:
+		for name, (low, high) in bounds.items():
+			assert low <= optimum["start"][name] <= high
+
+def test_multistart_fit_in_process_pool():
+	my_system = pbc.BindingCurve("1:1")
+	system_parameters = {"p": np.linspace(0, 20, 15), "l": 10}
+	ycoords = my_system.query({**system_parameters, "kdpl": 2.0})
+	fitted_system, _, optima = my_system.fit_multistart(
+		system_parameters, {"kdpl": 1}, ycoords, {"kdpl": (1e-3, 1e3)}, num_starts=4, processes=2, agreement=None, seed=0
+	)
+	assert fitted_system["kdpl"] == pytest.approx(2.0)
+	assert len(optima) == 4
+
+@pytest.mark.parametrize("method", ["residual", "case", "jackknife"])
+def test_resampling_intervals_contain_estimate(method):
+	my_system = pbc.BindingCurve("competition")
+	rng = np.random.default_rng(3)
+	system_parameters = {"p": 1, "l": np.linspace(0, 20, 25), "i": 5, "kdpi": 0.05}
+	ycoords = my_system.query({**system_parameters, "kdpl": 0.3}) + rng.normal(0, 0.005, 25)
+	fitted_system, intervals, distribution = my_system.fit_resampling(
+		system_parameters, {"kdpl": 1}, ycoords, method=method, num_resamples=50, processes=1, seed=0
+	)
+	assert distribution.shape == (25 if method == "jackknife" else 50, 1)
+	assert np.all(np.isfinite(distribution))
+	low, high = intervals["kdpl"]
+	assert low < fitted_system["kdpl"] < high
+	assert low < 0.3 < high
+	assert high - low < 0.05
+
+def test_resampling_in_process_pool_matches_serial():
+	my_system = pbc.BindingCurve("1:1")
+	rng = np.random.default_rng(3)
+	system_parameters = {"p": np.linspace(0, 20, 15), "l": 10}
+	ycoords = my_system.query({**system_parameters, "kdpl": 2.0}) + rng.normal(0, 0.01, 15)
+	arguments = (system_parameters, {"kdpl": 1}, ycoords)
+	_, serial_intervals, serial = my_system.fit_resampling(*arguments, method="case", num_resamples=20, processes=1, seed=0)
+	_, pool_intervals, pool = my_system.fit_resampling(*arguments, method="case", num_resamples=20, processes=2, seed=0)
+	assert np.allclose(serial, pool)
+	assert serial_intervals == pytest.approx(pool_intervals)
+
+def test_profile_likelihood_interval():
+	my_system = pbc.BindingCurve("competition")
+	rng = np.random.default_rng(0)
+	system_parameters = {"p": np.linspace(0, 20, 25), "l": 1, "i": 5, "kdpi": 0.5}
+	ycoords = my_system.query({**system_parameters, "kdpl": 0.3, "ymin": 0.1, "ymax": 2}) + rng.normal(0, 0.01, 25)
+	fitted_system, profiles, intervals = my_system.fit_profile(
+		system_parameters, {"kdpl": 1, "ymin": 0, "ymax": 1}, ycoords, profile=["kdpl"], num_values=21, span=3, processes=1
+	)
+	assert set(profiles) == set(intervals) == {"kdpl"}
+	profile = profiles["kdpl"]
+	assert np.all(np.diff(profile["values"]) > 0)
+	best = np.argmin(profile["statistic"])
+	assert profile["values"][best] == fitted_system["kdpl"]
+	assert profile["statistic"][best] == pytest.approx(0, abs=1e-6)
+	low, high = intervals["kdpl"]
+	assert low is not None and high is not None
+	assert low < fitted_system["kdpl"] < high
+	assert low < 0.3 < high
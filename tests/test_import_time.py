@@ -0,0 +1,55 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+#############################################
+### Test import time
+#############################################
+
+# Imported on first use of plotting, fitting, or of backends other than the
+# analytical backend. Their imports took over a second, while pybindingcurve
+# itself (after numpy and mpmath) takes tens of ms, so importing is checked by
+# the modules loaded rather than by timing, which varies between machines
+lazy_modules = ["matplotlib", "lmfit", "scipy", "autograd"]
+
+benchmark = """
+import json, sys
+import pybindingcurve as pbc
+my_system = pbc.BindingCurve("1:1")
+my_system.query({"p": [1.0, 2.0], "l": 10, "kdpl": 1})
+my_system.add_curve({"p": [1.0, 2.0], "l": 10, "kdpl": 1})
+print(json.dumps({
+	"modules": sorted(set(m.split(".")[0] for m in sys.modules)),
+	"backends": sorted(m for m in sys.modules if m.startswith("pybindingcurve.systems.")),
+}))
+"""
+
+def run_benchmark():
+	environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+	output = subprocess.run(
+		[sys.executable, "-c", benchmark], capture_output=True, text=True, check=True, env=environment
+	).stdout
+	return json.loads(output)
+
+def test_import_and_analytical_curves_do_not_import_optional_modules():
+	result = run_benchmark()
+	assert sorted(set(lazy_modules) & set(result["modules"])) == []
+	for backend in ["lagrange_systems", "kinetic_systems"]:
+		assert f"pybindingcurve.systems.{backend}" not in result["backends"]
+
+def test_lazy_systems_are_exported():
+	import pybindingcurve as pbc
+	from pybindingcurve.systems.kinetic_systems import System_kinetic_custom
+	assert pbc.System_kinetic_custom is System_kinetic_custom
+	assert pbc.systems.System_kinetic_custom is System_kinetic_custom
+	assert "System_lagrange_custom" in dir(pbc.systems)
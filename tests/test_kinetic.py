@@ -0,0 +1,166 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+from pybindingcurve.systems import kinetic_systems as ks
+from pybindingcurve.systems import kinetic_systems_1_to_1to5 as kms
+from pybindingcurve.systems.kinetic_binding_system_factory import KineticBindingSystemFactory
+from pybindingcurve.systems.kinetic_integration import integrate_batch_to_steady_state, mass_action_functions
+import numpy as np
+import pytest
+from functools import lru_cache
+from itertools import combinations
+import pickle
+
+#############################################
+### Test integration of kinetic systems
+#############################################
+
+# KDs spanning six orders of magnitude make the rate equations stiff
+stiff_systems = [
+	(ks.system01_kinetic, (5, 7, 1e-6)),
+	(ks.system02_kinetic, (5, 7, 3, 1e-3, 1e3)),
+	(ks.system03_kinetic, (5, 1e-3)),
+	(ks.system04_kinetic, (5, 3, 1e-3, 1e3)),
+	(kms.multisite_1_to_3, (5, 7, 1e-3, 1, 1e3)),
+]
+
+@lru_cache(maxsize=None)
+def explicit_reference(system, arguments):
+	return system(*arguments, method="RK45", steady_state_tolerance=None)
+
+@pytest.mark.parametrize("method", ["LSODA", "BDF", "Radau"])
+@pytest.mark.parametrize("system, arguments", stiff_systems)
+def test_implicit_integration_to_steady_state_matches_explicit(system, arguments, method):
+	result = system(*arguments, method=method)
+	reference = explicit_reference(system, arguments)
+	if isinstance(result, dict):
+		result, reference = [np.array(list(r.values())) for r in (result, reference)]
+	assert np.allclose(result, reference, rtol=1e-8, atol=1e-10)
+
+def test_mass_action_jacobian_matches_finite_differences():
+	# P + L <-> PL, P + P <-> PP and PL + L <-> PL2
+	ode, jacobian = mass_action_functions([(0, 1, 2, 0.5), (0, 0, 3, 2.0), (2, 1, 4, 0.1)], 5)
+	y = np.random.default_rng(0).uniform(0.1, 2, 5)
+	steps = 1e-6 * np.eye(5)
+	numerical = np.stack([(ode(0, y + h) - ode(0, y - h)) / 2e-6 for h in steps], axis=-1)
+	assert np.allclose(jacobian(0, y), numerical, atol=1e-8)
+
+def test_integration_options_are_not_system_arguments():
+	my_system = pbc.BindingCurve("homodimerbreakingkinetic")
+	assert my_system.system.arguments == ["p", "i", "kdpp", "kdpi"]
+	pp = my_system.query({"p": 5, "i": 3, "kdpp": 1e-3, "kdpi": 1e3})
+	assert pp == pytest.approx(ks.system04_kinetic(5, 3, 1e-3, 1e3, method="RK45")["pp"])
+
+def test_custom_kinetic_system_matches_minimizer():
+	definition = "P+L<->PL1, P+L<->PL2, PL1+L<->PL1L2*, PL2+L<->PL1L2"
+	kinetic_system = pbc.BindingCurve("kinetic" + definition)
+	minimizer_system = pbc.BindingCurve(definition)
+	assert kinetic_system.system.arguments == minimizer_system.system.arguments
+	# KDs satisfying detailed balance, so both routes to PL1L2 agree
+	parameters = {"p": 5, "l": np.linspace(0, 20, 8), "kd_p_l_pl1": 1, "kd_p_l_pl2": 2, "kd_pl1_l_pl1l2": 2, "kd_pl2_l_pl1l2": 1}
+	assert np.allclose(kinetic_system.query(parameters), minimizer_system.query(parameters), rtol=1e-9, atol=1e-12)
+
+@pytest.mark.parametrize("method", ["LSODA", "BDF"])
+def test_custom_kinetic_multisite_system_matches_hand_written(method):
+	# Ligand binding five independent sites, 33 species (sparse Jacobians with BDF)
+	kds = [0.5, 2, 10, 0.1, 3]
+	name = lambda sites: "p" + "".join(f"s{site}" for site in sites)
+	reactions = []
+	parameters = {"p": 5, "l": 7}
+	for n in range(1, 6):
+		for sites in combinations(range(1, 6), n):
+			for site in sites:
+				unbound = name(tuple(s for s in sites if s != site))
+				reactions.append(f"{unbound}+l<->{name(sites)}")
+				parameters[f"kd_{unbound}_l_{name(sites)}"] = kds[site - 1]
+	factory = KineticBindingSystemFactory(",".join(reactions))
+	assert len(factory.all_species) == 33
+	concentrations = factory.binding_function(**parameters, method=method)
+	bound = sum(name.count("s") * concentrations[name] for name in factory.all_species[2:])
+	assert bound / 7 == pytest.approx(kms.multisite_1_to_5(5, 7, *kds), rel=1e-9)
+
+def test_custom_kinetic_system_pickles():
+	my_system = pbc.BindingCurve("kinetic P+L<->PL*")
+	restored = pickle.loads(pickle.dumps(my_system.system))
+	parameters = {"p": np.linspace(0, 20, 5), "l": 10, "kd_p_l_pl": 1}
+	assert np.allclose(restored.query(parameters), my_system.query(parameters))
+
+def test_time_course_matches_association_kinetics():
+	my_system = pbc.BindingCurve("1:1kinetic").system
+	t = np.linspace(0, 5, 21)
+	kon, koff, p, l = 2.0, 2.0, 5.0, 7.0
+	trajectory = my_system.time_course({"p": p, "l": l, "kdpl": koff / kon}, t, kon=kon)
+	assert trajectory.shape == (3, 21)
+	# PL(t) for bimolecular association, from roots r1 < r2 of kon*x^2 - (kon*(p+l)+koff)*x + kon*p*l
+	r1, r2 = np.sort(np.roots([kon, -(kon * (p + l) + koff), kon * p * l]))
+	decay = np.exp(-kon * (r2 - r1) * t)
+	assert np.allclose(trajectory[2], r1 * r2 * (1 - decay) / (r2 - r1 * decay), atol=1e-9)
+	assert np.allclose(trajectory[0], p - trajectory[2])
+
+def test_time_course_chunks_match_time_course():
+	my_system = pbc.BindingCurve("competitionkinetic").system
+	parameters = {"p": [1.0, 5.0], "l": 7, "i": 3, "kdpl": 1e-3, "kdpi": 1e3}
+	t = np.geomspace(1e-4, 10, 25)
+	kon = {"kdpl": 1.0, "kdpi": 0.01}
+	trajectory = my_system.time_course(parameters, t, kon=kon)
+	chunks = list(my_system.time_course_chunks(parameters, t, kon=kon, chunk_size=10))
+	assert [c.shape for _, c in chunks] == [(2, 5, 10), (2, 5, 10), (2, 5, 5)]
+	assert np.array_equal(np.concatenate([times for times, _ in chunks]), t)
+	assert np.allclose(np.concatenate([c for _, c in chunks], axis=-1), trajectory, rtol=1e-10, atol=1e-12)
+	assert trajectory.shape == (2, 5, 25)
+
+def test_custom_kinetic_time_course_matches_built_in():
+	t = np.linspace(0, 2, 9)
+	custom = pbc.BindingCurve("kinetic P+P<->PP*").system
+	built_in = pbc.BindingCurve("homodimerformationkinetic").system
+	assert np.allclose(
+		custom.time_course({"p": 5, "kd_p_p_pp": 0.1}, t), built_in.time_course({"p": 5, "kdpp": 0.1}, t)
+	)
+	with pytest.raises(NotImplementedError):
+		pbc.BindingCurve("1:1").system.time_course({"p": 5, "l": 7, "kdpl": 1}, t)
+
+def test_steady_state_stop_near_tolerance():
+	# Derivatives within rounding of the steady state tolerance once made
+	# locating the steady state between steps fail
+	result = ks.system01_kinetic(7.179487179487179, 10, 1)
+	assert result["pl"] == pytest.approx(ks.system01_kinetic(7.179487179487179, 10, 1, method="RK45")["pl"])
+	assert ks.system01_kinetic(0, 10, 1)["pl"] == 0
+
+#############################################
+### Test batched integration of titrations
+#############################################
+
+@pytest.mark.parametrize(
+	"system, parameters",
+	[
+		("1:1kinetic", {"p": np.linspace(0, 20, 9), "l": 10, "kdpl": 1}),
+		("competitionkinetic", {"p": np.linspace(0, 20, 9), "l": 10, "i": 3, "kdpl": 1e-3, "kdpi": 1e3}),
+		("homodimerformationkinetic", {"p": np.linspace(0, 20, 9), "kdpp": 1e-3}),
+		("homodimerbreakingkinetic", {"p": 5, "i": np.linspace(0, 20, 9), "kdpp": 1e-3, "kdpi": 1e3}),
+		("kinetic P+L<->PL\n>L", {"p": np.linspace(0, 20, 9), "l": 10, "kd_p_l_pl": 1}),
+	],
+)
+def test_batched_titration_matches_pointwise(system, parameters):
+	my_system = pbc.BindingCurve(system)
+	batched = my_system.query(parameters)
+	assert my_system.system.precision_stats["float64"] == 9
+	my_system.system.batch_integration = False
+	assert np.allclose(batched, my_system.query(parameters), rtol=1e-9, atol=1e-11)
+
+@pytest.mark.parametrize("method", [None, "LSODA", "BDF"])
+def test_batch_integration_matches_single_integrations(method):
+	# P + L <-> PL and P + I <-> PI at points of a 2D grid
+	p, l = [x.ravel() for x in np.meshgrid(np.linspace(0, 20, 12), [1, 10, 100])]
+	initial = np.stack([p, l, np.full_like(p, 3), np.zeros_like(p), np.zeros_like(p)], axis=-1)
+	kd = np.stack([np.full_like(p, 1e-3), np.full_like(p, 1e3)], axis=-1)
+	concentrations, success = integrate_batch_to_steady_state([(0, 1, 3), (0, 2, 4)], initial, kd, method=method)
+	assert success
+	expected = [list(ks.system02_kinetic(p[i], l[i], 3, 1e-3, 1e3).values()) for i in range(len(p))]
+	assert np.allclose(concentrations, expected, rtol=1e-9, atol=1e-11)
@@ -0,0 +1,60 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+from pybindingcurve.systems.lagrange_binding_system_factory import LagrangeBindingSystemFactory
+from pybindingcurve.systems.lagrange_gradients import lagrange_functions
+import numpy as np
+import pytest
+
+#############################################
+### Test analytic Lagrange gradients
+#############################################
+
+def test_lagrange_jacobian_matches_finite_differences():
+	# P + L <-> PL, P + P <-> PP and PL + L <-> PL2, as monomials in p and l
+	gradient, jacobian = lagrange_functions([0.5, 2.0, 0.1], [[1, 1], [2, 0], [1, 2]], (0.1, [1, 2]), [10, 20])
+	X = np.array([0.7, 3.0, 0.4, 1.3])
+	steps = 1e-6 * np.eye(4)
+	numerical = np.stack([(gradient(X + h) - gradient(X - h)) / 2e-6 for h in steps], axis=-1)
+	assert np.allclose(jacobian(X), numerical, atol=1e-6)
+
+@pytest.mark.parametrize(
+	"system, parameters",
+	[
+		("competition", {"p": np.linspace(0, 20, 11), "l": 10, "i": 5, "kdpl": 1, "kdpi": 3}),
+		("homodimerformation", {"p": np.linspace(0.1, 20, 11), "kdpp": 2}),
+		("homodimerbreaking", {"p": np.linspace(0.1, 20, 11), "i": 5, "kdpp": 1, "kdpi": 2}),
+	],
+)
+def test_lagrange_systems_match_minimizer(system, parameters):
+	lagrange = pbc.BindingCurve(f"{system}lagrange").query(parameters)
+	minimizer = pbc.BindingCurve(f"{system}min").query(parameters)
+	assert np.allclose(lagrange, minimizer, rtol=1e-6, atol=1e-8)
+
+def test_custom_lagrange_system_matches_minimizer():
+	system_string = "P+L<->PL1\nP+L<->PL2\nPL1+L<->PL1L2*\nPL2+L<->PL1L2"
+	custom_system = LagrangeBindingSystemFactory(system_string)
+	result = custom_system.binding_function(10, 20, 1, 2, 3, 4)
+	minimizer = pbc.BindingCurve(system_string).query(
+		{"p": 10, "l": 20, "kd_p_l_pl1": 1, "kd_p_l_pl2": 2, "kd_pl1_l_pl1l2": 3, "kd_pl2_l_pl1l2": 4}
+	)
+	assert result["pl1l2"] == pytest.approx(minimizer, rel=1e-6)
+
+def test_lagrange_failures_are_raised():
+	# The 1:3 Lagrange system fails to converge here, previously returning
+	# negative concentrations
+	my_system = pbc.BindingCurve("1:3lagrange")
+	with pytest.raises(ValueError):
+		my_system.query({"p": 14.5, "l": 10, "kdpl1": 1, "kdpl2": 3, "kdpl3": 5})
+	assert np.isclose(
+		my_system.query({"p": 1, "l": 10, "kdpl1": 1, "kdpl2": 3, "kdpl3": 5}),
+		pbc.BindingCurve("1:3").query({"p": 1, "l": 10, "kdpl1": 1, "kdpl2": 3, "kdpl3": 5}),
+		rtol=1e-6,
+	)
@@ -0,0 +1,61 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+import numpy as np
+import pytest
+
+#############################################
+### Test computing and rendering curves
+#############################################
+
+def test_compute_curves_matches_query():
+	my_system = pbc.BindingCurve("1:1")
+	parameters = {"p": np.linspace(0, 20), "l": 10, "kdpl": 1}
+	curves = my_system.compute_curves(parameters, name="1:1")
+	assert len(curves) == 1
+	assert curves[0].name == "1:1" and curves[0].parameter == "p" and curves[0].ylabel == "[PL]"
+	assert np.allclose(curves[0].ycoords, my_system.query(parameters))
+	# Computing curves does not add them to the plot
+	assert my_system.curves == [] and my_system.fig is None
+
+def test_compute_curves_with_multiple_solutions():
+	my_system = pbc.BindingCurve("homodimerbreakinganalytical")
+	parameters = {"p": np.linspace(0.1, 10, 5), "i": 3, "kdpp": 1, "kdpi": 2}
+	curves = my_system.compute_curves(parameters, name="breaking", readout=pbc.Readout.complex_concentration)
+	solutions = my_system.query(parameters)
+	assert len(curves) == len(solutions) > 1
+	assert [c.name for c in curves] == [f"breaking {i + 1}" for i in range(len(solutions))]
+
+def test_curves_are_not_shared_between_instances():
+	first, second = pbc.BindingCurve("1:1"), pbc.BindingCurve("1:1")
+	first.add_curve({"p": np.linspace(0, 20), "l": 10, "kdpl": 1})
+	assert len(first.curves) == 1 and second.curves == []
+	# No figure is created until a plot is attached
+	assert first.fig is None
+
+def test_show_plot_renders_added_curves_and_starts_new_plot(tmp_path, monkeypatch):
+	pytest.importorskip("matplotlib")
+	monkeypatch.setenv("MPLBACKEND", "Agg")
+	import matplotlib
+	matplotlib.use("Agg")
+	my_system = pbc.BindingCurve("1:1")
+	my_system.add_curve({"p": np.linspace(0, 20), "l": 10, "kdpl": 1})
+	my_system.add_scatter([1, 2, 3], [1, 2, 3])
+	plot = my_system.attach_plot()
+	assert my_system.axes is plot.axes
+	assert len(plot.axes.lines) == 1 and len(plot.axes.collections) == 1
+	# Curves added while attached are drawn immediately
+	my_system.add_curve({"p": np.linspace(0, 20), "l": 10, "kdpl": 5})
+	assert len(plot.axes.lines) == 2
+	my_system.show_plot(png_filename=tmp_path / "plot.png")
+	assert (tmp_path / "plot.png").exists()
+	assert my_system.fig is None
+	my_system.add_curve({"p": np.linspace(0, 20), "l": 10, "kdpl": 1})
+	assert len(my_system.curves) == 1 and my_system.scatters == []
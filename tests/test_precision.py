@@ -0,0 +1,70 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+from pybindingcurve.systems import minimizer_systems as ms
+from pybindingcurve.systems.minimizer_binding_system_factory import MinimizerBindingSystemFactory
+from mpmath import mp
+import numpy as np
+
+##################################################
+### Test float64 minimizers and precision escalation
+##################################################
+
+p = np.linspace(0, 20, 11)
+
+def test_vectorized_minimizer_matches_mpmath():
+	result, imprecise = ms.system02_minimizer_vectorized(p, 10, 5, 1, 0.1)
+	with mp.workdps(50):
+		reference = [ms.system02_minimizer(pp, 10, 5, 1, 0.1) for pp in p]
+	assert not np.any(imprecise)
+	for species in ["pf", "lf", "if", "pl", "pi"]:
+		assert np.allclose(result[species], [float(r[species]) for r in reference], rtol=0, atol=1e-9)
+
+def test_vectorized_minimizer_conserves_protein():
+	result, imprecise = ms.system13_minimizer_vectorized(p, 10, 1, 0.1, 10)
+	bound = sum(result[s] for s in ["pl1", "pl2", "pl3", "pl12", "pl13", "pl23", "pl123"])
+	assert not np.any(imprecise)
+	assert np.allclose(result["pf"] + bound, p, rtol=1e-12, atol=0)
+
+def test_imprecise_points_are_escalated_to_mpmath():
+	my_system = pbc.BindingCurve("1:1min")
+	parameters = {"p": p, "l": 10, "kdpl": 1}
+	float64_readout = my_system.query(parameters)
+	assert my_system.system.precision_stats == {"points": 11, "float64": 11, "escalated": {}}
+
+	# Flag every point as imprecise, forcing them all through mpmath
+	vectorized_system = my_system.system._vectorized_system
+	my_system.system._vectorized_system = lambda **kwargs: (
+		vectorized_system(**kwargs)[0],
+		np.ones(p.shape, dtype=bool),
+	)
+	escalated_readout = my_system.query(parameters)
+	assert my_system.system.precision_stats == {"points": 11, "float64": 0, "escalated": {30: 11}}
+	assert np.allclose(float64_readout, escalated_readout, rtol=0, atol=1e-9)
+
+def test_custom_system_precision_stats():
+	my_system = pbc.BindingCurve("p+l<->pl*")
+	my_system.query({"p": p, "l": 10, "kd_p_l_pl": 1})
+	assert my_system.system.escalation_dps == (30, 100)
+	assert my_system.system.precision_stats == {"points": 11, "float64": 11, "escalated": {}}
+
+def test_custom_vectorized_system_matches_mpmath():
+	custom_system = MinimizerBindingSystemFactory(
+		"P+P<->PP*, P+L<->PL, PP+L<->PPL1, PP+L<->PPL2, PPL1+L<->PPL1L2, PPL2+L<->PPL1L2"
+	)
+	kds = [0.5, 2, 1, 3, 0.1, 10]
+	result, imprecise = custom_system.vectorized_binding_function(p, 10, *kds)
+	assert not np.any(imprecise)
+	with mp.workdps(50):
+		for index, pp in enumerate(p):
+			initial_guess = [result["p_f"][index], result["l_f"][index]]
+			reference = custom_system.binding_function(pp, 10, *kds, initial_guess=initial_guess)
+			for species in reference:
+				assert np.isclose(result[species][index], float(reference[species]), rtol=1e-9, atol=1e-12)
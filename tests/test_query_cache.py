@@ -0,0 +1,98 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pickle
+import pybindingcurve as pbc
+from pybindingcurve.systems.query_cache import QueryCache
+import numpy as np
+
+#############################################
+### Test caching of queries
+#############################################
+
+def test_query_cache_hits_on_equal_parameters():
+	my_system = pbc.BindingCurve("1:1")
+	cache = my_system.system.enable_query_cache()
+	parameters = {"p": np.linspace(0, 20, 50), "l": 10, "kdpl": 1}
+	first = my_system.query(parameters)
+	assert (cache.hits, cache.misses) == (0, 1)
+	# Equal contents in a different array hit, and results are copies
+	second = my_system.query({"p": np.linspace(0, 20, 50), "l": 10, "kdpl": 1})
+	assert (cache.hits, cache.misses) == (1, 1)
+	assert np.array_equal(first, second) and second is not first
+	second[:] = -1
+	assert np.array_equal(my_system.query(parameters), first)
+	my_system.query({**parameters, "kdpl": 2})
+	assert (cache.hits, cache.misses) == (2, 2) and len(cache) == 2
+	cache.clear()
+	assert (cache.hits, cache.misses, len(cache), cache.nbytes) == (0, 0, 0, 0)
+
+def test_query_cache_with_signal_parameters():
+	my_system = pbc.BindingCurve("1:1")
+	cache = my_system.system.enable_query_cache()
+	parameters = {"p": np.linspace(0, 20, 50), "l": 10, "kdpl": 1, "ymin": 0.2}
+	uncached = pbc.BindingCurve("1:1").query(dict(parameters))
+	assert np.allclose(my_system.query(parameters), uncached)
+	# The caller's parameters are unchanged, so querying again hits
+	assert "ymax" not in parameters
+	assert np.allclose(my_system.query(parameters), uncached)
+	assert cache.hits == 1
+	assert not np.allclose(my_system.query({**parameters, "ymax": 2.0}), uncached)
+	assert cache.misses == 2
+
+def test_query_cache_evicts_least_recently_used():
+	cache = QueryCache(max_bytes=1000000)
+	cache.put(cache.key((), {"x": 0}), np.zeros(100))
+	# Room for two results
+	cache.max_bytes = int(cache.nbytes * 2.5)
+	for i in range(1, 4):
+		cache.put(cache.key((), {"x": i}), np.zeros(100))
+	assert len(cache) == 2 and cache.nbytes <= cache.max_bytes
+	assert not cache.get(cache.key((), {"x": 1}))[0]
+	assert cache.get(cache.key((), {"x": 2}))[0]
+	cache.put(cache.key((), {"x": 4}), np.zeros(100))
+	# x = 2 was used more recently than x = 3
+	assert cache.get(cache.key((), {"x": 2}))[0]
+	assert not cache.get(cache.key((), {"x": 3}))[0]
+	cache.put(cache.key((), {"x": 5}), np.zeros(1000))
+	assert not cache.get(cache.key((), {"x": 5}))[0]
+
+def test_query_cache_keys_and_pickling():
+	key = QueryCache.key
+	assert key(("a",), {"x": np.arange(3.0)}) == key(("a",), {"x": [0.0, 1.0, 2.0]})
+	assert key(("a",), {"x": np.arange(3.0)}) != key(("b",), {"x": np.arange(3.0)})
+	assert key((), {"x": np.arange(3.0)}) != key((), {"x": np.arange(3)})
+	assert key((), {"x": 1, "y": 2}) == key((), {"y": 2, "x": 1})
+	my_system = pbc.BindingCurve("1:1")
+	my_system.system.enable_query_cache(1000)
+	my_system.query({"p": 1, "l": 2, "kdpl": 1})
+	copied = pickle.loads(pickle.dumps(my_system.system))
+	assert copied.query_cache.max_bytes == 1000 and len(copied.query_cache) == 0
+	assert copied.query({"p": 1, "l": 2, "kdpl": 1}) == my_system.query({"p": 1, "l": 2, "kdpl": 1})
+
+def test_query_cache_shared_between_variants_of_a_system():
+	cache = QueryCache()
+	parameters = {"p": np.linspace(1, 20, 4), "i": 5, "kdpp": 1, "kdpi": 2}
+	shapes = []
+	for all_solutions in (False, True, False, True):
+		system = pbc.systems.System_analytical_homodimerbreaking_pp(all_solutions=all_solutions)
+		system.query_cache = cache
+		shapes.append(np.shape(system.query(dict(parameters))))
+	assert shapes == [(4,), (2, 4), (4,), (2, 4)]
+	assert (cache.hits, cache.misses) == (2, 2)
+
+def test_query_cache_hits_after_readout_of_free_species():
+	system = pbc.BindingCurve("p+l<->pl").system
+	system.default_readout = "p"
+	cache = system.enable_query_cache()
+	parameters = {"p": 10, "l": 5, "kd_p_l_pl": 1}
+	first = system.query(dict(parameters))
+	assert system.default_readout == "p_f"
+	assert system.query(dict(parameters)) == first
+	assert (cache.hits, cache.misses) == (1, 1)
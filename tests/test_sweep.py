@@ -0,0 +1,145 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+import functools
+import sys
+import pytest
+import numpy as np
+
+##########################
+### Test parameter sweeps
+##########################
+
+kdpl = np.logspace(-3, 3, 9)
+kdpi = np.logspace(-3, 3, 7)
+
+def test_sweep_matches_query_batch():
+	progress = []
+	grid = pbc.sweep(
+		"competition",
+		{"p": 1, "l": 1, "i": 5},
+		{"kdpl": kdpl, "kdpi": kdpi},
+		readout=pbc.Readout.fraction_l,
+		processes=1,
+		tile_shape=(4, 4),
+		progress=lambda completed, total: progress.append((completed, total)),
+	)
+	reference = pbc.BindingCurve("competition").query_batch(
+		{"p": 1, "l": 1, "i": 5, "kdpl": kdpl[:, np.newaxis], "kdpi": kdpi[np.newaxis, :]},
+		readout=pbc.Readout.fraction_l,
+	)
+	assert grid.shape == (9, 7)
+	assert np.allclose(grid, reference)
+	assert len(progress) == 6
+	assert progress[-1] == (63, 63)
+
+def test_sweep_custom_system_in_process_pool(tmp_path):
+	grid = pbc.sweep(
+		"p+l<->pl*, p+i<->pi",
+		{"p": 1, "l": 1, "i": 5},
+		{"kd_p_l_pl": kdpl, "kd_p_i_pi": kdpi},
+		output=tmp_path / "grid.npy",
+		processes=2,
+	)
+	reference = pbc.BindingCurve("competition").query_batch(
+		{"p": 1, "l": 1, "i": 5, "kdpl": kdpl[:, np.newaxis], "kdpi": kdpi[np.newaxis, :]}
+	)
+	assert np.allclose(grid, reference, rtol=1e-8, atol=1e-12)
+	assert np.array_equal(np.load(tmp_path / "grid.npy"), grid)
+
+def test_sweep_multiple_solutions():
+	grid = pbc.sweep(
+		pbc.systems.System_analytical_homodimerbreaking_pp(),
+		{"p": 2, "i": 5},
+		{"kdpp": kdpl, "kdpi": kdpi},
+		processes=1,
+	)
+	assert grid.shape == (2, 9, 7)
+
+queried_points = []
+
+def counting_readout(parameters, result):
+	queried_points.append(np.broadcast(*[np.asarray(v) for v in parameters.values()]).size)
+	return pbc.Readout.fraction_l(parameters, result)
+
+def test_sweep_store_resumes_interrupted_sweep(tmp_path):
+	arguments = ("competition", {"p": 1, "l": 1, "i": 5}, {"kdpl": kdpl, "kdpi": kdpi})
+	grid = np.array(pbc.sweep(*arguments, readout=counting_readout, processes=1, tile_shape=(4, 4), store=tmp_path))
+	(grid_directory,) = [d.parent for d in tmp_path.glob("*/*/done.npy")]
+
+	# Simulate an interruption part way through the sweep
+	done = np.load(grid_directory / "done.npy", mmap_mode="r+")
+	done[4:, :] = False
+	done.flush()
+	del done
+	queried_points.clear()
+	resumed = pbc.sweep(*arguments, readout=counting_readout, processes=1, tile_shape=(4, 4), store=tmp_path)
+	assert sum(queried_points) == 5 * 7
+	assert np.allclose(resumed, grid)
+
+	# Finished sweeps are not solved again
+	queried_points.clear()
+	assert np.array_equal(pbc.sweep(*arguments, readout=counting_readout, processes=1, store=tmp_path), grid)
+	assert queried_points == []
+
+def test_sweep_store_reuses_points_on_finer_grid(tmp_path):
+	coarse = pbc.sweep("competition", {"p": 1, "l": 1, "i": 5}, {"kdpl": kdpl, "kdpi": kdpi}, readout=counting_readout, processes=1, store=tmp_path)
+	fine_kdpl = np.logspace(-3, 3, 17)
+	queried_points.clear()
+	fine = pbc.sweep("competition", {"p": 1, "l": 1, "i": 5}, {"kdpl": fine_kdpl, "kdpi": kdpi}, readout=counting_readout, processes=1, store=tmp_path)
+	assert sum(queried_points) == (17 - 9) * 7
+	assert np.allclose(fine[::2], coarse)
+	reference = pbc.BindingCurve("competition").query_batch(
+		{"p": 1, "l": 1, "i": 5, "kdpl": fine_kdpl[:, np.newaxis], "kdpi": kdpi[np.newaxis, :]},
+		readout=pbc.Readout.fraction_l,
+	)
+	assert np.allclose(fine, reference)
+
+	# Changing fixed parameters starts a new family of sweeps
+	queried_points.clear()
+	pbc.sweep("competition", {"p": 1, "l": 1, "i": 2}, {"kdpl": kdpl, "kdpi": kdpi}, readout=counting_readout, processes=1, store=tmp_path)
+	assert sum(queried_points) == 9 * 7
+
+def test_sweep_store_distinguishes_readouts(tmp_path):
+	arguments = ("competition", {"p": 1, "l": 1, "i": 5}, {"kdpl": kdpl, "kdpi": kdpi})
+	first = pbc.sweep(*arguments, readout=lambda p, y: ("x", y), processes=1, store=tmp_path)
+	second = pbc.sweep(*arguments, readout=lambda p, y: ("x", y / p["l"] * 100), processes=1, store=tmp_path)
+	assert np.allclose(second, np.asarray(first) * 100)
+	# Partial readouts are identified by their bound arguments
+	def scaled(parameters, result, scale):
+		return "x", result * scale
+	tenfold = pbc.sweep(*arguments, readout=functools.partial(scaled, scale=10), processes=1, store=tmp_path)
+	assert np.allclose(tenfold, np.asarray(first) * 10)
+	hundredfold = pbc.sweep(*arguments, readout=functools.partial(scaled, scale=100), processes=1, store=tmp_path)
+	assert np.allclose(hundredfold, np.asarray(first) * 100)
+
+def test_sweep_store_distinguishes_system_settings(tmp_path):
+	parameters = {"p": 2, "i": 5, "kdpi": 1}
+	axes = {"kdpp": np.logspace(-1, 1, 4)}
+	physical = pbc.sweep(pbc.systems.System_analytical_homodimerbreaking_pp(all_solutions=False), parameters, axes, processes=1, store=tmp_path)
+	all_solutions = pbc.sweep(pbc.systems.System_analytical_homodimerbreaking_pp(), parameters, axes, processes=1, store=tmp_path)
+	assert physical.shape == (4,) and all_solutions.shape == (2, 4)
+	assert len(list(tmp_path.glob("*/*/done.npy"))) == 2
+
+def test_sweep_store_rebuilds_grids_of_wrong_shape(tmp_path):
+	arguments = ("competition", {"p": 1, "l": 1, "i": 5}, {"kdpl": kdpl, "kdpi": kdpi})
+	grid = np.array(pbc.sweep(*arguments, processes=1, store=tmp_path))
+	(grid_directory,) = [d.parent for d in tmp_path.glob("*/*/done.npy")]
+	np.save(grid_directory / "values.npy", np.zeros((2,) + grid.shape))
+	assert np.allclose(pbc.sweep(*arguments, processes=1, store=tmp_path), grid)
+
+def test_sweep_rejects_unpicklable_readouts_for_spawned_workers(monkeypatch):
+	sweep_module = sys.modules["pybindingcurve.sweep"]
+	monkeypatch.setattr(sweep_module.multiprocessing, "get_start_method", lambda: "spawn")
+	with pytest.raises(ValueError, match="cannot be pickled"):
+		pbc.sweep("competition", {"p": 1, "l": 1, "i": 5}, {"kdpl": kdpl, "kdpi": kdpi}, readout=lambda p, y: ("x", y), processes=2)
+	# Readouts defined at module level can be sent to spawned workers
+	sweep_module._check_picklable(counting_readout)
+	sweep_module._check_picklable(pbc.Readout.fraction_l)
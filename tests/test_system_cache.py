@@ -0,0 +1,63 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+from pybindingcurve.systems.minimizer_binding_system_factory import MinimizerBindingSystemFactory
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+##########################################
+### Test caching of generated custom systems
+##########################################
+
+system_string = "P+L<->PL*, P+I<->PI"
+
+def test_equivalent_definitions_share_cache_key():
+	factory = MinimizerBindingSystemFactory(system_string)
+	assert factory.cache_key("p+l<->pl*\n\n  p+i<->pi  ", 100) == factory.cache_key(system_string, 100)
+	assert factory.cache_key("p + l <-> pl*\np +i<->  pi", 100) == factory.cache_key(system_string, 100)
+	assert factory.cache_key(system_string, 50) != factory.cache_key(system_string, 100)
+
+def test_generated_code_is_cached_on_disk(tmp_path, monkeypatch):
+	monkeypatch.setenv("PYBINDINGCURVE_CACHE_DIR", str(tmp_path))
+	MinimizerBindingSystemFactory.registry.clear()
+	generated = MinimizerBindingSystemFactory(system_string)
+	assert len(list((tmp_path / "minimizer_systems").glob("*.marshal"))) == 1
+
+	# Reading back from disk gives the same system
+	MinimizerBindingSystemFactory.registry.clear()
+	monkeypatch.setattr(MinimizerBindingSystemFactory, "generate", None)
+	cached = MinimizerBindingSystemFactory(system_string)
+	assert cached.binding_function_string == generated.binding_function_string
+	assert cached.readout == "pl"
+	assert cached.binding_function_arguments == ["p", "l", "i", "kd_p_l_pl", "kd_p_i_pi", "initial_guess"]
+	assert float(cached.binding_function(1, 1, 1, 1, 1)["pl"]) == float(generated.binding_function(1, 1, 1, 1, 1)["pl"])
+
+def test_generated_functions_are_reused_in_process(tmp_path, monkeypatch):
+	monkeypatch.setenv("PYBINDINGCURVE_CACHE_DIR", "")
+	first = MinimizerBindingSystemFactory(system_string)
+	second = MinimizerBindingSystemFactory(system_string)
+	assert first.vectorized_binding_function is second.vectorized_binding_function
+	assert list(tmp_path.iterdir()) == []
+
+def test_custom_systems_built_and_queried_from_threads(monkeypatch):
+	monkeypatch.setenv("PYBINDINGCURVE_CACHE_DIR", "")
+	MinimizerBindingSystemFactory.registry.clear()
+	# Systems differ only in the species read out, so cross-contamination
+	# between them would be visible in the results
+	readouts = ["pl", "pi", "pl", "pi"] * 4
+	def build_and_query(readout):
+		system_string = "P+L<->PL*, P+I<->PI" if readout == "pl" else "P+L<->PL, P+I<->PI*"
+		my_system = pbc.BindingCurve(system_string)
+		return my_system.query({"p": np.linspace(0, 10, 5), "l": 10, "i": 5, "kd_p_l_pl": 1, "kd_p_i_pi": 0.1})
+	with ThreadPoolExecutor(max_workers=8) as executor:
+		results = list(executor.map(build_and_query, readouts))
+	for readout, result in zip(readouts, results):
+		assert np.allclose(result, results[readouts.index(readout)])
+	assert not np.allclose(results[0], results[1])
@@ -0,0 +1,123 @@
+"""
+pytest tests for PyBindingCurve
+
+PyBindingCurve source may be tested to ensure internal consistency (agreement)
+amongst simulation methods, and externally consistent (agreement with)
+literature values. With pytest installed in the local python environment
+(pip install pytest), simply run 'pytest' to run the testsuite.
+"""
+
+import pybindingcurve as pbc
+from pybindingcurve.systems import analytical_equations as ae
+from pybindingcurve.systems import analytical_equations_vectorized as aev
+from pybindingcurve.systems import minimizer_systems as ms
+from mpmath import mp
+import numpy as np
+import pytest
+
+############################################
+### Test vectorized float64 analytical paths
+############################################
+
+p = np.array([0.0, 1e-6, 0.5, 10.0, 1e3])
+l = np.array([10.0, 1e-3, 0.5, 1e-4, 1e3])
+i = np.array([5.0, 1.0, 1e-9, 10.0, 1e2])
+kd = np.array([1.0, 1e-9, 0.5, 1e3, 2.0])
+
+def test_vectorized_one_to_one_matches_mpmath():
+	pl, imprecise = aev.system01_analytical_one_to_one__pl_vectorized(p, l, kd)
+	with mp.workdps(100):
+		reference = [float(ae.system01_analytical_one_to_one__pl(*a)) for a in zip(p, l, kd)]
+	assert not np.any(imprecise)
+	assert np.allclose(pl, reference, rtol=1e-12, atol=0)
+
+def test_vectorized_homodimer_formation_matches_mpmath():
+	pp, imprecise = aev.system03_analytical_homodimer_formation__pp_vectorized(p, kd)
+	with mp.workdps(100):
+		reference = [float(ae.system03_analytical_homodimer_formation__pp(*a)) for a in zip(p, kd)]
+	assert not np.any(imprecise)
+	assert np.allclose(pp, reference, rtol=1e-12, atol=0)
+
+# The mpmath cubic loses accuracy for widely separated KDs, so compare with
+# the minimizer instead, which converges to an absolute tolerance of 1e-10.
+def test_vectorized_competition_matches_minimizer():
+	pl, imprecise = aev.system02_analytical_competition__pl_vectorized(p, l, i, kd, kd[::-1])
+	with mp.workdps(100):
+		reference = [float(ms.system02_minimizer(*a)["pl"]) for a in zip(p, l, i, kd, kd[::-1])]
+	assert not np.any(imprecise)
+	assert np.allclose(pl, reference, rtol=1e-6, atol=1e-10)
+
+def test_vectorized_query_escalates_imprecise_points():
+	my_system = pbc.BindingCurve("competition")
+	my_system.query({"p": np.linspace(0, 20, 5), "l": 10, "i": 1, "kdpl": 1, "kdpi": 0})
+	stats = my_system.system.precision_stats
+	assert stats["points"] == 5
+	assert stats["float64"] + sum(stats["escalated"].values()) == 5
+
+def test_vectorized_scaling_only_changes_rounding():
+	# An extreme point forces every point in the batch to be scaled
+	extreme = np.append(p, 1e200)
+	for function, arguments in [
+		(aev.system01_analytical_one_to_one__pl_vectorized, (p, l, kd)),
+		(aev.system03_analytical_homodimer_formation__pp_vectorized, (p, kd)),
+		(aev.system02_analytical_competition__pl_vectorized, (p, l, i, kd, kd[::-1])),
+	]:
+		unscaled, _ = function(*arguments)
+		scaled, _ = function(extreme, *[np.append(a, 1.0) for a in arguments[1:]])
+		assert np.allclose(unscaled, scaled[:-1], rtol=1e-10, atol=0)
+
+def test_vectorized_scalar_arguments():
+	pl, imprecise = aev.system01_analytical_one_to_one__pl_vectorized(5.0, 7.0, 1.0)
+	assert np.ndim(pl) == 0 and not imprecise
+	assert pbc.BindingCurve("1:1").query({"p": 5, "l": 7, "kdpl": 1}) == pytest.approx(3.8074176)
+	# Single points are numpy floats, with NaN returned as 0 as for arrays
+	assert isinstance(pbc.BindingCurve("1:1").query({"p": 5, "l": 7, "kdpl": 1}), np.floating)
+	assert pbc.BindingCurve("1:1").query({"p": np.nan, "l": 7, "kdpl": 1}) == 0
+
+def test_vectorized_homodimer_breaking_selects_physical_root():
+	# The kinetic system relaxes to the physical solution, whichever of the
+	# closed form solutions it is
+	parameters = {"p": np.array([1.0, 10.0, 5.0, 0.0]), "i": np.array([3.0, 1.0, 5.0, 1.0]), "kdpp": np.array([1.0, 0.01, 1e-3, 1.0]), "kdpi": np.array([2.0, 5.0, 1e3, 1.0])}
+	pp, imprecise = aev.system04_analytical_homodimer_breaking__pp_vectorized(**parameters)
+	assert not np.any(imprecise)
+	kinetic = pbc.systems.System_kinetic_homodimerbreaking__pp().query(parameters)
+	assert np.allclose(pp, kinetic, rtol=1e-6, atol=1e-12)
+	with mp.workdps(100):
+		reference = [float(ae.system04_analytical_homodimer_breaking__physical_pp(*a)) for a in zip(*parameters.values())]
+	assert np.allclose(pp, reference, rtol=1e-12, atol=0)
+
+def test_vectorized_homodimer_breaking_free_species_with_zero_kd():
+	# KDs of zero are floored, as for the other vectorized equations
+	pf, i_f = aev.system04_analytical_homodimer_breaking__free_species_vectorized(np.array([0.0, 10.0]), 5.0, 1.0, 0.0)
+	assert np.all(np.isfinite(pf)) and np.all(np.isfinite(i_f))
+	assert i_f[0] == pytest.approx(5.0)
+
+def test_homodimer_breaking_root_selection_criteria():
+	p, i, kdpp, kdpi = 1.0, 3.0, 1.0, 2.0
+	roots = aev.system04_analytical_homodimer_breaking__free_protein_roots_vectorized(p, i, kdpp, kdpi)
+	physical, imprecise = aev.select_homodimer_breaking_roots(roots, p, i, kdpp, kdpi)
+	assert not imprecise
+	# Negative, complex, excessive or non-conserving candidates are rejected
+	for rejected in [-physical, physical + 1j, p + 1.0, physical * 1.01]:
+		_, imprecise = aev.select_homodimer_breaking_roots(np.array([rejected]), p, i, kdpp, kdpi)
+		assert imprecise
+	# Selection is per point across whole arrays of candidates
+	candidates = np.stack([roots, roots[::-1]], axis=-1)
+	selected, imprecise = aev.select_homodimer_breaking_roots(candidates, p, i, kdpp, kdpi)
+	assert selected.shape == (2,) and not np.any(imprecise)
+	assert np.all(selected == physical)
+
+def test_homodimer_breaking_physical_solution_system():
+	parameters = {"p": np.linspace(0, 20, 41), "i": 5, "kdpp": 1, "kdpi": 2}
+	my_system = pbc.BindingCurve("homodimerbreakinganalyticalphysical")
+	physical = my_system.query(parameters)
+	assert physical.shape == (41,)
+	assert np.allclose(physical, pbc.BindingCurve("homodimerbreakingmin").query(parameters), rtol=1e-6, atol=1e-9)
+	assert my_system.system.precision_stats["float64"] == 41
+	signal = my_system.query({**parameters, "ymin": 0.1, "ymax": 2.0})
+	assert signal.shape == (41,)
+	value, derivatives = my_system.system.query_derivatives({**parameters, "p": 5.0}, ["kdpp", "kdpi"])
+	assert np.isclose(value, physical[10])
+	step = 1e-6
+	numerical = (my_system.query({**parameters, "p": 5.0, "kdpi": 2 + step}) - value) / step
+	assert np.isclose(derivatives["kdpi"], numerical, rtol=1e-4)